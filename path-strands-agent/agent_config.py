@@ -4,6 +4,13 @@ Each agent has a named profile with model_id, max_tokens, and temperature.
 Environment variables override defaults:
   AGENT_DEFAULT_MODEL  -> default model for all agents
   AGENT_<NAME>_MODEL   -> override for a specific agent (e.g., AGENT_PROMPT_MODEL)
+  AGENT_POOL_<NAME>_MIN_IDLE / AGENT_POOL_<NAME>_MAX_IDLE
+                       -> agent instance pool sizes (e.g., AGENT_POOL_SPEC_MAX_IDLE)
+  BEDROCK_EXPECTED_CONCURRENT_SPECS -> concurrent spec requests the HTTP pool is sized for
+  BEDROCK_MAX_POOL_CONNECTIONS      -> explicit bedrock-runtime connection pool size
+  MAX_CONCURRENT_LLM_CALLS          -> admission cap on concurrent LLM calls per container
+  SPEC_JOB_WORKERS / SPEC_JOB_MAX_QUEUED / SPEC_JOB_TTL_SECONDS
+                                    -> asynchronous spec job queue (spec_submit) limits
 """
 import os
 
@@ -36,6 +43,12 @@ AGENT_PROFILES: dict[str, dict] = {
         "max_tokens": 32_000,
         #"temperature": 0.0,
     },
+    # Stateless Mermaid repair call (failing blocks + validator errors only)
+    "diagram_repair": {
+        "model_id": os.environ.get("AGENT_DIAGRAM_MODEL", DEFAULT_MODEL),
+        "max_tokens": 8_000,
+        #"temperature": 0.0,
+    },
     "prompt_single": {
         "model_id": os.environ.get("AGENT_PROMPT_MODEL", DEFAULT_MODEL),
         "max_tokens": 32_000,
@@ -57,3 +70,71 @@ AGENT_PROFILES: dict[str, dict] = {
 def get_profile(name: str) -> dict:
     """Return a copy of the named profile. Raises KeyError if not found."""
     return dict(AGENT_PROFILES[name])
+
+
+# Pre-built agent instance pools (agent_pool.py).
+#   min_idle: instances kept ready (built at warm-up and refilled in the background)
+#   max_idle: upper bound on returned instances retained for reuse
+# "spec" bundles the design/diagram/prompt/tool sub-agent profiles into one
+# MultiStageSpecAgent. "pattern_analyzer" instances are session-owned, so that
+# pool only pre-builds them and never takes them back.
+AGENT_POOL_SIZES: dict[str, dict] = {
+    "feasibility": {"min_idle": 1, "max_idle": 4},
+    "spec": {"min_idle": 1, "max_idle": 2},
+    "pattern_analyzer": {"min_idle": 1, "max_idle": 1},
+}
+
+
+def get_pool_size(name: str) -> dict:
+    """Return pool sizes for the named pool, applying env overrides."""
+    size = dict(AGENT_POOL_SIZES.get(name, {"min_idle": 0, "max_idle": 0}))
+    prefix = f"AGENT_POOL_{name.upper()}_"
+    for key in ("min_idle", "max_idle"):
+        value = os.environ.get(prefix + key.upper())
+        if value is not None:
+            size[key] = int(value)
+    return size
+
+
+# Bedrock call fan-out of a single spec request: the parallel stage threads
+# (design / diagram / prompt / tool / data_integration — downstream stages start
+# from the design_core snapshot while design is still writing 2.3/2.4) plus
+# DiagramAgent per-diagram calls and PromptAgent scatter-gather workers. The
+# diagram and prompt stage threads themselves only wait on their workers.
+SPEC_PARALLEL_STAGES = 5
+DIAGRAM_PARALLEL_CALLS = 3
+PROMPT_PARALLEL_MAX_WORKERS = 6
+SPEC_LLM_FANOUT = SPEC_PARALLEL_STAGES - 2 + DIAGRAM_PARALLEL_CALLS + PROMPT_PARALLEL_MAX_WORKERS
+# spec_section reruns a single stage; the prompt stage is the widest (its workers).
+SPEC_SECTION_LLM_FANOUT = max(PROMPT_PARALLEL_MAX_WORKERS, DIAGRAM_PARALLEL_CALLS)
+
+# Stage hedging (spec/hedging.py, SPEC_HEDGE=1) duplicates at most one slow stage per
+# spec request at a time. A hedge is as wide as the stage it repeats, so while hedging
+# is on every spec / spec_section also reserves the widest stage's calls for it.
+SPEC_HEDGE_ENABLED = os.environ.get("SPEC_HEDGE", "").lower() in ("1", "true", "on")
+SPEC_HEDGE_LLM_CALLS = SPEC_SECTION_LLM_FANOUT if SPEC_HEDGE_ENABLED else 0
+
+# Admission cap on concurrent LLM calls per container (scheduler.py): room for
+# the expected concurrent specs at full fan-out. Each admitted request reserves
+# its expected number of concurrent calls (spec = SPEC_LLM_FANOUT,
+# spec_section = SPEC_SECTION_LLM_FANOUT, plus SPEC_HEDGE_LLM_CALLS for both;
+# others = 1).
+EXPECTED_CONCURRENT_SPECS = int(os.environ.get("BEDROCK_EXPECTED_CONCURRENT_SPECS", 2))
+MAX_CONCURRENT_LLM_CALLS = int(os.environ.get(
+    "MAX_CONCURRENT_LLM_CALLS",
+    (SPEC_LLM_FANOUT + SPEC_HEDGE_LLM_CALLS) * EXPECTED_CONCURRENT_SPECS,
+))
+
+# Asynchronous spec jobs (spec_submit): jobs running at once per container and how
+# many may wait behind them. Running jobs still reserve SPEC_LLM_FANOUT via admission
+# control; finished jobs keep their result for SPEC_JOB_TTL_SECONDS.
+SPEC_JOB_WORKERS = int(os.environ.get("SPEC_JOB_WORKERS", EXPECTED_CONCURRENT_SPECS))
+SPEC_JOB_MAX_QUEUED = int(os.environ.get("SPEC_JOB_MAX_QUEUED", 20))
+SPEC_JOB_TTL_SECONDS = int(os.environ.get("SPEC_JOB_TTL_SECONDS", 3600))
+
+# Shared bedrock-runtime connection pool size (strands_utils client registry):
+# the admission cap plus headroom for calls outside admission (e.g. the warm-up TLS ping).
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.environ.get(
+    "BEDROCK_MAX_POOL_CONNECTIONS",
+    MAX_CONCURRENT_LLM_CALLS + 4,
+))
@@ -0,0 +1,195 @@
+"""에이전트 인스턴스 풀 — 요청 경로에서 Agent 생성 비용 제거.
+
+FeasibilityAgent / MultiStageSpecAgent 생성은 BedrockModel·boto client·시스템 프롬프트
+(스킬 사전 주입)·AgentSkills 플러그인(skills 디렉토리 스캔)을 매번 새로 만든다.
+이를 이벤트 루프에서 동기 실행하면 동시에 열린 모든 SSE 스트림이 멈춘다.
+
+- acquire(): idle 인스턴스가 있으면 즉시 반환, 없으면 asyncio.to_thread로 생성
+- release(): reset() 후 idle로 보관 (max_idle 초과분 또는 reset 실패 시 폐기)
+- idle이 min_idle 아래로 내려가면 백그라운드 스레드에서 보충
+- lease(): 정상 종료 시에만 반납 — 예외/취소(클라이언트 연결 종료 포함) 시
+  백그라운드 스레드가 아직 인스턴스를 사용 중일 수 있으므로 폐기
+
+세션에 귀속되는 PatternAnalyzerAgent는 reset=None으로 등록해 생성만 풀에서 하고
+반납하지 않는다 (take-only).
+
+풀 크기는 agent_config.AGENT_POOL_SIZES에서 설정한다.
+이 모듈은 엔트리포인트 최상단에서 import되므로 무거운 의존성을 import하지 않는다.
+"""
+
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AgentPool(Generic[T]):
+    """단일 프로파일 에이전트 풀 (스레드 안전 — warm-up 스레드에서 prefill 가능)"""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], T],
+        reset: Optional[Callable[[T], None]] = None,
+        min_idle: int = 1,
+        max_idle: int = 4,
+    ):
+        self.name = name
+        self._factory = factory
+        self._reset = reset
+        self._min_idle = max(min_idle, 0)
+        self._max_idle = max(max_idle, self._min_idle)
+        self._lock = threading.Lock()
+        self._idle: List[T] = []
+        self._building = 0
+        self._refills: set = set()
+        self._counters = {"hits": 0, "misses": 0, "created": 0, "reused": 0, "discarded": 0}
+
+    # ── checkout / return ─────────────────────
+
+    async def acquire(self) -> T:
+        """idle 인스턴스 반환 (없으면 이벤트 루프 밖에서 생성)"""
+        with self._lock:
+            instance = self._idle.pop() if self._idle else None
+            self._counters["hits" if instance is not None else "misses"] += 1
+        if instance is None:
+            instance = await asyncio.to_thread(self._create)
+        self._schedule_refill()
+        return instance
+
+    def release(self, instance: T, reusable: bool = True) -> None:
+        """사용 완료 인스턴스 반납 — 상태 초기화 후 보관 또는 폐기"""
+        if not reusable or self._reset is None:
+            self._discard()
+            return
+        try:
+            self._reset(instance)
+        except Exception as e:
+            logger.warning(f"[AGENT POOL] {self.name} reset 실패 (폐기): {type(e).__name__}: {e}")
+            self._discard()
+            return
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(instance)
+                self._counters["reused"] += 1
+                return
+        self._discard()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[T]:
+        """async with 블록 동안 인스턴스 대여 — 정상 종료 시에만 재사용"""
+        instance = await self.acquire()
+        try:
+            yield instance
+        except BaseException:
+            self.release(instance, reusable=False)
+            raise
+        self.release(instance)
+
+    # ── 보충 ──────────────────────────────────
+
+    def prefill(self) -> int:
+        """min_idle까지 동기 생성 (warm-up 스레드용). 생성 수 반환."""
+        created = 0
+        while self._reserve_build():
+            self._build_into_idle()
+            created += 1
+        return created
+
+    def _schedule_refill(self) -> None:
+        """idle이 min_idle 미만이면 백그라운드 스레드에서 1개 보충"""
+        if not self._reserve_build():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            with self._lock:
+                self._building -= 1
+            return
+        task = loop.create_task(asyncio.to_thread(self._build_into_idle))
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    def _reserve_build(self) -> bool:
+        with self._lock:
+            if len(self._idle) + self._building >= self._min_idle:
+                return False
+            self._building += 1
+            return True
+
+    def _build_into_idle(self) -> None:
+        try:
+            instance = self._create()
+        except Exception as e:
+            logger.warning(f"[AGENT POOL] {self.name} 보충 실패: {type(e).__name__}: {e}")
+            with self._lock:
+                self._building -= 1
+            return
+        with self._lock:
+            self._building -= 1
+            if len(self._idle) < self._max_idle:
+                self._idle.append(instance)
+                return
+            self._counters["discarded"] += 1
+
+    def _create(self) -> T:
+        instance = self._factory()
+        with self._lock:
+            self._counters["created"] += 1
+        return instance
+
+    def _discard(self) -> None:
+        with self._lock:
+            self._counters["discarded"] += 1
+
+    # ── 통계 ──────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "idle": len(self._idle),
+                "building": self._building,
+                "min_idle": self._min_idle,
+                "max_idle": self._max_idle,
+            }
+
+
+_pools: Dict[str, AgentPool] = {}
+
+
+def register_pool(
+    name: str,
+    factory: Callable[[], Any],
+    reset: Optional[Callable[[Any], None]] = None,
+) -> AgentPool:
+    """agent_config.AGENT_POOL_SIZES 설정으로 풀 등록 (동일 이름 재등록 시 교체)"""
+    from agent_config import get_pool_size
+
+    size = get_pool_size(name)
+    pool = AgentPool(name, factory, reset, min_idle=size["min_idle"], max_idle=size["max_idle"])
+    _pools[name] = pool
+    return pool
+
+
+def get_pool(name: str) -> AgentPool:
+    """등록된 풀 조회. 없으면 KeyError."""
+    return _pools[name]
+
+
+def prefill_all() -> None:
+    """등록된 모든 풀을 min_idle까지 채움 (warm-up 단계, 블로킹)"""
+    for pool in list(_pools.values()):
+        created = pool.prefill()
+        if created:
+            logger.info(f"[AGENT POOL] {pool.name} {created}개 사전 생성")
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """ping 응답용 풀별 통계"""
+    return {name: pool.stats() for name, pool in _pools.items()}
@@ -1,54 +1,82 @@
 """
 AgentCore Runtime 엔트리포인트 - PATH Agent Designer
 
-6개 액션을 단일 BedrockAgentCoreApp 엔드포인트에서 dispatch:
+10개 액션을 단일 BedrockAgentCoreApp 엔드포인트에서 dispatch:
   feasibility       → FeasibilityAgent SSE 스트리밍
   feasibility_update → FeasibilityAgent SSE 스트리밍 (재평가)
   pattern_analyze   → PatternAnalyzerAgent SSE 스트리밍
   pattern_chat      → PatternAnalyzerAgent SSE 스트리밍
   pattern_finalize  → PatternAnalyzerAgent JSON (단일 yield)
-  spec              → MultiStageSpecAgent SSE 스트리밍
+  spec              → MultiStageSpecAgent SSE 스트리밍 (run_id + last_event_id로 재연결 시 이어서 실행)
+  spec_section      → MultiStageSpecAgent SSE 스트리밍 (섹션 1개 재생성)
+  spec_submit       → spec 비동기 작업 등록 JSON (단일 yield, job_id 즉시 반환)
+  spec_status       → 작업 상태 JSON (대기 위치/진행률/run_id)
+  spec_result       → 작업 결과 JSON (완료 시 명세서 + spec_meta)
 
 PatternAnalyzerAgent 세션은 module-level dict에 저장하고,
 AgentCore의 runtimeSessionId로 동일 컨테이너 라우팅됨.
+매 턴 종료 후 session_store에 스냅샷을 남겨 캐시 miss 시 stateful 복원.
 
 NOTE: 무거운 모듈(strands, boto3 등)은 lazy import로 처리.
 AgentCore 초기화 타임아웃(30초) 내에 app.run()이 시작되어야 한다.
+서버가 listen을 시작하면 warmup 모듈이 백그라운드에서 이들을 미리 로드한다.
 """
 
-import json
 import logging
 import asyncio
-import time
-from collections import OrderedDict
+import os
+import sys
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 
+import cancellation
+import events
+import warmup
+from agent_config import SPEC_JOB_MAX_QUEUED, SPEC_JOB_TTL_SECONDS, SPEC_JOB_WORKERS
+from agent_pool import get_pool, pool_stats, prefill_all, register_pool
+from job_queue import JobFailed, JobQueue, QueueFull
+from scheduler import AdmissionScheduler, queued_event
+from singleflight import SingleFlight, request_key
+from sse_coalescer import coalesce_text
+from session_cache import SessionCache
+
 logger = logging.getLogger(__name__)
 
 app = BedrockAgentCoreApp()
 
-# PatternAnalyzerAgent 세션 캐시 (TTL + 최대 크기 제한)
-_MAX_SESSIONS = 100
+# PatternAnalyzerAgent 세션 캐시 (LRU + TTL + 추정 바이트 한도)
 _SESSION_TTL_SECONDS = 3600  # 1시간
-
-_pattern_sessions: OrderedDict = OrderedDict()
-_session_timestamps: dict = {}
-
-
-def _cleanup_sessions():
-    """만료 세션 정리 및 최대 크기 제한 적용."""
-    now = time.time()
-    expired = [
-        sid for sid, ts in _session_timestamps.items()
-        if now - ts > _SESSION_TTL_SECONDS
-    ]
-    for sid in expired:
-        _pattern_sessions.pop(sid, None)
-        _session_timestamps.pop(sid, None)
-
-    while len(_pattern_sessions) > _MAX_SESSIONS:
-        oldest_sid, _ = _pattern_sessions.popitem(last=False)
-        _session_timestamps.pop(oldest_sid, None)
+_SESSION_MAX_BYTES = int(os.environ.get("PATTERN_SESSION_MAX_BYTES", 256 * 1024 * 1024))
+
+_pattern_sessions = SessionCache(
+    ttl_seconds=_SESSION_TTL_SECONDS,
+    max_bytes=_SESSION_MAX_BYTES,
+    sizer=lambda agent: agent.estimated_bytes(),
+)
+
+# 동시 LLM 호출 admission control (chat > feasibility > finalize > spec)
+_scheduler = AdmissionScheduler()
+
+# 동일 payload in-flight 병합 대상 (세션 상태가 없는 장시간 action만)
+_COALESCED_ACTIONS = frozenset({"feasibility", "feasibility_update", "spec", "spec_section"})
+_single_flight = SingleFlight()
+
+# 스트림이 완료 전에 닫히면 진행 중인 LLM 호출을 취소하는 action (풀 인스턴스 기반, 세션 상태 없음).
+# pattern_* 는 세션 에이전트의 대화 상태가 중간에 끊기지 않도록 제외
+_CANCELLABLE_ACTIONS = frozenset({"feasibility", "feasibility_update", "spec", "spec_section"})
+
+# 실행 중인 spec run_id -> single-flight 키 (재연결이 아직 실행 중인 생성에 합류하도록)
+_live_spec_runs: dict = {}
+_MAX_RUN_ID_LEN = 64
+
+# spec 비동기 작업 (spec_submit/status/result) — SSE 연결 없이 worker가 spec run을 실행
+_JOB_ACTIONS = frozenset({"spec_submit", "spec_status", "spec_result"})
+_spec_jobs = JobQueue(
+    "spec",
+    workers=SPEC_JOB_WORKERS,
+    max_queued=SPEC_JOB_MAX_QUEUED,
+    ttl_seconds=SPEC_JOB_TTL_SECONDS,
+)
+_MIN_JOB_ID_LEN = 16
 
 # Lazy-loaded 모듈 캐시
 _chat_agent_module = None
@@ -73,23 +101,47 @@ def _get_spec_agent_module():
     return _spec_agent_module
 
 
-def _get_or_create_pattern_agent(
+# 사전 생성 에이전트 풀 — 생성은 이벤트 루프 밖(warm-up/백그라운드 스레드)에서 수행
+register_pool(
+    "feasibility",
+    factory=lambda: _get_chat_agent_module().FeasibilityAgent(),
+    reset=lambda agent: agent.reset(),
+)
+register_pool(
+    "spec",
+    factory=lambda: _get_spec_agent_module().MultiStageSpecAgent(),
+    reset=lambda agent: agent.reset(),
+)
+# 세션 귀속 인스턴스 — 생성만 풀에서 하고 반납하지 않음
+register_pool(
+    "pattern_analyzer",
+    factory=lambda: _get_chat_agent_module().PatternAnalyzerAgent(),
+)
+
+
+async def _get_or_create_pattern_agent(
     session_id: str,
     conversation: list = None,
 ) -> tuple:
-    """세션에서 PatternAnalyzerAgent 조회 또는 새로 생성.
+    """세션에서 PatternAnalyzerAgent 조회, 없으면 pattern_analyzer 풀에서 받아 복원.
+
+    캐시 miss 시 인스턴스는 풀(사전 생성, 부족하면 이벤트 루프 밖에서 생성)에서 받고
+    스냅샷 로드는 스레드에서 수행해 이벤트 루프를 막지 않는다.
 
     Returns:
         (agent, is_stateful) tuple
     """
-    _cleanup_sessions()
+    if session_id:
+        cached = _pattern_sessions.get(session_id)  # hit 시 LRU/TTL 갱신
+        if cached is not None:
+            return cached, True
 
-    if session_id and session_id in _pattern_sessions:
-        _session_timestamps[session_id] = time.time()  # TTL 갱신
-        return _pattern_sessions[session_id], True
+    agent = await get_pool("pattern_analyzer").acquire()
 
-    mod = _get_chat_agent_module()
-    agent = mod.PatternAnalyzerAgent()
+    # 세션 저장소에서 stateful 복원 시도 (컨테이너 재시작/다른 컨테이너 라우팅 대비)
+    if session_id and await asyncio.to_thread(_restore_pattern_agent, agent, session_id, conversation):
+        _pattern_sessions.put(session_id, agent)
+        return agent, True
 
     # 대화 히스토리 복원 (stateless fallback) — role 검증 포함
     _ALLOWED_ROLES = {"user", "assistant"}
@@ -103,12 +155,82 @@ def _get_or_create_pattern_agent(
                 agent.add_message(role, content)
 
     if session_id:
-        _pattern_sessions[session_id] = agent
-        _session_timestamps[session_id] = time.time()
+        _pattern_sessions.put(session_id, agent)
 
     return agent, False
 
 
+def _last_assistant_content(messages: list) -> str:
+    """대화 목록에서 마지막 assistant 메시지 본문 (없으면 빈 문자열)"""
+    for msg in reversed(messages or []):
+        if isinstance(msg, dict) and msg.get("role") == "assistant":
+            content = msg.get("content", "")
+            return content.strip() if isinstance(content, str) else ""
+    return ""
+
+
+def _restore_pattern_agent(agent, session_id: str, conversation: list = None) -> bool:
+    """세션 저장소의 스냅샷으로 agent를 stateful 복원.
+
+    클라이언트가 보낸 conversation의 마지막 assistant 응답이 스냅샷과 다르면
+    (다른 경로로 대화가 진행된 stale 스냅샷) 복원하지 않는다.
+    """
+    from session_store import get_session_store
+
+    try:
+        snapshot = get_session_store().load(session_id)
+    except Exception as e:
+        logger.warning(f"[SESSION] 스냅샷 조회 실패: {type(e).__name__}: {e}")
+        return False
+    if not snapshot:
+        return False
+    if conversation and (
+        _last_assistant_content(conversation)
+        != _last_assistant_content(snapshot.get("conversation_history", []))
+    ):
+        logger.info("[SESSION] stale 스냅샷 — stateless fallback")
+        return False
+    restored = agent.restore(snapshot)
+    if restored:
+        logger.info(f"[SESSION] 스냅샷에서 stateful 세션 복원 (messages={len(agent.agent.messages)})")
+    return restored
+
+
+def _persist_pattern_session(session_id: str, agent) -> None:
+    """턴 종료 후 캐시 크기 재추정 + 세션 스냅샷 저장 (실패해도 요청 흐름에는 영향 없음)"""
+    if not session_id:
+        return
+    _pattern_sessions.resize(session_id)
+    from session_store import get_session_store
+
+    try:
+        get_session_store().save(session_id, agent.snapshot())
+    except Exception as e:
+        logger.warning(f"[SESSION] 스냅샷 저장 실패: {type(e).__name__}: {e}")
+
+
+def _stage_cache_stats() -> dict:
+    """spec stage 캐시 통계 (+ spec_id별 명세서 결과 캐시) — spec 패키지가 로드된 경우만"""
+    module = sys.modules.get("spec.stage_cache")
+    cache = module.get_stage_cache() if module is not None else None
+    if cache is None:
+        return {}
+    return {**cache.stats(), "spec_outputs": module.get_spec_outputs_cache().stats()}
+
+
+def _hedging_stats() -> dict:
+    """spec stage hedging 통계 — 활성화된 경우만"""
+    module = sys.modules.get("spec.hedging")
+    hedger = module.get_hedger() if module is not None else None
+    return hedger.stats() if hedger is not None else {}
+
+
+def _bedrock_client_stats() -> dict:
+    """공유 Bedrock client 통계 — ping이 무거운 모듈 import를 유발하지 않도록 로드된 경우만"""
+    utils = sys.modules.get("strands_utils")
+    return utils.bedrock_clients.stats() if utils is not None else {}
+
+
 _MAX_FIELD_LEN = 10000      # 단일 문자열 필드 최대 길이
 _MAX_CONVERSATION_TURNS = 100  # 대화 히스토리 최대 턴 수
 
@@ -173,39 +295,52 @@ async def invoke(payload, context):
         yield {"error": "요청 데이터가 허용 크기를 초과합니다."}
         return
 
+    # 만료 세션 정리는 요청 경로가 아닌 백그라운드 sweeper에서 수행
+    _pattern_sessions.ensure_sweeper()
+
     try:
         if action_type == "ping":
-            yield {"status": "ok", "message": "pong"}
+            yield {
+                "status": "ok",
+                "message": "pong",
+                "warm": warmup.is_warm(),
+                "warmup": warmup.status(),
+                "sessions": _pattern_sessions.stats(),
+                "agent_pools": pool_stats(),
+                "bedrock_clients": _bedrock_client_stats(),
+                "scheduler": _scheduler.stats(),
+                "single_flight": _single_flight.stats(),
+                "spec_stage_cache": _stage_cache_stats(),
+                "spec_hedging": _hedging_stats(),
+                "cancellation": cancellation.stats(),
+                "spec_jobs": _spec_jobs.stats(),
+            }
             return
 
-        elif action_type == "feasibility":
-            async for event in _handle_feasibility(payload):
-                yield event
-
-        elif action_type == "feasibility_update":
-            async for event in _handle_feasibility_update(payload):
-                yield event
-
-        elif action_type == "pattern_analyze":
-            async for event in _handle_pattern_analyze(payload, session_id):
-                yield event
-
-        elif action_type == "pattern_chat":
-            async for event in _handle_pattern_chat(payload, session_id):
-                yield event
-
-        elif action_type == "pattern_finalize":
-            result = await asyncio.to_thread(
-                _run_pattern_finalize, payload, session_id
-            )
-            yield result
+        if action_type in _JOB_ACTIONS:
+            # 작업 큐 조작은 LLM 호출이 없으므로 admission 없이 즉시 단일 JSON 응답
+            yield _handle_spec_job_action(action_type, payload, session_id)
+            return
 
-        elif action_type == "spec":
-            async for event in _handle_spec(payload):
-                yield event
+        if not _scheduler.is_scheduled(action_type):
+            yield {"error": "Unknown action type"}
+            return
 
+        # 고빈도 text delta를 시간/바이트 한도 프레임으로 병합 (제어 이벤트는 그대로 통과)
+        if action_type == "spec":
+            # checkpoint run으로 감싸 event_id 부여 — 재연결 시 replay + 완료 stage 이후부터 재개.
+            # 기록 단위가 전송 프레임과 같도록 run 안에서 이미 병합하므로 다시 병합하지 않는다
+            stream = _spec_run_stream(payload, session_id)
+        elif action_type in _COALESCED_ACTIONS:
+            # 동일 payload가 이미 실행 중이면 새로 실행하지 않고 합류 (replay + live)
+            stream = coalesce_text(_single_flight.stream(
+                request_key(action_type, payload),
+                lambda: _admitted_events(action_type, payload, session_id),
+            ))
         else:
-            yield {"error": "Unknown action type"}
+            stream = coalesce_text(_admitted_events(action_type, payload, session_id))
+        async for event in stream:
+            yield events.to_wire(event)  # 이벤트 객체 → dict 변환은 edge에서 1회
 
     except RuntimeError as e:
         if "StopIteration" in str(e):
@@ -221,6 +356,69 @@ async def invoke(payload, context):
         yield {"error": f"처리 중 오류가 발생했습니다. [action={safe_action}] {error_detail}"}
 
 
+async def _admitted_events(action_type: str, payload: dict, session_id: str, checkpoint=None):
+    """Admission control — 동시 LLM 호출 한도 초과 시 우선순위/세션 공정성 순으로 대기 후 실행"""
+    ticket = _scheduler.submit(action_type, session_id)
+    try:
+        async for position in _scheduler.wait(ticket):
+            # pattern_finalize는 단일 JSON 응답(첫 이벤트만 사용)이므로 대기 이벤트 생략
+            if action_type != "pattern_finalize":
+                yield queued_event(ticket, position)
+        if action_type not in _CANCELLABLE_ACTIONS:
+            async for event in _dispatch_action(action_type, payload, session_id, checkpoint):
+                yield event
+            return
+        # 클라이언트 이탈(aclose/task 취소)이나 오류로 끝나면 스레드의 Bedrock 호출도 중단
+        token = cancellation.CancelToken(action_type)
+        completed = False
+        with cancellation.bound(token):
+            try:
+                async for event in _dispatch_action(action_type, payload, session_id, checkpoint):
+                    yield event
+                completed = True
+            finally:
+                if not completed:
+                    token.cancel()
+    finally:
+        _scheduler.release(ticket)
+
+
+async def _dispatch_action(action_type: str, payload: dict, session_id: str, checkpoint=None):
+    """admission 승인 후 action별 핸들러 실행"""
+    if action_type == "feasibility":
+        async for event in _handle_feasibility(payload):
+            yield event
+
+    elif action_type == "feasibility_update":
+        async for event in _handle_feasibility_update(payload):
+            yield event
+
+    elif action_type == "pattern_analyze":
+        async for event in _handle_pattern_analyze(payload, session_id):
+            yield event
+
+    elif action_type == "pattern_chat":
+        async for event in _handle_pattern_chat(payload, session_id):
+            yield event
+
+    elif action_type == "pattern_finalize":
+        agent, is_stateful = await _get_or_create_pattern_agent(
+            session_id, payload.get("conversation", [])
+        )
+        result = await asyncio.to_thread(
+            _run_pattern_finalize, agent, is_stateful, payload, session_id
+        )
+        yield result
+
+    elif action_type == "spec":
+        async for event in _handle_spec(payload, checkpoint):
+            yield event
+
+    elif action_type == "spec_section":
+        async for event in _handle_spec_section(payload):
+            yield event
+
+
 # ──────────────────────────────────────────────
 # Step 2: Feasibility
 # ──────────────────────────────────────────────
@@ -240,15 +438,10 @@ async def _handle_feasibility(payload: dict):
     """초기 Feasibility 평가 — SSE 스트리밍"""
     form_data = payload.get("formData", {})
     selected_ds = _extract_selected_data_sources(payload)
-    mod = _get_chat_agent_module()
-    agent = mod.FeasibilityAgent()
 
-    async for chunk in agent.evaluate_stream(form_data, selected_data_sources=selected_ds):
-        # evaluate_stream yields JSON strings
-        try:
-            yield json.loads(chunk)
-        except (json.JSONDecodeError, TypeError):
-            yield {"raw": chunk}
+    async with get_pool("feasibility").lease() as agent:
+        async for event in agent.evaluate_stream(form_data, selected_data_sources=selected_ds):
+            yield event
 
 
 async def _handle_feasibility_update(payload: dict):
@@ -258,19 +451,14 @@ async def _handle_feasibility_update(payload: dict):
     improvement_plans = payload.get("improvementPlans", {})
     selected_ds = _extract_selected_data_sources(payload)
 
-    mod = _get_chat_agent_module()
-    agent = mod.FeasibilityAgent()
-
-    async for chunk in agent.reevaluate_stream(
-        form_data,
-        previous_evaluation,
-        improvement_plans,
-        selected_data_sources=selected_ds,
-    ):
-        try:
-            yield json.loads(chunk)
-        except (json.JSONDecodeError, TypeError):
-            yield {"raw": chunk}
+    async with get_pool("feasibility").lease() as agent:
+        async for event in agent.reevaluate_stream(
+            form_data,
+            previous_evaluation,
+            improvement_plans,
+            selected_data_sources=selected_ds,
+        ):
+            yield event
 
 
 # ──────────────────────────────────────────────
@@ -284,21 +472,19 @@ async def _handle_pattern_analyze(payload: dict, session_id: str):
     improvement_plans = payload.get("improvementPlans")
     selected_ds = _extract_selected_data_sources(payload)
 
-    _cleanup_sessions()
-    mod = _get_chat_agent_module()
-    agent = mod.PatternAnalyzerAgent()
+    agent = await get_pool("pattern_analyzer").acquire()
     if session_id:
-        _pattern_sessions[session_id] = agent
-        _session_timestamps[session_id] = time.time()
+        _pattern_sessions.put(session_id, agent)
 
     async for chunk in agent.analyze_stream(
         form_data, feasibility, improvement_plans,
         selected_data_sources=selected_ds,
     ):
-        if "text" in chunk:
-            yield {"text": chunk["text"], "sessionId": session_id}
-        elif "usage" in chunk:
-            yield {"usage": chunk["usage"]}
+        if isinstance(chunk, events.Text):
+            chunk.session_id = session_id
+        yield chunk
+
+    await asyncio.to_thread(_persist_pattern_session, session_id, agent)
 
 
 async def _handle_pattern_chat(payload: dict, session_id: str):
@@ -307,54 +493,292 @@ async def _handle_pattern_chat(payload: dict, session_id: str):
     conversation = payload.get("conversation", [])
     selected_ds = _extract_selected_data_sources(payload)
 
-    agent, is_stateful = _get_or_create_pattern_agent(session_id, conversation)
+    agent, is_stateful = await _get_or_create_pattern_agent(session_id, conversation)
 
     async for chunk in agent.chat_stream(
         user_message, stateful=is_stateful,
         selected_data_sources=selected_ds,
     ):
-        if "text" in chunk:
-            yield {"text": chunk["text"], "sessionId": session_id}
-        elif "usage" in chunk:
-            yield {"usage": chunk["usage"]}
+        if isinstance(chunk, events.Text):
+            chunk.session_id = session_id
+        yield chunk
+
+    await asyncio.to_thread(_persist_pattern_session, session_id, agent)
 
 
-def _run_pattern_finalize(payload: dict, session_id: str) -> dict:
+def _run_pattern_finalize(agent, is_stateful: bool, payload: dict, session_id: str) -> dict:
     """패턴 확정 및 최종 분석 — JSON 응답 (sync)"""
     form_data = payload.get("formData", {})
     feasibility = payload.get("feasibility", {})
-    conversation = payload.get("conversation", [])
     improvement_plans = payload.get("improvementPlans")
     selected_ds = _extract_selected_data_sources(payload)
 
-    agent, is_stateful = _get_or_create_pattern_agent(session_id, conversation)
-    return agent.finalize(
+    result = agent.finalize(
         form_data, feasibility, improvement_plans, stateful=is_stateful,
         selected_data_sources=selected_ds,
     )
+    _persist_pattern_session(session_id, agent)
+    return result
 
 
 # ──────────────────────────────────────────────
 # Step 4: Specification
 # ──────────────────────────────────────────────
 
-async def _handle_spec(payload: dict):
-    """명세서 생성 — SSE 스트리밍"""
+async def _handle_spec(payload: dict, checkpoint=None):
+    """명세서 생성 — SSE 스트리밍 (checkpoint: spec.spec_run.RunCheckpoint, 재개 시 완료 stage 포함)"""
     analysis = payload.get("analysis", {})
     improvement_plans = payload.get("improvement_plans")
     chat_history = payload.get("chat_history")
     additional_context = payload.get("additional_context")
     selected_ds = _extract_selected_data_sources(payload)
 
-    mod = _get_spec_agent_module()
-    spec_agent = mod.MultiStageSpecAgent()
+    async with get_pool("spec").lease() as spec_agent:
+        async for event in spec_agent.generate_spec_stream(
+            analysis, improvement_plans, chat_history, additional_context,
+            selected_data_sources=selected_ds,
+            stream_sections=bool(payload.get("stream_sections")),
+            use_cache=payload.get("use_stage_cache", True) is not False,
+            completed=checkpoint.completed if checkpoint is not None else None,
+            on_stage_result=checkpoint.save if checkpoint is not None else None,
+        ):
+            yield event
+
+
+async def _spec_run_stream(payload: dict, session_id: str):
+    """spec 요청을 checkpoint run으로 실행.
+
+    run_id 없음          -> 새 run (동일 payload는 single-flight로 병합)
+    run_id + 실행 중     -> 실행 중인 생성에 합류
+    run_id + 중단/완료   -> 기록된 이벤트 replay 후, 완료되지 않은 run이면 checkpoint부터 재개
+    재연결은 last_event_id 이후 이벤트만 받는다. 저장소에 없는 run_id(만료, 다른 컨테이너)는
+    새 run으로 시작한다 (spec_run.resumed=false로 클라이언트가 처음부터 다시 받음).
+    """
+    from spec.checkpoint_store import get_checkpoint_store
+
+    store = get_checkpoint_store()
+    run_id = payload.get("run_id")
+    last_event_id = payload.get("last_event_id")
+    payload = {k: v for k, v in payload.items() if k not in ("run_id", "last_event_id", "job_id")}
+    if not isinstance(run_id, str) or not 0 < len(run_id) <= _MAX_RUN_ID_LEN:
+        run_id = None
+    if not isinstance(last_event_id, int) or isinstance(last_event_id, bool) or last_event_id < 0:
+        last_event_id = 0
+
+    if run_id is not None and run_id not in _live_spec_runs:
+        if await asyncio.to_thread(store.get_run, run_id) is None:
+            logger.info(f"[SPEC RUN] {run_id[:8]} checkpoint 없음 — 새 run으로 시작")
+            run_id = None
+
+    if run_id is None:
+        last_event_id = 0
+        key = request_key("spec", payload)
+        stream = _single_flight.stream(key, lambda: _new_spec_run(store, key, payload, session_id))
+    else:
+        key = _live_spec_runs.get(run_id, f"spec_run:{run_id}")
+        stream = _single_flight.stream(
+            key, lambda: _resume_spec_run(store, key, run_id, last_event_id, payload, session_id)
+        )
+    async for event in stream:
+        # 합류/replay 시 클라이언트가 이미 받은 이벤트는 건너뜀
+        if isinstance(event, events.Sequenced) and event.event_id <= last_event_id:
+            continue
+        yield event
 
-    async for event in spec_agent.generate_spec_stream(
-        analysis, improvement_plans, chat_history, additional_context,
-        selected_data_sources=selected_ds,
+
+async def _new_spec_run(store, key: str, payload: dict, session_id: str):
+    """새 spec run — run_id 발급 후 생성 이벤트를 기록하며 전송"""
+    from spec.spec_run import RunCheckpoint, new_run_id
+
+    run_id = new_run_id()
+    try:
+        await asyncio.to_thread(store.create_run, run_id)
+    except Exception as e:
+        # checkpoint 없이도 생성은 계속 (재연결 시 새 run으로 처음부터)
+        logger.warning(f"[SPEC RUN] {run_id[:8]} run 생성 실패: {e}")
+    async for event in _recorded_spec_run(
+        store, key, RunCheckpoint(store, run_id), events.SpecRun(run_id), payload, session_id
+    ):
+        yield event
+
+
+async def _resume_spec_run(store, key: str, run_id: str, last_event_id: int, payload: dict, session_id: str):
+    """중단된 spec run 재개 — 기록된 이벤트 replay 후 완료 stage를 복원해 남은 stage만 실행"""
+    from spec.checkpoint_store import STATUS_DONE
+    from spec.spec_run import RunCheckpoint, replay
+
+    run = await asyncio.to_thread(store.get_run, run_id)
+    if run is None:
+        yield events.Error("이전 명세서 실행을 찾을 수 없습니다. 명세서를 다시 생성해 주세요.")
+        return
+    # 구독자마다 last_event_id가 다를 수 있으므로 전체를 replay하고 구독 측에서 거른다
+    async for event in replay(store, run_id):
+        yield event
+    if run["status"] == STATUS_DONE:
+        return
+
+    completed = await asyncio.to_thread(store.load_stages, run_id)
+    logger.info(f"[SPEC RUN] {run_id[:8]} 재개 — 완료 stage: {sorted(completed) or '없음'}")
+    # 기록 전에 전송된 이벤트가 있을 수 있으므로 클라이언트가 받은 id 이후부터 번호를 이어 붙인다
+    async for event in _recorded_spec_run(
+        store,
+        key,
+        RunCheckpoint(store, run_id, completed),
+        events.SpecRun(run_id, resumed=True, completed=sorted(completed)),
+        payload,
+        session_id,
+        start_id=max(run["last_event_id"], last_event_id),
     ):
         yield event
 
 
+async def _recorded_spec_run(store, key: str, checkpoint, first_event, payload: dict, session_id: str, start_id: int = 0):
+    """run 이벤트를 event_id와 함께 기록하며 전송 — 실행 중에는 _live_spec_runs에 등록"""
+    from spec.spec_run import record
+
+    async def source():
+        yield first_event
+        # 기록·replay 단위가 실제 전송 프레임과 같도록 text 병합 후 기록
+        async for event in coalesce_text(
+            _admitted_events("spec", payload, session_id, checkpoint=checkpoint)
+        ):
+            yield event
+
+    _live_spec_runs[checkpoint.run_id] = key
+    try:
+        async for event in record(store, checkpoint.run_id, source(), start_id):
+            yield event
+    finally:
+        if _live_spec_runs.get(checkpoint.run_id) == key:
+            del _live_spec_runs[checkpoint.run_id]
+
+
+_MAX_STAGE_OUTPUT_LEN = 200000  # spec_section 이전 stage 결과(섹션 마크다운) 최대 길이
+_TEXT_STAGE_OUTPUTS = ("design", "design_core", "diagram", "prompt", "tool")
+
+
+def _extract_stage_outputs(payload: dict) -> dict:
+    """spec_section payload의 stage_outputs 정리 — 텍스트 stage는 str, data_integration은 dict만 허용.
+
+    부재 시 빈 dict (spec_id로 서버에 보관된 결과를 조회).
+    """
+    raw = payload.get("stage_outputs")
+    if not isinstance(raw, dict):
+        return {}
+    outputs = {}
+    for name in _TEXT_STAGE_OUTPUTS:
+        value = raw.get(name)
+        if isinstance(value, str):
+            if len(value) > _MAX_STAGE_OUTPUT_LEN:
+                raise ValueError(f"stage_outputs.{name} exceeds maximum length")
+            outputs[name] = value
+    if isinstance(raw.get("data_integration"), dict):
+        outputs["data_integration"] = raw["data_integration"]
+    return outputs
+
+
+async def _handle_spec_section(payload: dict):
+    """명세서 섹션 1개 재생성 — 바뀐 섹션 + 갱신된 spec_meta만 SSE 스트리밍"""
+    try:
+        previous = _extract_stage_outputs(payload)
+    except ValueError as e:
+        logger.warning(f"[PAYLOAD REJECTED] {e}")
+        yield events.Error("요청 데이터가 허용 크기를 초과합니다.")
+        return
+
+    async with get_pool("spec").lease() as spec_agent:
+        async for event in spec_agent.regenerate_section_stream(
+            str(payload.get("stage", "")),
+            payload.get("analysis", {}),
+            previous=previous,
+            spec_id=payload.get("spec_id") or None,
+            improvement_plans=payload.get("improvement_plans"),
+            chat_history=payload.get("chat_history"),
+            additional_context=payload.get("additional_context"),
+            selected_data_sources=_extract_selected_data_sources(payload),
+        ):
+            yield event
+
+
+# ──────────────────────────────────────────────
+# Step 4: Specification (비동기 작업)
+# ──────────────────────────────────────────────
+
+def _handle_spec_job_action(action_type: str, payload: dict, session_id: str) -> dict:
+    """spec_submit / spec_status / spec_result — 단일 JSON 응답"""
+    job_id = payload.get("job_id")
+    if job_id is not None and (
+        not isinstance(job_id, str) or not _MIN_JOB_ID_LEN <= len(job_id) <= _MAX_RUN_ID_LEN
+    ):
+        return {"error": "유효하지 않은 job_id입니다."}
+
+    if action_type == "spec_submit":
+        spec_payload = {
+            **{k: v for k, v in payload.items() if k not in ("job_id", "run_id", "last_event_id")},
+            "type": "spec",  # 같은 payload의 spec SSE 요청과 single-flight 키 공유
+        }
+        try:
+            job = _spec_jobs.submit(
+                lambda job: _run_spec_job(job, spec_payload, session_id),
+                job_id=job_id,
+                owner=session_id,
+            )
+        except QueueFull as e:
+            logger.warning(f"[SPEC JOB] {e}")
+            return {"error": "명세서 생성 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요."}
+        return {"job": _spec_jobs.status(job.id, session_id)}
+
+    if job_id is None:
+        return {"error": "job_id가 필요합니다."}
+    job = _spec_jobs.get(job_id, session_id)  # 작업을 등록한 세션만 조회 가능
+    if job is None:
+        return {"error": "명세서 작업을 찾을 수 없습니다. 만료되었거나 다른 세션의 작업입니다."}
+    status = _spec_jobs.status(job_id, session_id)
+    if action_type == "spec_result" and job.result is not None:
+        return {"job": status, "result": job.result}
+    return {"job": status}
+
+
+async def _run_spec_job(job, payload: dict, session_id: str) -> dict:
+    """spec run을 끝까지 소비해 결과를 모은다 (진행 상태는 job에 반영).
+
+    실행 중에는 spec 요청에 job.info의 run_id + last_event_id를 붙여 SSE로 재연결할 수 있다.
+    """
+    text_parts = []
+    result: dict = {}
+    async for event in _spec_run_stream(payload, session_id):
+        wire = events.to_wire(event)
+        if "event_id" in wire:
+            job.info["last_event_id"] = wire["event_id"]
+        if "spec_run" in wire:
+            job.info["run_id"] = wire["spec_run"]["run_id"]
+        if "error" in wire:
+            raise JobFailed(wire["error"])
+        if "progress" in wire:
+            job.progress = wire["progress"]
+            job.stage = wire.get("stage") or job.stage
+        if "text" in wire:
+            text_parts.append(wire["text"])
+        if "spec_meta" in wire:
+            # 부분 spec_meta(stage 완료마다)와 최종 spec_meta를 병합
+            result["spec_meta"] = {**result.get("spec_meta", {}), **wire["spec_meta"]}
+            if wire.get("spec_id"):
+                result["spec_id"] = wire["spec_id"]
+        if "usage" in wire:
+            result["usage"] = wire["usage"]
+        if "warning" in wire:
+            result.setdefault("warnings", []).append(wire["warning"])
+    return {"specification": "".join(text_parts), **result}
+
+
+_SERVER_PORT = 8080  # BedrockAgentCoreApp 기본 포트
+
+
 if __name__ == "__main__":
-    app.run()
+    # listen 시작 후 백그라운드에서 무거운 import·스킬 로드·client 생성 (첫 요청 지연 제거)
+    warmup.start_after_listen(
+        _SERVER_PORT,
+        importers=[_get_chat_agent_module, _get_spec_agent_module],
+        steps=[("agent_pools", prefill_all)],
+    )
+    app.run(port=_SERVER_PORT)
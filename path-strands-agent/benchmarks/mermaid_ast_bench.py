@@ -0,0 +1,226 @@
+"""Mermaid 검증 + spec_meta 파싱 — 정규식 경로 vs 공유 AST(spec.mermaid_ast) 벤치마크 (오프라인).
+
+큰 flowchart(도형·엣지 라벨·subgraph·주석·& 그룹 혼합)와 sequenceDiagram(activate/인라인 +/-)을
+생성해 블록 1개당 "검증 + 노드/엣지 파싱" 비용을 비교한다.
+
+  regex : 기존 경로 사본 — MermaidValidator 검사 5종이 각자 정규식 패스 + spec_parser의
+          줄마다 edge_re를 다시 만드는 flowchart 파서 (sequence는 파싱 안 함)
+  ast   : mermaid_ast.parse 1회 (캐시 비움) → validate_block + spec_parser 노드/엣지 변환
+
+검증 오류 목록이 두 경로에서 같은지, 노드 수가 같은지도 함께 확인한다.
+
+사용법:
+  python benchmarks/mermaid_ast_bench.py [--sizes 100 1000 5000] [--repeat 5] [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spec import mermaid_ast  # noqa: E402
+from spec.mermaid_validator import MermaidValidator  # noqa: E402
+from spec.spec_parser import _diagram_nodes_edges  # noqa: E402
+
+_SHAPES = (("[", "]"), ("(", ")"), ("{", "}"), ("((", "))"), ("([", "])"), ("[[", "]]"), ("{{", "}}"))
+_WORDS = ("Load", "Validate", "Score", "Retry", "Route", "Summarize", "Store", "Notify", "검토", "분류")
+
+
+# ── 생성 ──────────────────────────────────────
+
+
+def make_flowchart(n: int, rng: random.Random) -> str:
+    lines = ["flowchart TD"]
+    for i in range(n):
+        if i % 50 == 0:
+            lines.append(f"    %% group {i // 50}")
+            lines.append(f"    subgraph G{i // 50} [Group {i // 50}]")
+        opener, closer = rng.choice(_SHAPES)
+        text = f"{rng.choice(_WORDS)} {i}"
+        if i % 7 == 0:
+            text = f'"{text} >= {rng.randint(1, 99)}?"'
+        lines.append(f"    N{i}{opener}{text}{closer}")
+        if i % 50 == 49 or i == n - 1:
+            lines.append("    end")
+    for i in range(1, n):
+        src = rng.randrange(i)
+        if i % 5 == 0:
+            lines.append(f"    N{src} -->|\"retry < {i % 3}\"| N{i}")
+        elif i % 11 == 0:
+            lines.append(f"    N{src} & N{max(src - 1, 0)} --> N{i}")
+        else:
+            lines.append(f"    N{src} {rng.choice(('-->', '-.->', '==>', '---'))} N{i}")
+    lines.append("    classDef hot fill:#f96")
+    return "\n".join(lines) + "\n"
+
+
+def make_sequence(n: int, rng: random.Random) -> str:
+    participants = [f"P{i}" for i in range(12)]
+    lines = ["sequenceDiagram"]
+    lines.extend(f"    participant {p} as Service {p}" for p in participants)
+    for i in range(n):
+        a, b = rng.sample(participants, 2)
+        if i % 4 == 0:
+            lines.append(f"    {a}->>+{b}: request({i})")
+            lines.append(f"    {b}-->>-{a}: response {i}")
+        elif i % 9 == 0:
+            lines.append(f"    activate {b}")
+            lines.append(f"    {a}->>{b}: call {i}")
+            lines.append(f"    deactivate {b}")
+        else:
+            lines.append(f"    {a}->>{b}: event {i}")
+    return "\n".join(lines) + "\n"
+
+
+# ── 기존 정규식 경로 (MermaidValidator / spec_parser 교체 전 사본) ──
+
+
+_NODE_PATTERNS = (
+    re.compile(r'\[([^\]"]+)\]'),
+    re.compile(r'\{([^}"]+)\}'),
+    re.compile(r'\(([^)"]+)\)'),
+)
+_EDGE_LABEL_RE = re.compile(r'(--+>?|-\.+->?|==+>?)\|([^|"]+)\|')
+_INLINE_MSG_RE = re.compile(r'^(\S+?)\s*(?:--?>>?|--?x)([+-]?)(\S+?)\s*:')
+_ACTIVATE_RE = re.compile(r'activate\s+(\S+)')
+_DEACTIVATE_RE = re.compile(r'deactivate\s+(\S+)')
+
+
+def regex_validate(block: str) -> List[str]:
+    errors: List[str] = []
+    errors.extend(MermaidValidator()._check_diagram_type(block))
+    cleaned = re.sub(r'%%.*$', '', block, flags=re.MULTILINE)
+    stripped = re.sub(r"'[^']*'", '', re.sub(r'"[^"]*"', '', cleaned))
+    for open_char, close_char in (('{', '}'), ('[', ']'), ('(', ')')):
+        if stripped.count(open_char) != stripped.count(close_char):
+            errors.append(
+                f"'{open_char}{close_char}' 짝 불일치: "
+                f"열기 {stripped.count(open_char)}개, 닫기 {stripped.count(close_char)}개"
+            )
+    for pattern in _NODE_PATTERNS:
+        for match in pattern.finditer(cleaned):
+            found = MermaidValidator._find_special_char(match.group(1))
+            if found:
+                errors.append(f"노드 텍스트에 특수문자 '{found}' 발견 (따옴표 필요): '{match.group(1)[:60]}'")
+    sequence = block.strip().startswith('sequenceDiagram')
+    if not sequence:
+        for match in _EDGE_LABEL_RE.finditer(cleaned):
+            found = next((sc for sc in ('<', '>') if sc in match.group(2)), None)
+            if found:
+                errors.append(f"엣지 라벨에 특수문자 '{found}' 발견 (따옴표 필요): '|{match.group(2)[:60]}|'")
+    if sequence:
+        counts: Dict[str, List[int]] = {}
+        for line in block.split('\n'):
+            line = line.strip()
+            activate_match = _ACTIVATE_RE.match(line)
+            deactivate_match = _DEACTIVATE_RE.match(line)
+            if activate_match:
+                counts.setdefault(activate_match.group(1), [0, 0])[0] += 1
+            elif deactivate_match:
+                counts.setdefault(deactivate_match.group(1), [0, 0])[1] += 1
+            else:
+                m = _INLINE_MSG_RE.match(line)
+                if m and m.group(2) == '+':
+                    counts.setdefault(m.group(3), [0, 0])[0] += 1
+                elif m and m.group(2) == '-':
+                    counts.setdefault(m.group(1), [0, 0])[1] += 1
+        errors.extend(
+            f"Sequence Diagram '{p}': activate {a}회, deactivate {d}회 (불일치)"
+            for p, (a, d) in counts.items() if a != d
+        )
+    return errors
+
+
+def regex_parse_flowchart(source: str):
+    nodes: Dict[str, Dict[str, str]] = {}
+    edges: List[Dict[str, str]] = []
+    node_ref_re = (
+        r"([A-Za-z_][\w]*)"
+        r"(?:\[\[[^\]]+\]\]|\[/[^/]+/\]|\[\\[^\\]+\\\]|\(\([^)]+\)\)|\{\{[^}]+\}\}|\[[^\]]+\]|\([^)]+\)|\{[^}]+\}|>[^\]]+\])?"
+    )
+    node_decl_re = re.compile(
+        r"(?P<id>[A-Za-z_][\w]*)(?:\[\[(?P<l1>[^\]]+)\]\]|\[/(?P<l2>[^/]+)/\]|\[\\(?P<l3>[^\\]+)\\\]"
+        r"|\(\((?P<l4>[^)]+)\)\)|\{\{(?P<l5>[^}]+)\}\}|\[(?P<l6>[^\]]+)\]|\((?P<l7>[^)]+)\)|\{(?P<l8>[^}]+)\})"
+    )
+    for raw in source.strip().split("\n")[1:]:
+        line = raw.strip()
+        if not line or line.startswith("%%") or line.startswith("subgraph") or line == "end":
+            continue
+        if line.startswith("classDef") or line.startswith("class ") or line.startswith("linkStyle") or line.startswith("style "):
+            continue
+        for m in node_decl_re.finditer(line):
+            node_id = m.group("id")
+            label = next((m.group(g) for g in ("l1", "l2", "l3", "l4", "l5", "l6", "l7", "l8") if m.group(g)), node_id)
+            label = label.strip().strip('"')
+            if node_id not in nodes or nodes[node_id]["label"] == node_id:
+                nodes[node_id] = {"id": node_id, "label": label}
+        edge_re = re.compile(
+            rf"{node_ref_re}\s*(?:-{{2,3}}>|-{{2,3}}|-\.->|={{2,3}}>)(?:\s*\|([^|]*)\|)?\s*{node_ref_re}"
+        )
+        for em in edge_re.finditer(line):
+            src, dst = em.group(1), em.group(3)
+            for nid in (src, dst):
+                if nid not in nodes:
+                    nodes[nid] = {"id": nid, "label": nid}
+            edges.append({"source": src, "target": dst, "label": (em.group(2) or "").strip()})
+    return list(nodes.values()), edges
+
+
+# ── 측정 ──────────────────────────────────────
+
+
+def run_regex(block: str):
+    errors = regex_validate(block)
+    if block.startswith("sequenceDiagram"):
+        return errors, ([], [])
+    return errors, regex_parse_flowchart(block)
+
+
+def run_ast(block: str, validator: MermaidValidator):
+    mermaid_ast.parse.cache_clear()
+    errors = validator.validate_block(block)  # parse 1회
+    return errors, _diagram_nodes_edges(mermaid_ast.parse(block))  # 캐시 적중
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 5000],
+                        help="flowchart 노드 수 / sequence 메시지 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    validator = MermaidValidator()
+    print(f"{'diagram':<18} {'lines':>7} {'regex ms':>9} {'ast ms':>8} {'speedup':>8} "
+          f"{'errors':>7} {'nodes r/a':>12} {'edges r/a':>12}")
+    for kind, make in (("flowchart", make_flowchart), ("sequence", make_sequence)):
+        for size in args.sizes:
+            block = make(size, rng)
+            regex_ms = timed(lambda: run_regex(block), args.repeat)
+            ast_ms = timed(lambda: run_ast(block, validator), args.repeat)
+            regex_errors, (regex_nodes, regex_edges) = run_regex(block)
+            ast_errors, (ast_nodes, ast_edges) = run_ast(block, validator)
+            same = "same" if sorted(regex_errors) == sorted(ast_errors) else "DIFF"
+            print(f"{kind + ' ' + str(size):<18} {block.count(chr(10)):>7} {regex_ms:>9.1f} "
+                  f"{ast_ms:>8.1f} {regex_ms / ast_ms:>7.1f}x {same:>7} "
+                  f"{len(regex_nodes):>5}/{len(ast_nodes):<6} {len(regex_edges):>5}/{len(ast_edges):<6}")
+
+
+if __name__ == "__main__":
+    main()
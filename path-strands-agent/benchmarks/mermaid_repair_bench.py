@@ -0,0 +1,190 @@
+"""Mermaid 규칙 기반 수정(auto_repair) — 피할 수 있는 LLM 재시도 비율 벤치마크 (오프라인).
+
+말뭉치의 유효한 mermaid 블록(기본: skills/mermaid-diagrams 레퍼런스 + --corpus로 지정한
+마크다운)에 LLM 출력에서 흔한 오류를 주입한 뒤, MermaidValidator.auto_repair만으로
+검증을 통과하는 비율을 오류 유형별로 집계한다. 통과한 블록은 DiagramAgent가 LLM 수정
+호출 없이 끝내는 경우다.
+
+  unquoted_cmp   : 노드 텍스트의 비교 연산자(>=, <, >) 따옴표 누락
+  unquoted_amp   : 노드 텍스트의 & / ? 따옴표 누락
+  edge_label     : 엣지 라벨(-->|..|)의 < > 따옴표 누락
+  orphan_deact   : activate하지 않은 participant의 deactivate (명시적 / 인라인 -)
+  dangling_act   : 닫히지 않은 activate
+  bracket        : 닫는 괄호 누락 (규칙 기반 수정 대상 아님 — 대조군)
+  missing_type   : 다이어그램 타입 선언 누락 (대조군)
+
+토큰 절감은 수정 호출 1회 비용(블록 + 오류 + 고정 지시문 입력, 블록 출력)을 문자 수 기반
+근사치(CHARS_PER_TOKEN)로 추정한다.
+
+사용법:
+  python benchmarks/mermaid_repair_bench.py [--samples 2000] [--seed 7] [--corpus DIR_OR_MD ...]
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spec.mermaid_validator import MermaidValidator  # noqa: E402
+from token_tracker import PRICING  # noqa: E402
+
+CHARS_PER_TOKEN = 3.0             # 한/영 혼합 텍스트 근사치
+REPAIR_PROMPT_FIXED_CHARS = 1_200  # 수정 호출 시스템 프롬프트 + 지시문 + 이스케이프 규칙
+
+_BLOCK_RE = re.compile(r'```mermaid\s*\n(.*?)```', re.DOTALL)
+_NODE_RE = re.compile(r'(\w+)\[([^\]"\[(/\\][^\]"]*)\]')  # 사각형 노드만 (겹괄호 도형 제외)
+_EDGE_RE = re.compile(r'(-->)(\s*)(\w+)')
+_MSG_RE = re.compile(r'^(\s*)(\w+)\s*(-->>|->>)\s*(\w+)\s*:', re.MULTILINE)
+
+
+def load_corpus(paths: list) -> list:
+    """마크다운에서 검증을 통과하는 mermaid 블록만 수집"""
+    validator = MermaidValidator()
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "**", "*.md"), recursive=True))
+        else:
+            files.append(path)
+    blocks = []
+    for path in sorted(set(files)):
+        with open(path, encoding="utf-8") as f:
+            for block in _BLOCK_RE.findall(f.read()):
+                if not validator.validate_block(block):
+                    blocks.append(block)
+    return blocks
+
+
+def _is_sequence(block: str) -> bool:
+    return block.strip().startswith("sequenceDiagram")
+
+
+def _mutate_node_text(block: str, rng: random.Random, fragments: list) -> str:
+    nodes = list(_NODE_RE.finditer(block))
+    if not nodes:
+        return ""
+    m = rng.choice(nodes)
+    text = f"{m.group(2)} {rng.choice(fragments)}"
+    return block[:m.start()] + f"{m.group(1)}[{text}]" + block[m.end():]
+
+
+def mutate(kind: str, block: str, rng: random.Random) -> str:
+    """오류 1개 주입. 해당 블록에 적용할 수 없으면 빈 문자열"""
+    if kind == "unquoted_cmp":
+        return "" if _is_sequence(block) else _mutate_node_text(block, rng, [">= 70", "< 3", "> 0.8"])
+    if kind == "unquoted_amp":
+        return "" if _is_sequence(block) else _mutate_node_text(block, rng, ["& Retry", "OK?", "Pass & Go?"])
+    if kind == "edge_label":
+        edges = list(_EDGE_RE.finditer(block))
+        if _is_sequence(block) or not edges:
+            return ""
+        m = rng.choice(edges)
+        label = rng.choice(["retry < 2", "score > 70", "n <= 3"])
+        return block[:m.start()] + f"-->|{label}|{m.group(2)}{m.group(3)}" + block[m.end():]
+    if kind in ("orphan_deact", "dangling_act"):
+        msgs = list(_MSG_RE.finditer(block))
+        if not _is_sequence(block) or not msgs:
+            return ""
+        m = rng.choice(msgs)
+        indent, target = m.group(1), m.group(4)
+        if kind == "dangling_act":
+            return block[:m.end(3)] + "+" + block[m.end(3):]
+        if rng.random() < 0.5:
+            return block[:m.end(3)] + "-" + block[m.end(3):]
+        return block[:m.end()] + block[m.end():].replace("\n", f"\n{indent}deactivate {target}\n", 1)
+    if kind == "bracket":
+        idx = [i for i, ch in enumerate(block) if ch in "])}"]
+        if not idx:
+            return ""
+        i = rng.choice(idx)
+        return block[:i] + block[i + 1:]
+    if kind == "missing_type":
+        lines = block.strip().split("\n")
+        return "\n".join(lines[1:]) + "\n" if len(lines) > 1 else ""
+    raise ValueError(kind)
+
+
+MUTATIONS = ("unquoted_cmp", "unquoted_amp", "edge_label", "orphan_deact", "dangling_act",
+             "bracket", "missing_type")
+
+
+def run(blocks: list, samples: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    validator = MermaidValidator()
+    stats = defaultdict(lambda: {"invalid": 0, "auto_fixed": 0, "escalated": 0,
+                                 "saved_in_chars": 0, "saved_out_chars": 0})
+    repair_us = []
+    attempts = 0
+    while sum(s["invalid"] for s in stats.values()) < samples and attempts < samples * 20:
+        attempts += 1
+        kind = rng.choice(MUTATIONS)
+        broken = mutate(kind, rng.choice(blocks), rng)
+        if not broken:
+            continue
+        errors = validator.validate_block(broken)
+        if not errors:
+            continue  # 주입한 오류가 검증 규칙에 걸리지 않음
+        s = stats[kind]
+        s["invalid"] += 1
+        t0 = time.perf_counter()
+        content, fixed = validator.auto_repair(f"```mermaid\n{broken}```")
+        repair_us.append((time.perf_counter() - t0) * 1e6)
+        if fixed:
+            s["auto_fixed"] += 1
+            s["saved_in_chars"] += REPAIR_PROMPT_FIXED_CHARS + len(broken) + sum(len(e) for e in errors)
+            s["saved_out_chars"] += len(broken)
+        else:
+            s["escalated"] += 1
+    return {"stats": dict(stats), "repair_us": repair_us}
+
+
+def main():
+    default_corpus = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills", "mermaid-diagrams"
+    )
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--samples", type=int, default=2000, help="주입 후 검증에 실패한 블록 수")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--corpus", nargs="*", default=[default_corpus],
+                        help="mermaid 블록을 포함한 마크다운 파일/디렉토리 (예: 저장된 명세서)")
+    args = parser.parse_args()
+
+    blocks = load_corpus(args.corpus)
+    if not blocks:
+        sys.exit("말뭉치에 유효한 mermaid 블록이 없습니다")
+    result = run(blocks, args.samples, args.seed)
+    stats = result["stats"]
+
+    print(f"== 말뭉치: 유효 블록 {len(blocks)}개 "
+          f"(sequence {sum(_is_sequence(b) for b in blocks)}), 오류 주입 {args.samples}건 ==")
+    print(f"{'error':<14} {'invalid':>8} {'auto_fixed':>11} {'escalated':>10} {'avoided':>8}")
+    for kind in MUTATIONS:
+        s = stats.get(kind)
+        if not s:
+            continue
+        print(f"{kind:<14} {s['invalid']:>8} {s['auto_fixed']:>11} {s['escalated']:>10} "
+              f"{s['auto_fixed'] / s['invalid'] * 100:>7.1f}%")
+
+    invalid = sum(s["invalid"] for s in stats.values())
+    fixed = sum(s["auto_fixed"] for s in stats.values())
+    saved_in = sum(s["saved_in_chars"] for s in stats.values()) / CHARS_PER_TOKEN
+    saved_out = sum(s["saved_out_chars"] for s in stats.values()) / CHARS_PER_TOKEN
+    saved_tokens = saved_in + saved_out
+    cost = saved_in / 1e6 * PRICING["input"] + saved_out / 1e6 * PRICING["output"]
+    print(f"\nLLM 수정 호출 회피: {fixed}/{invalid} ({fixed / invalid * 100:.1f}%)")
+    print(f"추정 절감 토큰: {int(saved_tokens):,} (호출당 {int(saved_tokens / max(fixed, 1)):,}, "
+          f"~${cost:.2f})")
+    us = result["repair_us"]
+    print(f"auto_repair 지연: p50={statistics.median(us):.0f}us "
+          f"p99={sorted(us)[int(len(us) * 0.99) - 1]:.0f}us (블록당)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""세션 스냅샷 복원 vs stateless replay — 토큰/지연 비교 벤치마크 (오프라인).
+
+in-process 캐시 miss 시 두 경로를 비교한다:
+  replay  : 새 에이전트 + 전체 대화를 텍스트 blob으로 프롬프트에 삽입 (기존 fallback)
+  restore : session_store 스냅샷에서 agent.messages 복원 후 stateful 턴 진행
+
+토큰 수는 문자 수 기반 근사치(CHARS_PER_TOKEN)이며, Bedrock 호출 없이
+prompt cache 적용 규칙(이전 턴까지의 prefix는 cache read, 새 부분은 cache write)을
+모델링한다. 저장소 지연은 실제 SQLite/메모리 backend로 측정한다.
+
+사용법:
+  python benchmarks/session_restore_bench.py [--turns 12] [--miss-rate 1.0]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_store import InMemorySessionStore, SQLiteSessionStore  # noqa: E402
+from token_tracker import PRICING  # noqa: E402
+
+CHARS_PER_TOKEN = 3.0          # 한/영 혼합 텍스트 근사치
+SYSTEM_PROMPT_CHARS = 24_000   # PATTERN_ANALYSIS_SYSTEM_PROMPT + 스킬 메타데이터 근사
+INITIAL_ANALYSIS_CHARS = 6_000
+USER_MSG_CHARS = 300
+ASSISTANT_MSG_CHARS = 3_500
+TOOL_RESULT_CHARS = 8_000      # 턴당 file_read tool result (skill reference)
+
+
+def _tokens(chars: int) -> int:
+    return int(chars / CHARS_PER_TOKEN)
+
+
+def _build_messages(turns: int) -> tuple[list, list]:
+    """Strands agent.messages 형태의 합성 대화와 conversation_history 생성"""
+    messages = [
+        {"role": "user", "content": [{"text": "분석 요청 " + "가" * 1_500}]},
+        {"role": "assistant", "content": [{"text": "초기 분석 " + "나" * INITIAL_ANALYSIS_CHARS}]},
+    ]
+    history = [{"role": "assistant", "content": "나" * INITIAL_ANALYSIS_CHARS}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": [{"text": f"질문 {i} " + "다" * USER_MSG_CHARS}]})
+        messages.append({"role": "assistant", "content": [
+            {"toolUse": {"toolUseId": f"t{i}", "name": "file_read", "input": {"path": "./skills/x.md"}}},
+        ]})
+        messages.append({"role": "user", "content": [
+            {"toolResult": {"toolUseId": f"t{i}", "status": "success",
+                            "content": [{"text": "라" * TOOL_RESULT_CHARS}]}},
+        ]})
+        messages.append({"role": "assistant", "content": [{"text": "마" * ASSISTANT_MSG_CHARS}]})
+        history.append({"role": "user", "content": "다" * USER_MSG_CHARS})
+        history.append({"role": "assistant", "content": "마" * ASSISTANT_MSG_CHARS})
+    return messages, history
+
+
+def _turn_cost(fresh_input: int, cache_read: int, cache_write: int) -> float:
+    return (
+        fresh_input / 1e6 * PRICING["input"]
+        + cache_read / 1e6 * PRICING["cache_read"]
+        + cache_write / 1e6 * PRICING["cache_write"]
+    )
+
+
+def simulate_tokens(turns: int, miss_rate: float) -> dict:
+    """턴별 입력 토큰 모델링 — miss_rate 비율의 턴이 캐시 miss라고 가정"""
+    sys_t = _tokens(SYSTEM_PROMPT_CHARS)
+    user_t = _tokens(USER_MSG_CHARS)
+    asst_t = _tokens(ASSISTANT_MSG_CHARS)
+    tool_t = _tokens(TOOL_RESULT_CHARS)
+    init_t = _tokens(INITIAL_ANALYSIS_CHARS + 1_500)
+
+    totals = {
+        "replay": {"fresh": 0, "cache_read": 0, "cache_write": 0, "cost": 0.0},
+        "restore": {"fresh": 0, "cache_read": 0, "cache_write": 0, "cost": 0.0},
+    }
+    # stateful prefix(시스템 프롬프트 제외) — 이전 턴까지의 messages
+    prefix_t = init_t
+    history_text_t = _tokens(INITIAL_ANALYSIS_CHARS)
+    miss_every = (1 / miss_rate) if miss_rate > 0 else float("inf")
+
+    for turn in range(turns):
+        is_miss = miss_rate > 0 and (turn % max(int(round(miss_every)), 1) == 0)
+
+        # restore 경로: 항상 stateful — prefix는 cache read, 새 user 메시지만 fresh
+        # (tool 사이클 2회 호출: 두 번째 호출은 tool result까지 cache write)
+        r_read = 2 * (sys_t + prefix_t)
+        r_write = user_t + tool_t
+        r_fresh = user_t
+        totals["restore"]["fresh"] += r_fresh
+        totals["restore"]["cache_read"] += r_read
+        totals["restore"]["cache_write"] += r_write
+        totals["restore"]["cost"] += _turn_cost(r_fresh, r_read, r_write)
+
+        # replay 경로: miss 턴은 history blob 전체가 새 user 메시지 → cache 재사용 불가
+        if is_miss:
+            p_read = 2 * sys_t
+            p_write = history_text_t + user_t + tool_t
+            p_fresh = history_text_t + user_t
+        else:
+            p_read, p_write, p_fresh = r_read, r_write, r_fresh
+        totals["replay"]["fresh"] += p_fresh
+        totals["replay"]["cache_read"] += p_read
+        totals["replay"]["cache_write"] += p_write
+        totals["replay"]["cost"] += _turn_cost(p_fresh, p_read, p_write)
+
+        prefix_t += user_t + tool_t + asst_t + 20
+        history_text_t += user_t + asst_t
+
+    return totals
+
+
+def measure_store(store, messages: list, history: list, rounds: int) -> dict:
+    snapshot = {"version": 1, "messages": messages, "conversation_history": history,
+                "updated_at": time.time()}
+    save_ms, load_ms = [], []
+    for i in range(rounds):
+        sid = f"bench-{i % 8}"
+        t0 = time.perf_counter()
+        store.save(sid, snapshot)
+        t1 = time.perf_counter()
+        loaded = store.load(sid)
+        t2 = time.perf_counter()
+        assert loaded and len(loaded["messages"]) == len(messages)
+        save_ms.append((t1 - t0) * 1000)
+        load_ms.append((t2 - t1) * 1000)
+    return {
+        "save_p50_ms": statistics.median(save_ms),
+        "load_p50_ms": statistics.median(load_ms),
+        "save_max_ms": max(save_ms),
+        "load_max_ms": max(load_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--miss-rate", type=float, default=1.0,
+                        help="캐시 miss 턴 비율 (1.0 = 매 턴 다른 컨테이너)")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    totals = simulate_tokens(args.turns, args.miss_rate)
+    rp, rs = totals["replay"], totals["restore"]
+    print(f"== 토큰 모델 ({args.turns}턴, miss-rate={args.miss_rate}) ==")
+    print(f"{'path':<8} {'fresh_in':>10} {'cache_read':>11} {'cache_write':>12} {'cost_usd':>9}")
+    for name, t in (("replay", rp), ("restore", rs)):
+        print(f"{name:<8} {t['fresh']:>10,} {t['cache_read']:>11,} {t['cache_write']:>12,} {t['cost']:>9.4f}")
+    if rp["fresh"]:
+        print(f"fresh input token 절감: {(1 - rs['fresh'] / rp['fresh']) * 100:.1f}% "
+              f"(prefill 지연은 fresh/cache-write 토큰에 비례)")
+    if rp["cost"]:
+        print(f"입력 비용 절감: {(1 - rs['cost'] / rp['cost']) * 100:.1f}%")
+
+    messages, history = _build_messages(args.turns)
+    print(f"\n== 저장소 오버헤드 (스냅샷 messages={len(messages)}) ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": InMemorySessionStore(),
+            "sqlite": SQLiteSessionStore(os.path.join(tmp, "sessions.db")),
+        }
+        for name, store in backends.items():
+            m = measure_store(store, messages, history, args.rounds)
+            print(f"{name:<7} save p50={m['save_p50_ms']:.2f}ms max={m['save_max_ms']:.2f}ms | "
+                  f"load p50={m['load_p50_ms']:.2f}ms max={m['load_max_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -49,6 +49,17 @@ cp prompts.py "$PACKAGE_DIR/"
 cp strands_utils.py "$PACKAGE_DIR/"
 cp safe_tools.py "$PACKAGE_DIR/"
 cp token_tracker.py "$PACKAGE_DIR/"
+cp progress.py "$PACKAGE_DIR/"
+cp session_cache.py "$PACKAGE_DIR/"
+cp session_store.py "$PACKAGE_DIR/"
+cp warmup.py "$PACKAGE_DIR/"
+cp agent_pool.py "$PACKAGE_DIR/"
+cp scheduler.py "$PACKAGE_DIR/"
+cp singleflight.py "$PACKAGE_DIR/"
+cp sse_coalescer.py "$PACKAGE_DIR/"
+cp events.py "$PACKAGE_DIR/"
+cp cancellation.py "$PACKAGE_DIR/"
+cp job_queue.py "$PACKAGE_DIR/"
 
 # spec 패키지
 cp -r spec/ "$PACKAGE_DIR/spec/"
@@ -0,0 +1,205 @@
+"""요청 단위 협조적 취소 (cancel token).
+
+브라우저가 SSE 스트림을 닫으면 invoke async generator는 닫히지만, asyncio.to_thread로
+시작된 stage 스레드와 PromptAgent의 ThreadPoolExecutor 워커는 그대로 Bedrock 호출을
+계속해 수 분간 토큰과 풀 자리를 소모한다. 엔트리포인트가 요청마다 CancelToken을 만들어
+ContextVar로 바인딩하고, 스트림이 정상 완료되지 않은 채 닫히면 cancel()한다.
+
+- 전파: asyncio.to_thread와 Strands Agent 호출(run_async)은 contextvars를 복사하므로
+  orchestrator → stage 스레드 → 서브에이전트까지 토큰이 자동으로 따라간다.
+  직접 만든 ThreadPoolExecutor는 복사하지 않으므로 submit 시 copy_context().run으로 감싼다.
+- 중단: SharedClientBedrockModel.stream이 호출 시작 전 check()로 아직 시작하지 않은 호출을
+  건너뛰고(skipped), 진행 중인 스트림은 Strands cancel_signal을 set해 다음 chunk
+  경계에서 HTTP 응답을 닫는다(aborted). 둘 다 Cancelled 예외로 호출자에게 전파된다.
+- 지표: 완료된 호출의 평균 input/output 토큰과 출력 문자/토큰 비율을 지수이동평균으로
+  학습해, 건너뛴 호출은 평균 input+output, 중단된 스트림은 평균 output에서 이미 받은
+  출력을 뺀 만큼을 절약 토큰으로 추정한다 (ping 응답의 `cancellation` 필드).
+"""
+
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_EMA_ALPHA = 0.2
+
+
+class Cancelled(Exception):
+    """취소된 요청의 LLM 호출 — 건너뛰거나 중단됨"""
+
+
+class CancellationStats:
+    """프로세스 전역 취소 지표 (stage 스레드에서 갱신되므로 thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "cancelled_requests": 0,
+            "skipped_calls": 0,
+            "aborted_streams": 0,
+            "estimated_tokens_saved": 0,
+        }
+        # 완료된 호출 기준 평균 (관측 전에는 None → 절약량 추정 생략)
+        self._avg_input: Optional[float] = None
+        self._avg_output: Optional[float] = None
+        self._chars_per_token: Optional[float] = None
+
+    def observe_call(self, usage: Dict[str, Any], output_chars: int) -> None:
+        """정상 완료된 호출의 usage 반영"""
+        input_tokens = usage.get("inputTokens", 0) or 0
+        output_tokens = usage.get("outputTokens", 0) or 0
+        with self._lock:
+            self._avg_input = _ema(self._avg_input, input_tokens)
+            self._avg_output = _ema(self._avg_output, output_tokens)
+            if output_tokens > 0 and output_chars > 0:
+                self._chars_per_token = _ema(self._chars_per_token, output_chars / output_tokens)
+
+    def record_cancelled(self) -> None:
+        with self._lock:
+            self._counters["cancelled_requests"] += 1
+
+    def record_skipped(self, count: int = 1) -> None:
+        with self._lock:
+            self._counters["skipped_calls"] += count
+            if self._avg_input is not None and self._avg_output is not None:
+                self._counters["estimated_tokens_saved"] += int((self._avg_input + self._avg_output) * count)
+
+    def record_aborted(self, output_chars: int) -> None:
+        with self._lock:
+            self._counters["aborted_streams"] += 1
+            if self._avg_output is not None:
+                received = output_chars / self._chars_per_token if self._chars_per_token else 0
+                self._counters["estimated_tokens_saved"] += int(max(self._avg_output - received, 0))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "avg_call_tokens": (
+                    int(self._avg_input + self._avg_output)
+                    if self._avg_input is not None and self._avg_output is not None
+                    else None
+                ),
+            }
+
+
+def _ema(prev: Optional[float], value: float) -> float:
+    return float(value) if prev is None else (1 - _EMA_ALPHA) * prev + _EMA_ALPHA * value
+
+
+cancellation_stats = CancellationStats()
+
+
+class CancelToken:
+    """요청 1건의 취소 상태 — 어느 스레드에서든 cancel()/check() 가능"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        # 진행 중인 모델 스트림의 Strands cancel_signal (cancel 시 함께 set)
+        self._signals: List[threading.Event] = []
+        self._children: List["CancelToken"] = []
+        self._parent: Optional["CancelToken"] = None
+        self.tokens_used = 0  # 이 토큰과 하위 토큰 아래에서 완료된 모델 호출의 totalTokens 합
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, record: bool = True) -> None:
+        """멱등 — 연결된 스트림 signal과 하위 토큰을 모두 취소.
+
+        record=False면 취소 요청 수에 세지 않는다 (하위 토큰, hedge에서 진 쪽 등).
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            signals = list(self._signals)
+            children = list(self._children)
+        if record:
+            cancellation_stats.record_cancelled()
+        logger.info(f"[CANCEL] {self.label} 취소 — 진행 중 스트림 {len(signals)}개 중단")
+        for signal in signals:
+            signal.set()
+        for child in children:
+            child.cancel(record=False)
+
+    def child(self, label: str) -> "CancelToken":
+        """부모가 취소되면 함께 취소되지만 따로 취소할 수도 있는 하위 토큰"""
+        token = CancelToken(label)
+        token._parent = self
+        with self._lock:
+            self._children.append(token)
+            cancelled = self._event.is_set()
+        if cancelled:
+            token.cancel(record=False)
+        return token
+
+    def record_usage(self, usage: Dict[str, Any]) -> None:
+        """완료된 모델 호출 usage를 이 토큰과 상위 토큰 전체에 합산 (hedge 시도 안의 수정 호출 등)"""
+        tokens = usage.get("totalTokens", 0) or 0
+        token: Optional[CancelToken] = self
+        while token is not None:
+            with token._lock:
+                token.tokens_used += tokens
+            token = token._parent
+
+    def check(self) -> None:
+        """LLM 호출 시작 전 확인 — 취소됐으면 호출을 건너뛰고 Cancelled"""
+        if self._event.is_set():
+            cancellation_stats.record_skipped()
+            raise Cancelled(f"{self.label} 취소됨")
+
+    @contextmanager
+    def link(self, signal: threading.Event) -> Iterator[threading.Event]:
+        """with 블록 동안 signal을 토큰에 연결 (이미 취소됐으면 즉시 set)"""
+        with self._lock:
+            self._signals.append(signal)
+            cancelled = self._event.is_set()
+        if cancelled:
+            signal.set()
+        try:
+            yield signal
+        finally:
+            with self._lock:
+                self._signals.remove(signal)
+
+
+_current: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "cancel_token", default=None
+)
+
+
+def current_token() -> Optional[CancelToken]:
+    """현재 context에 바인딩된 토큰 (없으면 None — 취소 불가 호출)"""
+    return _current.get()
+
+
+def check() -> None:
+    """현재 토큰이 취소됐으면 Cancelled (토큰이 없으면 no-op)"""
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+@contextmanager
+def bound(token: CancelToken) -> Iterator[CancelToken]:
+    """with 블록 동안 token을 현재 context에 바인딩"""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        try:
+            _current.reset(reset)
+        except ValueError:
+            # 다른 context에서 aclose된 async generator — 원래 task와 함께 폐기된다
+            pass
+
+
+def stats() -> Dict[str, Any]:
+    return cancellation_stats.stats()
@@ -0,0 +1,192 @@
+"""SSE 이벤트 모델 — 에이전트/핸들러가 공유하는 typed, slotted 이벤트.
+
+에이전트와 핸들러는 `import events` 후 events.Progress(...)처럼 이벤트 객체를
+전달하고, 엔트리포인트 edge에서 to_wire()로 한 번만 dict로 변환한다
+(이후 AgentCore가 JSON 직렬화 1회).
+이전에는 FeasibilityAgent가 json.dumps한 문자열을 핸들러가 json.loads로 되돌려
+결과 dict가 JSON을 세 번 거쳤다.
+
+wire 형식(dict 키)은 기존 클라이언트와 동일하게 유지한다:
+  Progress → {"progress", "stage"}         Text     → {"text", "progress"?, "sessionId"?}
+  Result   → {"result"}                    Usage    → {"usage"}
+  Warning  → {"warning"}                   Error    → {"error", "progress"?, "stage"?}
+  SpecMeta → {"spec_meta", "spec_id"?, "partial"?}  Queued → {"queued", "progress", "stage"}
+  StageStatus → {"stage_status": {"stage", "status", "error"?, "cached"?}}
+  Section  → {"section": {"id", "text", "final"}}
+  SpecRun  → {"spec_run": {"run_id", "resumed", "completed"?}}
+  Sequenced → 원본 wire dict + {"event_id"} (checkpoint 기록된 spec run 이벤트)
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+class Event(ABC):
+    """SSE 이벤트 공통 베이스 — 이벤트 타입마다 wire dict 변환을 구현한다"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def to_dict(self) -> Dict[str, Any]:
+        """wire 형식 dict (모듈 docstring의 키 표와 동일)"""
+
+
+@dataclass(slots=True)
+class Progress(Event):
+    progress: int
+    stage: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"progress": self.progress, "stage": self.stage}
+
+
+@dataclass(slots=True)
+class Text(Event):
+    text: str
+    progress: Optional[int] = None
+    session_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        event: Dict[str, Any] = {"text": self.text}
+        if self.progress is not None:
+            event["progress"] = self.progress
+        if self.session_id is not None:
+            event["sessionId"] = self.session_id
+        return event
+
+
+@dataclass(slots=True)
+class Result(Event):
+    result: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"result": self.result}
+
+
+@dataclass(slots=True)
+class Usage(Event):
+    usage: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"usage": self.usage}
+
+
+@dataclass(slots=True)
+class Warning(Event):  # builtin과 이름이 겹치므로 사용처는 `events.Warning`으로 참조
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"warning": self.message}
+
+
+@dataclass(slots=True)
+class Error(Event):
+    message: str
+    progress: Optional[int] = None
+    stage: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        event: Dict[str, Any] = {}
+        if self.stage is not None:
+            event["stage"] = self.stage
+        if self.progress is not None:
+            event["progress"] = self.progress
+        event["error"] = self.message
+        return event
+
+
+@dataclass(slots=True)
+class SpecMeta(Event):
+    """구조화 메타데이터 — partial이면 완료된 stage의 키만 담으며 클라이언트가 병합한다"""
+
+    spec_meta: Dict[str, Any]
+    spec_id: Optional[str] = None  # stage 결과 보관 id — spec_section 재생성 시 참조
+    partial: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        event: Dict[str, Any] = {"spec_meta": self.spec_meta}
+        if self.spec_id is not None:
+            event["spec_id"] = self.spec_id
+        if self.partial:
+            event["partial"] = True
+        return event
+
+
+@dataclass(slots=True)
+class Queued(Event):
+    """admission 대기 — 기존 progress/stage UI에 그대로 표시된다"""
+
+    position: int
+    priority: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "queued": {"position": self.position, "priority": self.priority},
+            "progress": 0,
+            "stage": f"요청 대기 중... (대기 순서 {self.position}번째)",
+        }
+
+
+@dataclass(slots=True)
+class StageStatus(Event):
+    """명세서 stage 단위 상태 변화 (started / done / failed) — 기존 클라이언트는 무시"""
+
+    stage: str
+    status: str
+    error: Optional[str] = None
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        status: Dict[str, Any] = {"stage": self.stage, "status": self.status}
+        if self.error is not None:
+            status["error"] = self.error
+        if self.cached:
+            status["cached"] = True
+        return {"stage_status": status}
+
+
+@dataclass(slots=True)
+class Section(Event):
+    """streaming spec 모드의 섹션 단위 출력 — final=False면 누적, True면 교체"""
+
+    section_id: str
+    text: str
+    final: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"section": {"id": self.section_id, "text": self.text, "final": self.final}}
+
+
+@dataclass(slots=True)
+class SpecRun(Event):
+    """명세서 run 시작/재개 — 재연결 시 run_id + 마지막 event_id로 이어 받는다"""
+
+    run_id: str
+    resumed: bool = False
+    completed: Optional[List[str]] = None  # 재개 시 checkpoint에서 복원한 stage
+
+    def to_dict(self) -> Dict[str, Any]:
+        run: Dict[str, Any] = {"run_id": self.run_id, "resumed": self.resumed}
+        if self.completed is not None:
+            run["completed"] = self.completed
+        return {"spec_run": run}
+
+
+@dataclass(slots=True)
+class Sequenced(Event):
+    """checkpoint에 기록된 이벤트 — wire dict에 event_id(run 내 순번)를 붙인다.
+
+    text 병합 이후 단계에서 만들어지므로 sse_coalescer는 그대로 통과시킨다.
+    """
+
+    wire: Dict[str, Any]
+    event_id: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.wire, "event_id": self.event_id}
+
+
+def to_wire(event: Any) -> Any:
+    """edge 변환 — Event는 dict로, 그 외(단일 JSON 응답 dict 등)는 그대로"""
+    return event.to_dict() if isinstance(event, Event) else event
@@ -1,14 +1,15 @@
 """Step 2: Feasibility 평가 전용 Agent"""
 
 import asyncio
-import json
 import logging
 from typing import Any, AsyncIterator, Dict, List, Optional
 
+import events
 from agent_config import get_profile
-from strands_utils import strands_utils, load_skill_content, safe_extract_text
+from strands_utils import strands_utils, preload_skill_content, reset_agent_state, safe_extract_text
 from token_tracker import extract_usage
 from llm_parsing import extract_json, validate_feasibility
+from progress import OutputMeter, StageTracker, scale, stage_label, wait_with_heartbeat
 from prompts import (
     FEASIBILITY_SYSTEM_PROMPT,
     get_feasibility_evaluation_prompt,
@@ -25,10 +26,7 @@ class FeasibilityAgent:
         cfg = get_profile("feasibility")
 
         # 스킬 + 전체 reference 사전 주입 → tools/plugins 불필요, 1회 LLM 호출로 완료
-        skill_content = load_skill_content(
-            "feasibility-evaluation",
-            ["scoring-criteria.md", "improvement-suggestions.md", "risk-patterns.md"],
-        )
+        skill_content = preload_skill_content("feasibility")
         enhanced_prompt = (
             FEASIBILITY_SYSTEM_PROMPT
             + "\n\n## 참조 스킬 및 레퍼런스 (사전 로드됨 — 도구 호출 불필요)\n"
@@ -43,6 +41,10 @@ class FeasibilityAgent:
             tools=[],
         )
 
+    def reset(self):
+        """풀 반납 시 호출 — 이전 평가의 대화/메트릭 상태 제거"""
+        reset_agent_state(self.agent)
+
     def evaluate(
         self,
         form_data: Dict[str, Any],
@@ -61,7 +63,7 @@ class FeasibilityAgent:
         self,
         form_data: Dict[str, Any],
         selected_data_sources: Optional[List[dict]] = None,
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[events.Event]:
         """초기 Feasibility 평가 수행 - SSE 스트리밍 (Progress 포함)"""
         prompt = get_feasibility_evaluation_prompt(form_data, selected_data_sources)
 
@@ -76,21 +78,18 @@ class FeasibilityAgent:
         ]
 
         # 시작 알림
-        yield json.dumps({"stage": "준비도 점검 시작", "progress": 0}, ensure_ascii=False)
+        yield events.Progress(0, "준비도 점검 시작")
 
-        # LLM 호출을 백그라운드에서 실행
+        # LLM 호출을 백그라운드에서 실행 — 출력량을 meter로 측정
+        tracker = StageTracker("feasibility", OutputMeter.attach(self.agent))
         task = asyncio.create_task(asyncio.to_thread(self._evaluate_sync, prompt))
 
-        # 진행 상태 업데이트 (3초마다)
-        progress = 10
-        stage_idx = 0
-        while not task.done():
-            await asyncio.sleep(3)
-            if not task.done():
-                progress = min(progress + 15, 85)
-                stage = stages[stage_idx % len(stages)]
-                stage_idx += 1
-                yield json.dumps({"stage": stage, "progress": progress}, ensure_ascii=False)
+        # 진행 상태 업데이트 (heartbeat 주기, 완료 시 즉시 종료)
+        async for done, _ in wait_with_heartbeat([task]):
+            if done:
+                break
+            fraction = tracker.fraction()
+            yield events.Progress(scale(fraction, 10, 90), stage_label(stages, fraction))
 
         # 결과 가져오기
         try:
@@ -98,16 +97,17 @@ class FeasibilityAgent:
         except Exception as e:
             error_detail = f"[FeasibilityAgent] {type(e).__name__}: {str(e)[:200]}"
             logger.error(f"Feasibility 평가 실패: {error_detail}", exc_info=True)
-            yield json.dumps({"stage": "오류 발생", "progress": 100, "error": f"평가 중 오류가 발생했습니다. ({error_detail})"}, ensure_ascii=False)
+            yield events.Error(f"평가 중 오류가 발생했습니다. ({error_detail})", progress=100, stage="오류 발생")
             return
+        tracker.finish()
 
         usage = result.pop("_usage", None)
 
         # 완료 및 결과 전송
-        yield json.dumps({"stage": "분석 완료", "progress": 100}, ensure_ascii=False)
-        yield json.dumps({"result": result}, ensure_ascii=False)
+        yield events.Progress(100, "분석 완료")
+        yield events.Result(result)
         if usage:
-            yield json.dumps({"usage": usage}, ensure_ascii=False)
+            yield events.Usage(usage)
 
     def _evaluate_sync(self, prompt: str) -> Dict[str, Any]:
         """동기 평가 (내부용)"""
@@ -142,7 +142,7 @@ class FeasibilityAgent:
         previous_evaluation: Dict[str, Any],
         improvement_plans: Dict[str, str],
         selected_data_sources: Optional[List[dict]] = None,
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[events.Event]:
         """개선안 반영 재평가 - SSE 스트리밍 (Progress 포함, 타임아웃 방지)"""
         stages = [
             "개선 방안 분석 중...",
@@ -154,8 +154,9 @@ class FeasibilityAgent:
             "점수 변화 계산 중...",
         ]
 
-        yield json.dumps({"stage": "재평가 시작", "progress": 0}, ensure_ascii=False)
+        yield events.Progress(0, "재평가 시작")
 
+        tracker = StageTracker("feasibility_update", OutputMeter.attach(self.agent))
         task = asyncio.create_task(
             asyncio.to_thread(
                 self.reevaluate,
@@ -166,27 +167,24 @@ class FeasibilityAgent:
             )
         )
 
-        progress = 10
-        stage_idx = 0
-        while not task.done():
-            await asyncio.sleep(3)
-            if not task.done():
-                progress = min(progress + 12, 85)
-                stage = stages[stage_idx % len(stages)]
-                stage_idx += 1
-                yield json.dumps({"stage": stage, "progress": progress}, ensure_ascii=False)
+        async for done, _ in wait_with_heartbeat([task]):
+            if done:
+                break
+            fraction = tracker.fraction()
+            yield events.Progress(scale(fraction, 10, 90), stage_label(stages, fraction))
 
         try:
             result = await task
         except Exception as e:
             error_detail = f"[FeasibilityAgent.reevaluate] {type(e).__name__}: {str(e)[:200]}"
             logger.error(f"Feasibility 재평가 실패: {error_detail}", exc_info=True)
-            yield json.dumps({"stage": "오류 발생", "progress": 100, "error": f"재평가 중 오류가 발생했습니다. ({error_detail})"}, ensure_ascii=False)
+            yield events.Error(f"재평가 중 오류가 발생했습니다. ({error_detail})", progress=100, stage="오류 발생")
             return
+        tracker.finish()
 
         usage = result.pop("_usage", None)
 
-        yield json.dumps({"stage": "재평가 완료", "progress": 100}, ensure_ascii=False)
-        yield json.dumps({"result": result}, ensure_ascii=False)
+        yield events.Progress(100, "재평가 완료")
+        yield events.Result(result)
         if usage:
-            yield json.dumps({"usage": usage}, ensure_ascii=False)
+            yield events.Usage(usage)
@@ -0,0 +1,206 @@
+"""컨테이너 내 비동기 작업 큐 — 긴 생성을 SSE 연결 없이 실행 (submit → status 폴링 → result).
+
+spec은 수 분 동안 AgentCore → Next.js relay → 브라우저 SSE 연결 하나를 붙잡고 있어
+프록시 타임아웃에 취약하고 연결 자원을 오래 점유한다. 작업 큐는 요청 즉시 job id를
+돌려주고, 고정 개수의 worker task가 FIFO로 작업을 실행한다.
+
+- 동시 실행 수는 worker 수로, 대기 작업 수는 max_queued로 제한한다 (초과 시 QueueFull).
+  대기 중인 작업은 admission 예약이나 에이전트 풀 인스턴스를 점유하지 않는다.
+- 작업 함수는 Job을 받아 progress/stage/info를 갱신하고 결과를 반환한다.
+  JobFailed는 예상된 실패(생성 오류 이벤트 등)로 traceback 없이 기록한다.
+- 끝난 작업은 ttl 동안 보관해 결과 조회를 허용한 뒤 정리한다 (submit/조회 시 lazy).
+- 작업은 등록한 owner(세션)에 묶인다. 조회·멱등 재등록은 (owner, job_id) 단위라서 job_id를
+  아는 다른 세션은 작업을 볼 수 없고, 같은 job_id를 써도 별개 작업이 된다.
+
+모든 연산은 이벤트 루프 스레드에서만 호출한다 (lock 불필요).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """대기 작업 수 상한 초과"""
+
+
+class JobFailed(Exception):
+    """작업 함수가 보고하는 예상된 실패 (메시지가 그대로 job.error가 된다)"""
+
+
+class Job:
+    """작업 1건의 상태 — 작업 함수가 progress/stage/info를 직접 갱신한다"""
+
+    __slots__ = ("id", "owner", "status", "progress", "stage", "info", "result", "error",
+                 "created_at", "started_at", "finished_at", "_run")
+
+    def __init__(self, job_id: str, run: Callable[["Job"], Awaitable[Any]], owner: str = ""):
+        self.id = job_id
+        self.owner = owner
+        self.status = JOB_QUEUED
+        self.progress = 0
+        self.stage = ""
+        self.info: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._run = run
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def snapshot(self, position: Optional[int] = None) -> Dict[str, Any]:
+        """status 응답용 dict (결과 본문 제외)"""
+        snapshot: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            **self.info,
+        }
+        if position is not None:
+            snapshot["position"] = position
+        if self.started_at is not None:
+            snapshot["started_at"] = self.started_at
+        if self.finished_at is not None:
+            snapshot["finished_at"] = self.finished_at
+        if self.error is not None:
+            snapshot["error"] = self.error
+        return snapshot
+
+
+class JobQueue:
+    """고정 worker 수 + 대기열 상한 + 완료 작업 TTL 보관"""
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queued: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._name = name
+        self._workers = max(workers, 1)
+        self._max_queued = max(max_queued, 0)
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._jobs: "OrderedDict[Tuple[str, str], Job]" = OrderedDict()  # (owner, job_id) -> Job
+        self._queued: Deque[Job] = deque()  # 대기열 위치 계산용 (실행 순서는 _pending)
+        self._pending: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._counters = {"submitted": 0, "rejected": 0, "done": 0, "failed": 0}
+
+    def submit(
+        self, run: Callable[[Job], Awaitable[Any]], job_id: Optional[str] = None, owner: str = ""
+    ) -> Job:
+        """작업 등록 후 즉시 반환. 같은 owner의 같은 job_id가 이미 있으면 기존 작업 반환 (재시도 멱등)."""
+        self._expire()
+        if job_id is not None and (owner, job_id) in self._jobs:
+            return self._jobs[(owner, job_id)]
+        if len(self._queued) >= self._max_queued:
+            self._counters["rejected"] += 1
+            raise QueueFull(f"{self._name} 작업 대기열이 가득 찼습니다 ({self._max_queued}건)")
+        job = Job(job_id or uuid.uuid4().hex, run, owner)
+        self._jobs[(owner, job.id)] = job
+        self._queued.append(job)
+        self._counters["submitted"] += 1
+        self._ensure_workers()
+        self._pending.put_nowait(job)
+        logger.info(f"[JOB QUEUE] {self._name} 등록 job={job.id[:8]} 대기={len(self._queued)}")
+        return job
+
+    def get(self, job_id: str, owner: str = "") -> Optional[Job]:
+        """owner가 등록한 작업 (다른 owner의 작업은 없는 것과 같다)"""
+        self._expire()
+        return self._jobs.get((owner, job_id))
+
+    def position(self, job: Job) -> Optional[int]:
+        """대기 중이면 1부터 시작하는 대기열 위치, 아니면 None"""
+        if job.status != JOB_QUEUED:
+            return None
+        for index, queued in enumerate(self._queued, start=1):
+            if queued is job:
+                return index
+        return None
+
+    def status(self, job_id: str, owner: str = "") -> Optional[Dict[str, Any]]:
+        job = self.get(job_id, owner)
+        return job.snapshot(self.position(job)) if job is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        running = sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+        return {
+            **self._counters,
+            "workers": self._workers,
+            "running": running,
+            "queued": len(self._queued),
+            "retained": len(self._jobs),
+        }
+
+    # ── 내부 ─────────────────────────────────
+
+    def _ensure_workers(self) -> None:
+        """첫 submit 시 현재 이벤트 루프에 worker task 시작"""
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for index in range(len(self._tasks), self._workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"{self._name}-job-worker-{index}"))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._pending.get()
+            self._queued.remove(job)
+            await self._execute(job)
+
+    async def _execute(self, job: Job) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = self._clock()
+        try:
+            job.result = await job._run(job)
+            job.status = JOB_DONE
+            self._counters["done"] += 1
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "작업이 취소되었습니다"
+            raise
+        except JobFailed as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            self._counters["failed"] += 1
+        except Exception as e:
+            logger.error(f"[JOB QUEUE] {self._name} job={job.id[:8]} 실패", exc_info=True)
+            job.status = JOB_FAILED
+            job.error = f"{type(e).__name__}: {str(e)[:200]}"
+            self._counters["failed"] += 1
+        finally:
+            job.finished_at = self._clock()
+            job._run = None
+            logger.info(
+                f"[JOB QUEUE] {self._name} job={job.id[:8]} {job.status} "
+                f"({job.finished_at - job.started_at:.1f}s)"
+            )
+
+    def _expire(self) -> None:
+        """ttl이 지난 완료 작업 정리"""
+        cutoff = self._clock() - self._ttl
+        for key in [
+            key for key, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[key]
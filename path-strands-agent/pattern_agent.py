@@ -2,11 +2,14 @@
 
 import logging
 import os
+import time
 from typing import Any, AsyncIterator, Dict, List, Optional
 
 from strands import AgentSkills
+import events
 from agent_config import get_profile
 from safe_tools import safe_file_read
+from session_store import SNAPSHOT_VERSION
 from strands_utils import strands_utils, safe_extract_text
 from token_tracker import extract_usage
 from llm_parsing import extract_json, validate_analysis
@@ -20,6 +23,22 @@ from prompts import (
 logger = logging.getLogger(__name__)
 _SKILLS_DIR = os.path.join(os.path.dirname(__file__), "skills")
 
+# 에이전트 인스턴스 고정 비용 근사 (모델/플러그인/시스템 프롬프트 등)
+_AGENT_BASE_BYTES = 64 * 1024
+
+
+def _block_bytes(block: Any) -> int:
+    """Strands content block 크기 근사 (text / toolUse / toolResult)"""
+    if not isinstance(block, dict):
+        return 0
+    if "text" in block:
+        return len(block["text"]) * 3
+    if "toolResult" in block:
+        return sum(_block_bytes(b) for b in block["toolResult"].get("content", []))
+    if "toolUse" in block:
+        return len(str(block["toolUse"].get("input", ""))) + 128
+    return 256
+
 
 class PatternAnalyzerAgent:
     """Step3: Feasibility 결과를 바탕으로 패턴 분석하는 Agent (AgentSkills 플러그인)"""
@@ -54,6 +73,37 @@ class PatternAnalyzerAgent:
         """대화 히스토리 초기화"""
         self.conversation_history = []
 
+    def snapshot(self) -> Dict[str, Any]:
+        """세션 저장소용 스냅샷 (Strands agent.messages + 대화 히스토리)"""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "messages": list(self.agent.messages),
+            "conversation_history": list(self.conversation_history),
+            "updated_at": time.time(),
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> bool:
+        """스냅샷으로 stateful 대화 상태 복원. 형식이 맞지 않으면 False."""
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        messages = snapshot.get("messages")
+        history = snapshot.get("conversation_history")
+        if not isinstance(messages, list) or not isinstance(history, list):
+            return False
+        self.agent.messages = messages
+        self.conversation_history = history
+        return True
+
+    def estimated_bytes(self) -> int:
+        """세션 캐시 eviction용 메모리 추정치 (대화·tool result 텍스트 + 고정 오버헤드)"""
+        total = _AGENT_BASE_BYTES
+        for msg in self.agent.messages:
+            for block in msg.get("content", []) if isinstance(msg, dict) else []:
+                total += _block_bytes(block)
+        for msg in self.conversation_history:
+            total += len(msg.get("content", "")) * 3  # UTF-8 한글 최대 3바이트
+        return total
+
     def analyze(
         self,
         form_data: Dict[str, Any],
@@ -70,7 +120,7 @@ class PatternAnalyzerAgent:
         self.add_message("assistant", response)
         return response
 
-    async def _stream_filtered(self, prompt: str) -> AsyncIterator[dict]:
+    async def _stream_filtered(self, prompt: str) -> AsyncIterator[Any]:
         """Tool 사용 시 meta-commentary를 필터링하는 스트리밍 헬퍼
 
         동작 원리:
@@ -78,6 +128,9 @@ class PatternAnalyzerAgent:
         2. current_tool_use 이벤트 → 버퍼 폐기 (tool 전 메타 코멘터리 제거)
         3. start 이벤트 (tool 후 새 사이클) → 스트리밍 모드 전환
         4. tool 미사용 시 → 100자 초과 시 자동 플러시 (지연 최소화)
+
+        events.Text / events.Usage를 yield하고, 마지막에 내부용
+        {"_full_response": ...} dict로 전체 응답을 전달한다.
         """
         full_response = ""
         usage = None
@@ -91,14 +144,14 @@ class PatternAnalyzerAgent:
                     chunk = event["data"]
                     if streaming:
                         full_response += chunk
-                        yield {"text": chunk}
+                        yield events.Text(chunk)
                     else:
                         buffer += chunk
                         # Tool 미사용이 확실해지면 바로 스트리밍 시작
                         if not had_tool_use and len(buffer) > 100:
                             streaming = True
                             full_response += buffer
-                            yield {"text": buffer}
+                            yield events.Text(buffer)
                             buffer = ""
                 elif "current_tool_use" in event:
                     had_tool_use = True
@@ -116,11 +169,11 @@ class PatternAnalyzerAgent:
         # 잔여 버퍼 플러시 (짧은 응답 또는 tool 미사용)
         if buffer:
             full_response += buffer
-            yield {"text": buffer}
+            yield events.Text(buffer)
 
         yield {"_full_response": full_response}
         if usage:
-            yield {"usage": usage}
+            yield events.Usage(usage)
 
     async def analyze_stream(
         self,
@@ -128,15 +181,15 @@ class PatternAnalyzerAgent:
         feasibility: Dict[str, Any],
         improvement_plans: Optional[Dict[str, str]] = None,
         selected_data_sources: Optional[List[dict]] = None,
-    ) -> AsyncIterator[dict]:
-        """Feasibility 기반 초기 패턴 분석 - 스트리밍 버전 (dict yield)"""
+    ) -> AsyncIterator[events.Event]:
+        """Feasibility 기반 초기 패턴 분석 - 스트리밍 버전 (Text/Usage 이벤트 yield)"""
         prompt = get_pattern_analysis_prompt(
             form_data, feasibility, improvement_plans,
             selected_data_sources=selected_data_sources,
         )
 
         async for chunk in self._stream_filtered(prompt):
-            if "_full_response" in chunk:
+            if isinstance(chunk, dict):
                 self.add_message("assistant", chunk["_full_response"])
             else:
                 yield chunk
@@ -146,8 +199,8 @@ class PatternAnalyzerAgent:
         user_message: str,
         stateful: bool = False,
         selected_data_sources: Optional[List[dict]] = None,
-    ) -> AsyncIterator[dict]:
-        """패턴 관련 대화 - 스트리밍 버전 (Skill 시스템 지원, dict yield)"""
+    ) -> AsyncIterator[events.Event]:
+        """패턴 관련 대화 - 스트리밍 버전 (Skill 시스템 지원, Text/Usage 이벤트 yield)"""
         self.add_message("user", user_message)
 
         if stateful:
@@ -167,7 +220,7 @@ class PatternAnalyzerAgent:
             )
 
         async for chunk in self._stream_filtered(prompt):
-            if "_full_response" in chunk:
+            if isinstance(chunk, dict):
                 self.add_message("assistant", chunk["_full_response"])
             else:
                 yield chunk
@@ -0,0 +1,160 @@
+"""Stage 진행률 추정 + 완료 즉시 깨어나는 heartbeat 대기 유틸리티.
+
+고정 sleep 폴링 대신 `asyncio.wait(..., timeout=...)`으로 대기하므로
+작업이 끝나는 즉시 스트림이 재개된다. 진행률은 고정 +N% 가 아니라
+실제 신호(스트리밍된 출력량, 경과 시간 대비 과거 stage 소요 시간)로 추정한다.
+"""
+
+import asyncio
+import threading
+import time
+from typing import AsyncIterator, Iterable, Optional, Set, Tuple
+
+# heartbeat 간격 — 작업 완료는 이 간격과 무관하게 즉시 감지된다
+HEARTBEAT_SECONDS = 3.0
+
+# 실행 이력이 없을 때의 기본 기대치: (소요 초, 출력 문자 수)
+_DEFAULT_EXPECTATIONS: dict[str, Tuple[float, int]] = {
+    "feasibility": (45.0, 6_000),
+    "feasibility_update": (45.0, 6_000),
+    "design": (90.0, 14_000),
+    "diagram": (60.0, 6_000),
+    "prompt": (60.0, 12_000),
+    "tool": (60.0, 8_000),
+    "data_integration": (30.0, 4_000),
+}
+_FALLBACK_EXPECTATION = (60.0, 8_000)
+_EMA_ALPHA = 0.3
+
+# 선형 구간 상한 — 이후에는 완료 전까지 _MAX_FRACTION에 점근
+_LINEAR_UNTIL = 0.85
+_MAX_FRACTION = 0.97
+
+
+class StageHistory:
+    """stage별 소요 시간·출력량 지수이동평균 (프로세스 전역, thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expected: dict[str, Tuple[float, float]] = {}
+
+    def expected(self, stage: str) -> Tuple[float, float]:
+        """(기대 소요 초, 기대 출력 문자 수)"""
+        with self._lock:
+            if stage in self._expected:
+                return self._expected[stage]
+        return _DEFAULT_EXPECTATIONS.get(stage, _FALLBACK_EXPECTATION)
+
+    def record(self, stage: str, seconds: float, chars: int):
+        """완료된 stage 실측치를 반영"""
+        with self._lock:
+            prev = self._expected.get(stage)
+            if prev is None:
+                prev = _DEFAULT_EXPECTATIONS.get(stage, _FALLBACK_EXPECTATION)
+            exp_s, exp_c = prev
+            new_s = (1 - _EMA_ALPHA) * exp_s + _EMA_ALPHA * max(seconds, 1.0)
+            # 출력 미측정(0) 시 기존 기대치 유지
+            new_c = (1 - _EMA_ALPHA) * exp_c + _EMA_ALPHA * chars if chars > 0 else exp_c
+            self._expected[stage] = (new_s, new_c)
+
+
+stage_history = StageHistory()
+
+
+class OutputMeter:
+    """Strands callback_handler 호환 — 스트리밍된 출력 문자 수를 누적.
+
+    Agent 호출은 asyncio.to_thread 안에서 실행되므로 여러 스레드가
+    동시에 갱신할 수 있어 lock으로 보호한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.chars = 0
+
+    def __call__(self, **kwargs):
+        data = kwargs.get("data")
+        if isinstance(data, str) and data:
+            with self._lock:
+                self.chars += len(data)
+
+    @classmethod
+    def attach(cls, agent) -> "OutputMeter":
+        """Strands Agent의 callback_handler로 새 meter를 설치하고 반환"""
+        meter = cls()
+        agent.callback_handler = meter
+        return meter
+
+
+class StageTracker:
+    """단일 stage 진행률 추정 — 경과 시간과 출력량 중 앞선 신호를 사용"""
+
+    def __init__(self, stage: str, meter: Optional[OutputMeter] = None):
+        self.stage = stage
+        self.meter = meter
+        self.started = time.monotonic()
+        self.finished = False
+        self._expected_s, self._expected_c = stage_history.expected(stage)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def fraction(self) -> float:
+        """0.0 ~ 1.0 (완료 전에는 _MAX_FRACTION 미만)"""
+        if self.finished:
+            return 1.0
+        chars = self.meter.chars if self.meter else 0
+        raw = max(
+            self.elapsed / max(self._expected_s, 1.0),
+            chars / max(self._expected_c, 1.0),
+        )
+        if raw <= _LINEAR_UNTIL:
+            return raw
+        # 기대치를 넘겨도 100%에 닿지 않도록 점근
+        overshoot = raw - _LINEAR_UNTIL
+        return _LINEAR_UNTIL + (_MAX_FRACTION - _LINEAR_UNTIL) * (1 - 1 / (1 + 3 * overshoot))
+
+    def finish(self, record: bool = True):
+        """완료 처리 — record=True면 실측치를 이력에 반영.
+
+        meter가 출력을 하나도 관측하지 못했다면(LLM 미호출 short-circuit 등)
+        이력을 왜곡하지 않도록 기록하지 않는다.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        if record and (self.meter is None or self.meter.chars > 0):
+            stage_history.record(
+                self.stage, self.elapsed, self.meter.chars if self.meter else 0
+            )
+
+
+def scale(fraction: float, lo: int, hi: int) -> int:
+    """0~1 fraction을 [lo, hi] 진행률 구간으로 변환"""
+    return int(lo + (hi - lo) * max(0.0, min(fraction, 1.0)))
+
+
+def stage_label(labels: list[str], fraction: float) -> str:
+    """진행 fraction에 대응하는 단계 라벨 선택"""
+    if not labels:
+        return ""
+    idx = min(int(fraction * len(labels)), len(labels) - 1)
+    return labels[idx]
+
+
+async def wait_with_heartbeat(
+    tasks: Iterable[asyncio.Future],
+    interval: float = HEARTBEAT_SECONDS,
+) -> AsyncIterator[Tuple[Set[asyncio.Future], Set[asyncio.Future]]]:
+    """tasks가 모두 끝날 때까지 (done, pending)을 yield.
+
+    하나라도 완료되면 즉시, 아무것도 완료되지 않으면 interval마다 yield한다.
+    done이 비어 있으면 heartbeat 틱이다.
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, timeout=interval, return_when=asyncio.FIRST_COMPLETED
+        )
+        yield done, pending
@@ -0,0 +1,221 @@
+"""invoke 디스패처 앞단의 admission control + 우선순위 스케줄러.
+
+컨테이너 하나에서 spec(요청당 ~10개 동시 Bedrock 호출) 여러 개와 대화형
+pattern_chat이 함께 실행되면 chat 지연이 급격히 나빠진다. 요청마다 예상 동시
+LLM 호출 수(weight)를 예약하고, 합계가 MAX_CONCURRENT_LLM_CALLS를 넘으면 대기시킨다.
+
+대기열 순서 (작을수록 먼저):
+  1. 우선순위 클래스: chat < feasibility < finalize < spec
+     — 대기 시간이 _AGING_SECONDS 지날 때마다 한 단계씩 승격 (spec 기아 방지).
+       weight가 1보다 큰 요청(spec, spec_section)은 feasibility 클래스까지만 승격한다.
+       오래 기다린 spec이 맨 앞에서 자리 10여 개를 기다리는 동안 chat이 막히지 않도록.
+  2. 세션 공정성: 같은 클래스 안에서는 현재 실행 중인 요청이 적은 세션 우선
+  3. 도착 순서 (FIFO)
+
+맨 앞 요청이 들어갈 자리가 없으면 뒤의 작은 요청도 추월하지 않는다 (큰 요청 기아 방지).
+chat은 승격된 spec보다도 항상 앞에 정렬되므로 이 대기에 걸리지 않는다.
+단일 요청의 weight가 한도보다 크면 한도로 잘라 단독 실행을 허용한다.
+
+모든 연산은 이벤트 루프 스레드에서만 호출한다 (lock 불필요).
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import events
+from agent_config import (
+    MAX_CONCURRENT_LLM_CALLS,
+    SPEC_HEDGE_LLM_CALLS,
+    SPEC_LLM_FANOUT,
+    SPEC_SECTION_LLM_FANOUT,
+)
+from progress import HEARTBEAT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 클래스 (숫자가 작을수록 우선)
+PRIORITY_CHAT = 0
+PRIORITY_FEASIBILITY = 1
+PRIORITY_FINALIZE = 2
+PRIORITY_SPEC = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_CHAT: "chat",
+    PRIORITY_FEASIBILITY: "feasibility",
+    PRIORITY_FINALIZE: "finalize",
+    PRIORITY_SPEC: "spec",
+}
+
+# action → (우선순위, 예상 동시 LLM 호출 수). 여기 없는 action(ping 등)은 스케줄링하지 않는다.
+# spec 계열은 hedging이 켜져 있으면 요청당 hedge 1개분(SPEC_HEDGE_LLM_CALLS)을 함께 예약한다.
+ACTION_CLASSES: Dict[str, tuple[int, int]] = {
+    "pattern_chat": (PRIORITY_CHAT, 1),
+    "pattern_analyze": (PRIORITY_CHAT, 1),
+    "feasibility": (PRIORITY_FEASIBILITY, 1),
+    "feasibility_update": (PRIORITY_FEASIBILITY, 1),
+    "pattern_finalize": (PRIORITY_FINALIZE, 1),
+    "spec": (PRIORITY_SPEC, SPEC_LLM_FANOUT + SPEC_HEDGE_LLM_CALLS),
+    "spec_section": (PRIORITY_SPEC, SPEC_SECTION_LLM_FANOUT + SPEC_HEDGE_LLM_CALLS),
+}
+
+_AGING_SECONDS = 30.0
+# weight > 1 요청이 aging으로 올라갈 수 있는 최고 클래스 (chat 앞으로는 가지 않는다)
+_HEAVY_PRIORITY_FLOOR = PRIORITY_FEASIBILITY
+
+
+class Ticket:
+    """admission 요청 1건"""
+
+    __slots__ = ("action", "session_id", "priority", "weight", "seq",
+                 "enqueued_at", "granted", "_wake")
+
+    def __init__(self, action: str, session_id: str, priority: int, weight: int,
+                 seq: int, enqueued_at: float):
+        self.action = action
+        self.session_id = session_id
+        self.priority = priority
+        self.weight = weight
+        self.seq = seq
+        self.enqueued_at = enqueued_at
+        self.granted = False
+        self._wake = asyncio.Event()
+
+
+class AdmissionScheduler:
+    """동시 LLM 호출 수 상한 + 우선순위/세션 공정성 대기열"""
+
+    def __init__(
+        self,
+        capacity: int = MAX_CONCURRENT_LLM_CALLS,
+        aging_seconds: float = _AGING_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._capacity = max(capacity, 1)
+        self._aging = aging_seconds
+        self._clock = clock
+        self._in_use = 0
+        self._waiting: List[Ticket] = []
+        self._active_by_session: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._counters = {"admitted": 0, "queued": 0, "abandoned": 0}
+
+    @staticmethod
+    def is_scheduled(action: str) -> bool:
+        return action in ACTION_CLASSES
+
+    def submit(self, action: str, session_id: str = "") -> Ticket:
+        """대기열 등록 — 자리가 있고 앞선 대기자가 없으면 즉시 승인"""
+        priority, weight = ACTION_CLASSES[action]
+        ticket = Ticket(
+            action, session_id, priority, min(weight, self._capacity),
+            next(self._seq), self._clock(),
+        )
+        self._waiting.append(ticket)
+        self._dispatch()
+        if not ticket.granted:
+            self._counters["queued"] += 1
+            logger.info(
+                f"[SCHEDULER] 대기 action={action} position={self.position(ticket)} "
+                f"in_use={self._in_use}/{self._capacity}"
+            )
+        return ticket
+
+    async def wait(
+        self, ticket: Ticket, interval: float = HEARTBEAT_SECONDS
+    ) -> AsyncIterator[int]:
+        """승인될 때까지 대기하며 대기열 위치(1부터)를 yield.
+
+        위치가 바뀔 때와 heartbeat 간격마다 yield하고, 승인되면 즉시 종료한다.
+        """
+        while not ticket.granted:
+            # yield 전에 clear — 소비자가 위치 이벤트를 처리하는 동안 승인되면 알림이 남아 있도록
+            ticket._wake.clear()
+            yield self.position(ticket)
+            if ticket.granted:
+                return
+            try:
+                await asyncio.wait_for(ticket._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self, ticket: Ticket) -> None:
+        """실행 종료(또는 대기 중 이탈) — 예약 해제 후 다음 대기자 승인"""
+        if ticket.granted:
+            ticket.granted = False
+            self._in_use -= ticket.weight
+            remaining = self._active_by_session.get(ticket.session_id, 1) - 1
+            if remaining > 0:
+                self._active_by_session[ticket.session_id] = remaining
+            else:
+                self._active_by_session.pop(ticket.session_id, None)
+        elif ticket in self._waiting:
+            self._waiting.remove(ticket)
+            self._counters["abandoned"] += 1
+        else:
+            return
+        self._dispatch()
+        for waiter in self._waiting:
+            waiter._wake.set()  # 위치 변경 알림
+
+    def position(self, ticket: Ticket) -> int:
+        """현재 대기열 순서상 위치 (1 = 다음 승인 대상, 승인됨 = 0)"""
+        if ticket.granted:
+            return 0
+        now = self._clock()
+        ordered = sorted(self._waiting, key=lambda t: self._order_key(t, now))
+        return ordered.index(ticket) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        return {
+            **self._counters,
+            "capacity": self._capacity,
+            "in_use": self._in_use,
+            "waiting": len(self._waiting),
+            "waiting_by_class": {
+                name: sum(1 for t in self._waiting if t.priority == prio)
+                for prio, name in PRIORITY_NAMES.items()
+            },
+            "oldest_wait_seconds": round(
+                max((now - t.enqueued_at for t in self._waiting), default=0.0), 1
+            ),
+        }
+
+    # ── 내부 ─────────────────────────────────
+
+    def _order_key(self, ticket: Ticket, now: float) -> tuple:
+        aged = int((now - ticket.enqueued_at) // self._aging) if self._aging > 0 else 0
+        floor = min(_HEAVY_PRIORITY_FLOOR, ticket.priority) if ticket.weight > 1 else 0
+        return (
+            max(ticket.priority - aged, floor),
+            self._active_by_session.get(ticket.session_id, 0),
+            ticket.seq,
+        )
+
+    def _next_waiter(self) -> Optional[Ticket]:
+        if not self._waiting:
+            return None
+        now = self._clock()
+        return min(self._waiting, key=lambda t: self._order_key(t, now))
+
+    def _dispatch(self) -> None:
+        while True:
+            ticket = self._next_waiter()
+            if ticket is None or self._in_use + ticket.weight > self._capacity:
+                return
+            self._waiting.remove(ticket)
+            self._in_use += ticket.weight
+            self._active_by_session[ticket.session_id] = (
+                self._active_by_session.get(ticket.session_id, 0) + 1
+            )
+            ticket.granted = True
+            self._counters["admitted"] += 1
+            ticket._wake.set()
+
+
+def queued_event(ticket: Ticket, position: int) -> events.Queued:
+    """대기 중 SSE 이벤트 — 기존 progress/stage UI에 그대로 표시된다"""
+    return events.Queued(position, PRIORITY_NAMES[ticket.priority])
@@ -0,0 +1,215 @@
+"""In-process 세션 캐시 — LRU 순서 + heap 기반 TTL 만료 + 추정 바이트 기반 eviction.
+
+- get()이 hit 시 move_to_end로 LRU 순서를 갱신하므로 hot 세션이 먼저 밀려나지 않는다.
+- TTL 만료는 (expires_at, seq, key) min-heap으로 관리 → 만료 처리 O(log n).
+  접근 시 heap에 새 항목을 push하고 이전 항목은 lazy deletion으로 무시한다.
+- 만료 정리는 요청 경로가 아니라 백그라운드 sweeper task가 주기적으로 수행한다.
+- 용량 제한은 세션 수가 아니라 sizer가 추정한 바이트 합계로 적용한다.
+
+finalize는 asyncio.to_thread 안에서 호출되므로 모든 연산은 lock으로 보호한다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+_SWEEP_INTERVAL_SECONDS = 30.0
+
+
+class _Entry(Generic[V]):
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: V, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class SessionCache(Generic[V]):
+    """LRU + TTL + 바이트 한도 캐시"""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_bytes: int,
+        sizer: Callable[[V], int],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._sizer = sizer
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry[V]]" = OrderedDict()
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    # ── 조회 / 저장 ─────────────────────────────
+
+    def get(self, key: str) -> Optional[V]:
+        """hit 시 LRU 순서와 TTL을 갱신해 값을 반환. miss/만료 시 None."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if entry.expires_at <= now:
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._schedule(key, entry, now)
+            self._counters["hits"] += 1
+            return entry.value
+
+    def put(self, key: str, value: V) -> None:
+        """값 저장 (기존 항목 교체) 후 바이트 한도 적용"""
+        size = self._safe_size(value)
+        now = self._clock()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, 0.0, size)
+            self._entries[key] = entry
+            self._bytes += size
+            self._schedule(key, entry, now)
+            self._enforce_limit(protect=key)
+
+    def resize(self, key: str) -> None:
+        """값이 커졌을 때(대화 턴 누적) 크기를 재추정하고 한도 적용"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value = entry.value
+        size = self._safe_size(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.value is not value:
+                return
+            self._bytes += size - entry.size
+            entry.size = size
+            self._enforce_limit(protect=key)
+
+    def pop(self, key: str) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._remove(key)
+            return entry.value
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ── 만료 ─────────────────────────────────
+
+    def expire(self) -> int:
+        """만료 항목 제거 — heap top만 확인하므로 항목당 O(log n). 제거 수 반환."""
+        now = self._clock()
+        removed = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, _, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                # 이후 접근으로 만료 시각이 갱신된 stale heap 항목은 무시
+                if entry is None or entry.expires_at != expires_at:
+                    continue
+                self._remove(key)
+                self._counters["expirations"] += 1
+                removed += 1
+            self._compact_heap()
+        return removed
+
+    def ensure_sweeper(self, interval: float = _SWEEP_INTERVAL_SECONDS) -> None:
+        """실행 중인 event loop에 백그라운드 sweeper task를 1회 등록"""
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sweeper = loop.create_task(self._sweep_loop(interval))
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = self.expire()
+                if removed:
+                    logger.info(f"[SESSION CACHE] 만료 세션 {removed}개 정리")
+            except Exception as e:  # sweeper는 절대 죽지 않도록
+                logger.warning(f"[SESSION CACHE] sweeper 오류: {type(e).__name__}: {e}")
+
+    # ── 통계 ─────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    # ── 내부 (lock 보유 상태에서 호출) ─────────────
+
+    def _safe_size(self, value: V) -> int:
+        try:
+            return max(int(self._sizer(value)), 0)
+        except Exception as e:
+            logger.warning(f"[SESSION CACHE] 크기 추정 실패: {type(e).__name__}: {e}")
+            return 0
+
+    def _schedule(self, key: str, entry: _Entry[V], now: float) -> None:
+        entry.expires_at = now + self._ttl
+        heapq.heappush(self._heap, (entry.expires_at, next(self._seq), key))
+        self._compact_heap()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _enforce_limit(self, protect: Optional[str] = None) -> None:
+        """LRU 순으로 바이트 한도 이하가 될 때까지 제거 (방금 사용한 항목은 보존)"""
+        if self._bytes <= self._max_bytes:
+            return
+        victims = []
+        freed = 0
+        for key, entry in self._entries.items():
+            if self._bytes - freed <= self._max_bytes:
+                break
+            if key == protect:
+                continue
+            victims.append(key)
+            freed += entry.size
+        for key in victims:
+            self._remove(key)
+            self._counters["evictions"] += 1
+
+    def _compact_heap(self) -> None:
+        """lazy deletion으로 쌓인 stale 항목이 과도하면 heap 재구성"""
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (e.expires_at, next(self._seq), k) for k, e in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
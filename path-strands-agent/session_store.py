@@ -0,0 +1,198 @@
+"""PatternAnalyzerAgent 세션 스냅샷 저장소 (pluggable backend).
+
+컨테이너 내 in-process 캐시에서 세션을 찾지 못했을 때(컨테이너 재시작,
+다른 컨테이너로 라우팅 등) stateless replay 대신 스냅샷에서 stateful
+에이전트를 복원하기 위한 저장소.
+
+스냅샷 형식 (JSON 직렬화 가능한 dict):
+  {"version": 1, "messages": [...Strands agent.messages...],
+   "conversation_history": [{"role", "content"}, ...], "updated_at": epoch}
+
+Backend 선택 (환경변수):
+  PATTERN_SESSION_STORE  -> "sqlite" (기본) | "memory" | "none"
+  PATTERN_SESSION_DB     -> SQLite 파일 경로 (기본: /tmp/path-pattern-sessions.db)
+
+원격 KV(DynamoDB, ElastiCache 등)는 SessionStore를 구현해
+set_session_store()로 교체하면 된다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SESSION_TTL_SECONDS = 3600  # in-process 캐시와 동일 (1시간)
+_DEFAULT_DB_PATH = "/tmp/path-pattern-sessions.db"
+_PURGE_EVERY_N_SAVES = 50
+
+
+def serialize_snapshot(snapshot: dict) -> Optional[str]:
+    """스냅샷 JSON 직렬화. 직렬화 불가 블록(bytes 등) 포함 시 None."""
+    try:
+        return json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError) as e:
+        logger.warning(f"세션 스냅샷 직렬화 실패 (저장 생략): {e}")
+        return None
+
+
+class SessionStore(ABC):
+    """세션 스냅샷 저장소 인터페이스"""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[dict]:
+        """스냅샷 조회. 없거나 만료되었으면 None."""
+
+    @abstractmethod
+    def save(self, session_id: str, snapshot: dict) -> None:
+        """스냅샷 저장 (동일 session_id는 덮어씀)."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """스냅샷 삭제."""
+
+
+class NullSessionStore(SessionStore):
+    """저장하지 않는 backend (PATTERN_SESSION_STORE=none)"""
+
+    def load(self, session_id: str) -> Optional[dict]:
+        return None
+
+    def save(self, session_id: str, snapshot: dict) -> None:
+        return None
+
+    def delete(self, session_id: str) -> None:
+        return None
+
+
+class InMemorySessionStore(SessionStore):
+    """프로세스 메모리 backend — 직렬화된 문자열로 보관해 live 객체 공유를 피함"""
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[float, str]] = {}
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(session_id)
+            if entry is None:
+                return None
+            saved_at, payload = entry
+            if time.time() - saved_at > self._ttl:
+                del self._data[session_id]
+                return None
+        return json.loads(payload)
+
+    def save(self, session_id: str, snapshot: dict) -> None:
+        payload = serialize_snapshot(snapshot)
+        if payload is None:
+            return
+        with self._lock:
+            self._data[session_id] = (time.time(), payload)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """로컬 SQLite 파일 backend — 프로세스 재시작 후에도 세션 복원 가능"""
+
+    def __init__(self, path: str = _DEFAULT_DB_PATH, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self._path = path
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pattern_sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " snapshot TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT snapshot, updated_at FROM pattern_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        payload, updated_at = row
+        if time.time() - updated_at > self._ttl:
+            self.delete(session_id)
+            return None
+        try:
+            return json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("손상된 세션 스냅샷 삭제")
+            self.delete(session_id)
+            return None
+
+    def save(self, session_id: str, snapshot: dict) -> None:
+        payload = serialize_snapshot(snapshot)
+        if payload is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pattern_sessions (session_id, snapshot, updated_at)"
+                " VALUES (?, ?, ?)",
+                (session_id, payload, now),
+            )
+            self._saves += 1
+            if self._saves % _PURGE_EVERY_N_SAVES == 0:
+                self._conn.execute(
+                    "DELETE FROM pattern_sessions WHERE updated_at < ?", (now - self._ttl,)
+                )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM pattern_sessions WHERE session_id = ?", (session_id,)
+            )
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def _create_store_from_env() -> SessionStore:
+    backend = os.environ.get("PATTERN_SESSION_STORE", "sqlite").lower()
+    if backend == "none":
+        return NullSessionStore()
+    if backend == "memory":
+        return InMemorySessionStore()
+    path = os.environ.get("PATTERN_SESSION_DB", _DEFAULT_DB_PATH)
+    try:
+        return SQLiteSessionStore(path)
+    except sqlite3.Error as e:
+        logger.warning(f"SQLite 세션 저장소 초기화 실패, 메모리 backend 사용: {e}")
+        return InMemorySessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """프로세스 전역 세션 저장소 (최초 호출 시 환경변수 기반 생성)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store_from_env()
+    return _store
+
+
+def set_session_store(store: SessionStore) -> None:
+    """세션 저장소 교체 (원격 KV backend 주입용)"""
+    global _store
+    with _store_lock:
+        _store = store
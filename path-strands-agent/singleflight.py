@@ -0,0 +1,117 @@
+"""동일 요청 in-flight 병합 (single-flight).
+
+웹 relay 재시도나 더블클릭으로 같은 spec/feasibility payload가 다시 들어오면
+수 분·수 달러짜리 파이프라인을 다시 돌리는 대신 실행 중인 생성에 합류시킨다.
+
+- 키: action type + payload의 canonical JSON(sha256)
+- 최초 요청(leader)이 원본 이벤트 스트림을 별도 task에서 소비하며 버퍼에 기록
+- 이후 요청(follower)은 지금까지의 이벤트를 replay한 뒤 live 이벤트를 이어 받는다
+- 생성이 끝나면 키를 제거한다 (결과 캐시가 아니라 in-flight 병합만 수행)
+- 구독자가 모두 떠나면 원본 task를 취소한다 (풀 대여·admission 예약은 원본의 finally에서 해제)
+
+모든 연산은 이벤트 루프 스레드에서만 호출한다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(action: str, payload: dict) -> str:
+    """action + payload canonical JSON의 sha256 (키 순서·공백 차이 무시)"""
+    canonical = json.dumps(
+        {"type": action, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """실행 중인 생성 1건 — 이벤트 버퍼 + 구독자 수"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """키별 in-flight 생성 공유"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._counters = {"started": 0, "joined": 0, "cancelled": 0}
+
+    async def stream(
+        self, key: str, source: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """키에 해당하는 생성을 구독 — 없으면 source()로 시작"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(key)
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._pump(flight, source()))
+            self._counters["started"] += 1
+        else:
+            self._counters["joined"] += 1
+            logger.info(
+                f"[SINGLEFLIGHT] 실행 중인 요청에 합류 key={key[:12]} "
+                f"replay={len(flight.events)}"
+            )
+
+        flight.subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(
+                        lambda: index < len(flight.events) or flight.done
+                    )
+                if index < len(flight.events):
+                    # 버퍼에 쌓인 이벤트를 한 번에 내보냄 (replay + live 공통 경로)
+                    pending = flight.events[index:]
+                    index += len(pending)
+                    for event in pending:
+                        yield event
+                    continue
+                if flight.error is not None:
+                    raise flight.error
+                return
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done and flight.task is not None:
+                # 마지막 구독자 이탈 — 아무도 받지 않는 생성은 중단
+                self._counters["cancelled"] += 1
+                flight.task.cancel()
+                self._flights.pop(key, None)
+
+    async def _pump(self, flight: _Flight, events: AsyncIterator[Any]) -> None:
+        try:
+            async for event in events:
+                async with flight.changed:
+                    flight.events.append(event)
+                    flight.changed.notify_all()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            flight.done = True
+            async with flight.changed:
+                flight.changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, "in_flight": len(self._flights)}
@@ -122,6 +122,34 @@ def parse_agent_names(design_result: str) -> List[str]:
     return agent_names
 
 
+# 메타 코멘터리 라인 패턴 (한국어 + 영어)
+_META_LINE_PATTERNS = [re.compile(p, flags=re.IGNORECASE) for p in [
+    # 한국어 패턴
+    r'^네,?\s*(이미|먼저)?\s*스킬을?\s*(읽었으므로|로드했으므로).*$',
+    r'^이미\s+SKILL\.?md를?\s*(로드|읽).*$',
+    r'^(먼저|우선)?\s*스킬을?\s*(로드|읽).*$',
+    r'^(바로|이제)?\s*(분석|다이어그램|명세서|설계|도구).*?(진행|생성|작성|시작)하겠습니다.*$',
+    r'^(바로|이제)?\s*\d+가지\s*다이어그램을?\s*생성하겠습니다.*$',
+    r'^(알겠습니다|네,?\s*알겠습니다).*$',
+    r'^(그럼|그러면)\s*(바로|이제)?.*?(시작|진행).*$',
+    r'^.*스킬.*?(참조|읽|로드).*$',
+    r'^.*reference.*?(읽|참조|로드).*$',
+    # 영어 패턴
+    r"^I'?ll\s+(read|load|check|look|start|review|first).*$",
+    r"^Let\s+me\s+(read|load|check|look|start|review|first).*$",
+    r"^(First|Now),?\s+I'?ll\s+.*$",
+    r'^(OK|Okay|Sure|Alright),?\s*(let me|I\'ll).*$',
+    r'^I\s+(need to|will|should)\s+(read|load|check|review|look).*$',
+    r'^(Reading|Loading|Checking|Looking)\s+(the|at|through)?\s*(skill|reference|file).*$',
+]]
+
+
+def is_meta_line(line: str) -> bool:
+    """LLM 메타 코멘터리 라인 여부 (섹션 스트리밍에서도 라인 단위로 사용)"""
+    stripped = line.strip()
+    return any(pattern.match(stripped) for pattern in _META_LINE_PATTERNS)
+
+
 def clean_internal_comments(text: str) -> str:
     """내부 코멘트 제거 (Claude의 메타 발언 + tool call 잔재)
 
@@ -140,37 +168,7 @@ def clean_internal_comments(text: str) -> str:
         text = text[heading_match.start():]
 
     # 3단계: 라인 단위 메타 코멘터리 패턴 제거 (한국어 + 영어)
-    line_patterns = [
-        # 한국어 패턴
-        r'^네,?\s*(이미|먼저)?\s*스킬을?\s*(읽었으므로|로드했으므로).*$',
-        r'^이미\s+SKILL\.?md를?\s*(로드|읽).*$',
-        r'^(먼저|우선)?\s*스킬을?\s*(로드|읽).*$',
-        r'^(바로|이제)?\s*(분석|다이어그램|명세서|설계|도구).*?(진행|생성|작성|시작)하겠습니다.*$',
-        r'^(바로|이제)?\s*\d+가지\s*다이어그램을?\s*생성하겠습니다.*$',
-        r'^(알겠습니다|네,?\s*알겠습니다).*$',
-        r'^(그럼|그러면)\s*(바로|이제)?.*?(시작|진행).*$',
-        r'^.*스킬.*?(참조|읽|로드).*$',
-        r'^.*reference.*?(읽|참조|로드).*$',
-        # 영어 패턴
-        r"^I'?ll\s+(read|load|check|look|start|review|first).*$",
-        r"^Let\s+me\s+(read|load|check|look|start|review|first).*$",
-        r"^(First|Now),?\s+I'?ll\s+.*$",
-        r'^(OK|Okay|Sure|Alright),?\s*(let me|I\'ll).*$',
-        r'^I\s+(need to|will|should)\s+(read|load|check|review|look).*$',
-        r'^(Reading|Loading|Checking|Looking)\s+(the|at|through)?\s*(skill|reference|file).*$',
-    ]
-
-    lines = text.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        should_remove = False
-        stripped = line.strip()
-        for pattern in line_patterns:
-            if re.match(pattern, stripped, flags=re.IGNORECASE):
-                should_remove = True
-                break
-        if not should_remove:
-            cleaned_lines.append(line)
+    cleaned_lines = [line for line in text.split('\n') if not is_meta_line(line)]
 
     cleaned = '\n'.join(cleaned_lines)
     cleaned = re.sub(r'^---\s*\n+', '', cleaned)
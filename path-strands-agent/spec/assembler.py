@@ -3,10 +3,11 @@
 import asyncio
 from typing import Dict, Any, AsyncIterator, Optional
 
+import events
 from spec._helpers import clean_internal_comments
 
 
-def _render_data_integrations_md(bundle: Optional[Dict[str, Any]]) -> str:
+def render_data_integrations_md(bundle: Optional[Dict[str, Any]]) -> str:
     """DataIntegrationsBundle dict를 '데이터 통합 설계' markdown 섹션으로 렌더.
 
     bundle이 None/비어있으면 빈 문자열 반환.
@@ -52,7 +53,7 @@ class AssemblerAgent:
         prompt_result: str,
         tool_result: str,
         data_integrations: Optional[Dict[str, Any]] = None,
-    ) -> AsyncIterator[dict]:
+    ) -> AsyncIterator[events.Event]:
         """최종 조합 - LLM 없이 단순 문자열 조합 후 스트리밍"""
 
         # 내부 코멘트 제거
@@ -112,7 +113,7 @@ class AssemblerAgent:
 
 {tool_result}
 
-{_render_data_integrations_md(data_integrations)}
+{render_data_integrations_md(data_integrations)}
 
 ## 6. Problem Decomposition
 
@@ -153,5 +154,5 @@ class AssemblerAgent:
             chunk = spec[i:i+chunk_size]
             chunk_index = i // chunk_size
             progress = 70 + int((chunk_index / total_chunks) * 25)
-            yield {'text': chunk, 'progress': min(progress, 95)}
+            yield events.Text(chunk, progress=min(progress, 95))
             await asyncio.sleep(0.01)
@@ -0,0 +1,323 @@
+"""명세서 실행(run) checkpoint 저장소 (pluggable backend).
+
+명세서 생성은 수 분이 걸리므로 SSE 연결이 끊기거나 컨테이너가 재활용되면 처음부터
+다시 생성해야 했다. run id마다 완료된 stage 결과와 전송한 이벤트(event_id 순번)를
+저장해 두고, 재연결 시 놓친 이벤트를 replay한 뒤 마지막으로 완료된 stage 다음부터
+이어서 실행한다 (spec/spec_run.py).
+
+run 상태:
+  running -> 실행 중이거나 중단됨 (재연결 시 이어서 실행)
+  failed  -> 오류 이벤트로 종료 (재연결 시 완료된 stage부터 재시도)
+  done    -> 정상 완료 (재연결 시 replay만)
+
+Backend 선택 (환경변수):
+  SPEC_CHECKPOINT_STORE     -> "sqlite" (기본) | "memory" | "none"
+  SPEC_CHECKPOINT_DB        -> SQLite 파일 경로 (기본: /tmp/path-spec-checkpoints.db)
+  SPEC_CHECKPOINT_TTL_HOURS -> run 보존 기간 (기본 24시간)
+
+원격 저장소(DynamoDB, S3 등)는 CheckpointStore를 구현해 set_checkpoint_store()로
+교체하면 된다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_FAILED = "failed"
+STATUS_DONE = "done"
+
+_DEFAULT_DB_PATH = "/tmp/path-spec-checkpoints.db"
+_DEFAULT_TTL_HOURS = 24
+_PURGE_EVERY_N_RUNS = 20
+
+# (event_id, wire dict)
+SequencedEvent = Tuple[int, Dict[str, Any]]
+
+
+class CheckpointStore(ABC):
+    """run checkpoint 저장소 인터페이스 — stage 스레드/이벤트 루프 양쪽에서 호출 (thread-safe)"""
+
+    @abstractmethod
+    def create_run(self, run_id: str) -> None:
+        """새 run 등록 (status=running)."""
+
+    @abstractmethod
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """{"status", "last_event_id", "updated_at"}. 없거나 만료되었으면 None."""
+
+    @abstractmethod
+    def set_status(self, run_id: str, status: str) -> None:
+        """run 상태 갱신."""
+
+    @abstractmethod
+    def append_events(self, run_id: str, events: List[SequencedEvent]) -> None:
+        """전송한 이벤트 기록 (event_id 오름차순)."""
+
+    @abstractmethod
+    def events_after(self, run_id: str, last_event_id: int) -> List[SequencedEvent]:
+        """last_event_id 이후 이벤트 (event_id 오름차순)."""
+
+    @abstractmethod
+    def save_stage(self, run_id: str, name: str, value: Any) -> None:
+        """완료된 stage(또는 중간 결과) 저장."""
+
+    @abstractmethod
+    def load_stages(self, run_id: str) -> Dict[str, Any]:
+        """완료된 stage 결과 {이름: 결과}."""
+
+
+class NullCheckpointStore(CheckpointStore):
+    """저장하지 않는 backend (SPEC_CHECKPOINT_STORE=none) — 재연결 시 run을 찾지 못함"""
+
+    def create_run(self, run_id: str) -> None:
+        return None
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set_status(self, run_id: str, status: str) -> None:
+        return None
+
+    def append_events(self, run_id: str, events: List[SequencedEvent]) -> None:
+        return None
+
+    def events_after(self, run_id: str, last_event_id: int) -> List[SequencedEvent]:
+        return []
+
+    def save_stage(self, run_id: str, name: str, value: Any) -> None:
+        return None
+
+    def load_stages(self, run_id: str) -> Dict[str, Any]:
+        return {}
+
+
+class _Run:
+    __slots__ = ("status", "updated_at", "events", "stages")
+
+    def __init__(self):
+        self.status = STATUS_RUNNING
+        self.updated_at = time.time()
+        self.events: List[Tuple[int, str]] = []
+        self.stages: Dict[str, str] = {}
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """프로세스 메모리 backend — 직렬화된 문자열로 보관해 live 객체 공유를 피함"""
+
+    def __init__(self, ttl_seconds: float = _DEFAULT_TTL_HOURS * 3600):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._runs: Dict[str, _Run] = {}
+
+    def create_run(self, run_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            for key in [k for k, run in self._runs.items() if now - run.updated_at > self._ttl]:
+                del self._runs[key]
+            self._runs[run_id] = _Run()
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self._live(run_id)
+            if run is None:
+                return None
+            return {
+                "status": run.status,
+                "last_event_id": run.events[-1][0] if run.events else 0,
+                "updated_at": run.updated_at,
+            }
+
+    def set_status(self, run_id: str, status: str) -> None:
+        with self._lock:
+            run = self._live(run_id)
+            if run is not None:
+                run.status = status
+                run.updated_at = time.time()
+
+    def append_events(self, run_id: str, events: List[SequencedEvent]) -> None:
+        payloads = [(event_id, json.dumps(event, ensure_ascii=False)) for event_id, event in events]
+        with self._lock:
+            run = self._live(run_id)
+            if run is not None:
+                run.events.extend(payloads)
+                run.updated_at = time.time()
+
+    def events_after(self, run_id: str, last_event_id: int) -> List[SequencedEvent]:
+        with self._lock:
+            run = self._live(run_id)
+            payloads = [] if run is None else [e for e in run.events if e[0] > last_event_id]
+        return [(event_id, json.loads(payload)) for event_id, payload in payloads]
+
+    def save_stage(self, run_id: str, name: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            run = self._live(run_id)
+            if run is not None:
+                run.stages[name] = payload
+                run.updated_at = time.time()
+
+    def load_stages(self, run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            run = self._live(run_id)
+            stages = {} if run is None else dict(run.stages)
+        return {name: json.loads(payload) for name, payload in stages.items()}
+
+    def _live(self, run_id: str) -> Optional[_Run]:
+        """lock 보유 상태에서 호출 — 만료된 run은 제거"""
+        run = self._runs.get(run_id)
+        if run is not None and time.time() - run.updated_at > self._ttl:
+            del self._runs[run_id]
+            return None
+        return run
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """로컬 SQLite 파일 backend — 컨테이너 프로세스 재시작 후에도 이어서 실행 가능"""
+
+    def __init__(self, path: str = _DEFAULT_DB_PATH, ttl_seconds: float = _DEFAULT_TTL_HOURS * 3600):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._created = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS spec_runs ("
+            " run_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS spec_run_events ("
+            " run_id TEXT NOT NULL,"
+            " event_id INTEGER NOT NULL,"
+            " event TEXT NOT NULL,"
+            " PRIMARY KEY (run_id, event_id));"
+            "CREATE TABLE IF NOT EXISTS spec_run_stages ("
+            " run_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (run_id, name));"
+        )
+
+    def create_run(self, run_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO spec_runs (run_id, status, updated_at) VALUES (?, ?, ?)",
+                (run_id, STATUS_RUNNING, now),
+            )
+            self._created += 1
+            if self._created % _PURGE_EVERY_N_RUNS == 0:
+                self._purge(now - self._ttl)
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, updated_at FROM spec_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self._ttl:
+                return None
+            last = self._conn.execute(
+                "SELECT MAX(event_id) FROM spec_run_events WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+        return {"status": row[0], "last_event_id": last or 0, "updated_at": row[1]}
+
+    def set_status(self, run_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE spec_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, time.time(), run_id),
+            )
+
+    def append_events(self, run_id: str, events: List[SequencedEvent]) -> None:
+        if not events:
+            return
+        rows = [(run_id, event_id, json.dumps(event, ensure_ascii=False)) for event_id, event in events]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO spec_run_events (run_id, event_id, event) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute(
+                    "UPDATE spec_runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id)
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def events_after(self, run_id: str, last_event_id: int) -> List[SequencedEvent]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_id, event FROM spec_run_events"
+                " WHERE run_id = ? AND event_id > ? ORDER BY event_id",
+                (run_id, last_event_id),
+            ).fetchall()
+        return [(event_id, json.loads(payload)) for event_id, payload in rows]
+
+    def save_stage(self, run_id: str, name: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO spec_run_stages (run_id, name, value) VALUES (?, ?, ?)",
+                (run_id, name, payload),
+            )
+
+    def load_stages(self, run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, value FROM spec_run_stages WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return {name: json.loads(payload) for name, payload in rows}
+
+    def _purge(self, cutoff: float) -> None:
+        """lock 보유 상태에서 호출 — 보존 기간이 지난 run 삭제"""
+        expired = "SELECT run_id FROM spec_runs WHERE updated_at < ?"
+        self._conn.execute(f"DELETE FROM spec_run_events WHERE run_id IN ({expired})", (cutoff,))
+        self._conn.execute(f"DELETE FROM spec_run_stages WHERE run_id IN ({expired})", (cutoff,))
+        self._conn.execute("DELETE FROM spec_runs WHERE updated_at < ?", (cutoff,))
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def _create_store_from_env() -> CheckpointStore:
+    backend = os.environ.get("SPEC_CHECKPOINT_STORE", "sqlite").lower()
+    if backend == "none":
+        return NullCheckpointStore()
+    ttl = float(os.environ.get("SPEC_CHECKPOINT_TTL_HOURS", _DEFAULT_TTL_HOURS)) * 3600
+    if backend == "memory":
+        return InMemoryCheckpointStore(ttl)
+    path = os.environ.get("SPEC_CHECKPOINT_DB", _DEFAULT_DB_PATH)
+    try:
+        return SQLiteCheckpointStore(path, ttl)
+    except sqlite3.Error as e:
+        logger.warning(f"SQLite checkpoint 저장소 초기화 실패, 메모리 backend 사용: {e}")
+        return InMemoryCheckpointStore(ttl)
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """프로세스 전역 checkpoint 저장소 (최초 호출 시 환경변수 기반 생성)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store_from_env()
+    return _store
+
+
+def set_checkpoint_store(store: CheckpointStore) -> None:
+    """checkpoint 저장소 교체 (원격 backend 주입용)"""
+    global _store
+    with _store_lock:
+        _store = store
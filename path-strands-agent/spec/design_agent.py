@@ -3,7 +3,8 @@
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Callable, Dict, List, Optional
 
 from strands import AgentSkills
 from agent_config import get_profile
@@ -13,6 +14,47 @@ from spec._helpers import extract_final_text
 
 logger = logging.getLogger(__name__)
 
+# 설계 핵심(2.1 Pattern Selection + 2.2 Agent Components) 종료 = 2.3 헤딩 등장
+_CORE_END_RE = re.compile(r'^#{2,4}\s+2\.3\s', re.MULTILINE)
+_DESIGN_START_RE = re.compile(r'^##\s+2\.\s', re.MULTILINE)
+_AGENT_COMPONENTS_RE = re.compile(r'^#{2,4}\s+2\.2\s', re.MULTILINE)
+
+
+class _CoreSnapshotWatcher:
+    """callback_handler 체인 — 스트리밍 출력에서 2.3 헤딩이 나타나면 2.1/2.2 스냅샷을 1회 전달.
+
+    기존 handler(OutputMeter 등)는 그대로 호출한다. tool 사용 전 메타 코멘트가 섞일 수
+    있으므로 마지막 "## 2." 헤딩부터 자르고, 2.2 Agent Components가 없으면 전달하지 않는다
+    (downstream은 최종 결과를 받는다).
+    """
+
+    def __init__(self, inner: Optional[Callable[..., Any]], on_core: Callable[[str], None]):
+        self._inner = inner
+        self._on_core = on_core
+        self._text = ""
+        self._scanned = 0
+        self.fired = False
+
+    def __call__(self, **kwargs):
+        if self._inner is not None:
+            self._inner(**kwargs)
+        data = kwargs.get("data")
+        if self.fired or not isinstance(data, str) or not data:
+            return
+        self._text += data
+        # 헤딩이 chunk 경계에 걸칠 수 있으므로 직전 줄부터 다시 검사
+        match = _CORE_END_RE.search(self._text, self._text.rfind("\n", 0, self._scanned) + 1)
+        self._scanned = len(self._text)
+        if match is None:
+            return
+        head = self._text[:match.start()]
+        starts = list(_DESIGN_START_RE.finditer(head))
+        core = head[starts[-1].start():] if starts else head
+        if not _AGENT_COMPONENTS_RE.search(core):
+            return
+        self.fired = True
+        self._on_core(core.strip())
+
 
 class DesignAgent:
     """1단계: Agent 설계 (프레임워크 독립적)"""
@@ -79,9 +121,14 @@ class DesignAgent:
         analysis: Dict[str, Any],
         improvement_plans: Optional[Dict[str, str]] = None,
         chat_history: Optional[List[Dict[str, str]]] = None,
-        additional_context: Optional[Dict[str, str]] = None
+        additional_context: Optional[Dict[str, str]] = None,
+        on_core: Optional[Callable[[str], None]] = None,
     ) -> str:
-        """Agent 설계"""
+        """Agent 설계
+
+        on_core를 지정하면 2.2 Agent Components까지 생성된 시점에 해당 스냅샷으로
+        (생성 스레드에서) 1회 호출한다. 반환값은 2.3/2.4를 포함한 전체 설계.
+        """
 
         # 대화 히스토리 요약 (사용자 메시지만 추출)
         chat_section = ""
@@ -259,6 +306,14 @@ file_read로 "./skills/agent-patterns/references/pipeline-patterns.md"를 참조
 - 오케스트레이터 자체 장애 (파이프라인 중단, 체크포인트 복구 등)
 - 각 시나리오별 재시도 횟수, 백오프 전략, 안전 우선 원칙을 명시하세요
 """
-        result = self.agent(prompt)
+        if on_core is None:
+            result = self.agent(prompt)
+        else:
+            inner = self.agent.callback_handler
+            self.agent.callback_handler = _CoreSnapshotWatcher(inner, on_core)
+            try:
+                result = self.agent(prompt)
+            finally:
+                self.agent.callback_handler = inner
         self._last_usage = extract_usage(result)
         return extract_final_text(result)
@@ -1,25 +1,202 @@
-"""2단계: 다이어그램 생성 (프레임워크 독립적)"""
+"""2단계: 다이어그램 생성 (프레임워크 독립적) — 다이어그램별 병렬 생성 + 개별 검증/재시도
+
+3개 다이어그램(3.1 workflow / 3.2 sequence / 3.3 architecture)을 각각 별도 호출로 동시에
+생성하고 개별 검증한다. 검증에 실패한 다이어그램만 다시 생성하고, 결과는
+`## 3. Visual Design` 헤딩 아래 순서대로 조합한다. 병렬 생성이 실패하면 기존 단일 호출로 fallback.
+
+검증 실패 블록은 먼저 MermaidValidator.auto_repair로 규칙 기반 수정(따옴표 누락,
+activate/deactivate 불일치)하고, 그래도 남은 블록만 LLM으로 재시도한다.
+재시도는 생성 대화를 이어가지 않는 stateless 수정 호출이다. 스킬 없는 짧은 시스템 프롬프트의
+새 인스턴스에 실패한 mermaid 블록과 해당 검증 오류만 보내고, 수정된 블록을 원래 위치에
+교체한다 (설계 컨텍스트·첫 출력 전체를 다시 보내지 않음). 재시도 토큰은 `_last_retry_usage`로
+따로 집계한다 (`_last_usage`에도 포함).
+
+검증은 생성이 끝나기를 기다리지 않는다. callback_handler 체인(_MermaidFenceWatcher)이 스트리밍
+출력에서 ```mermaid 블록의 닫는 fence를 보는 즉시 블록을 검증하고, 실패하면 수정(규칙 기반 →
+LLM)을 백그라운드 스레드에서 바로 시작한다(_EarlyRepairs). 모델이 뒤쪽 다이어그램·설명을 쓰는
+동안 수정이 함께 진행되고, 생성이 끝나면 완료된 수정 결과를 해당 위치에 교체한다.
+"""
 
+import contextvars
 import logging
-from typing import Dict, Any
-
-from agent_config import get_profile
-from strands_utils import create_spec_agent, load_skill_content
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import reduce
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional, Tuple
+
+import cancellation
+from agent_config import DIAGRAM_PARALLEL_CALLS, get_profile
+from strands_utils import create_spec_agent, preload_skill_content
 from token_tracker import extract_usage, merge_usage
-from spec._helpers import extract_final_text, build_analysis_context
+from spec._helpers import extract_final_text, build_analysis_context, clean_internal_comments, is_meta_line
 from spec.mermaid_validator import MermaidValidator
+from spec.section_stream import progress_handler
 
 logger = logging.getLogger(__name__)
 
 
+class _DiagramSpec(NamedTuple):
+    number: str      # "3.1"
+    title: str       # 헤딩 제목
+    header: str      # mermaid 첫 줄 (다이어그램 타입 선언)
+    guide: str       # 블록 내용 안내
+
+
+_DIAGRAMS: Tuple[_DiagramSpec, ...] = (
+    _DiagramSpec("3.1", "Agent Workflow", "flowchart TD", "Agent 간 워크플로우 - 추상적 개념만"),
+    _DiagramSpec("3.2", "Sequence Diagram", "sequenceDiagram", "User, Agent, Tool 간 상호작용"),
+    _DiagramSpec("3.3", "Architecture Overview", "flowchart TB", "시스템 아키텍처 - 추상적 컴포넌트만"),
+)
+
+_VISUAL_DESIGN_HEADING = "## 3. Visual Design"
+_SECTION_HEADING_RE = re.compile(r'^##\s+3\.\s.*$\n?', re.MULTILINE)
+_DIAGRAM_HEADING_RE = re.compile(r'^###\s+', re.MULTILINE)
+_MERMAID_BLOCK_RE = re.compile(r'```mermaid\s*\n(.*?)```', re.DOTALL)
+
+
+def _block_key(source: str) -> str:
+    """블록 비교용 키 — clean_internal_comments가 지우거나 바꿀 수 있는 부분(메타 코멘트 줄,
+    빈 줄, 줄 끝 공백)을 뺀 소스. 스트림의 원본 블록과 정리된 출력의 블록을 같은 블록으로 맞춘다."""
+    return "\n".join(
+        line.rstrip() for line in source.split("\n") if line.strip() and not is_meta_line(line)
+    )
+
+_REPAIR_SYSTEM = """당신은 Mermaid 다이어그램 문법 수정 도구입니다.
+주어진 Mermaid 블록에서 지적된 문법 오류만 고치고, 노드·엣지·라벨의 의미와 구조는 그대로 유지합니다.
+수정한 블록만 ```mermaid 코드 블록으로 출력하며 설명이나 메타 코멘트는 쓰지 않습니다."""
+
+_DIAGRAM_OUTPUT_RULES = """**중요 - 출력 규칙**:
+- 내부 사고 과정이나 메타 코멘트를 출력에 포함하지 마세요
+- "스킬을 읽었으므로", "다이어그램을 생성하겠습니다" 같은 문구 금지
+- 바로 다이어그램만 출력하세요
+- **특정 프레임워크 컴포넌트(AgentCore Runtime, Gateway, GraphBuilder 등) 금지**
+- **Agent, Tool, User, External Service 등 추상 개념만 사용**"""
+
+_DIAGRAM_ESCAPE_RULES = """**특수 문자 이스케이프 (필수)**:
+- 노드 텍스트에 `>=`, `>`, `<`, `?`, `&`, `"` 등 특수 문자가 있으면 **반드시 따옴표로 감싸세요**
+- **화살표 라벨(`-->|...|`)에도 동일 규칙 적용**: `<`, `>`, `"` 를 라벨 안에 직접 쓰면 파싱 오류 발생
+  - 잘못된 예: `A -->|retry < 2| B`
+  - 올바른 예: `A -->|"retry < 2"| B`
+- 잘못된 예: `{Score >= 70?}`
+- 올바른 예: `{"Score >= 70?"}`
+
+**중요: 다이어그램에 HTML 태그 금지.**"""
+
+
+class _MermaidFenceWatcher:
+    """callback_handler 체인 — 스트리밍 출력에서 ```mermaid 블록이 닫히면 블록 소스를 1회씩 전달.
+
+    기존 handler(OutputMeter, SectionStreamer 등)는 그대로 호출한다.
+    """
+
+    def __init__(self, inner: Optional[Callable[..., Any]], on_block: Callable[[str], None]):
+        self._inner = inner
+        self._on_block = on_block
+        self._text = ""
+        self._scanned = 0  # 마지막으로 닫힌 블록의 끝 — 그 뒤부터 다시 검사
+
+    def __call__(self, **kwargs):
+        if self._inner is not None:
+            self._inner(**kwargs)
+        data = kwargs.get("data")
+        if not isinstance(data, str) or not data:
+            return
+        self._text += data
+        if "`" not in data:
+            return  # 닫는 fence가 도착하지 않음
+        for match in _MERMAID_BLOCK_RE.finditer(self._text, self._scanned):
+            self._scanned = match.end()
+            self._on_block(match.group(1))
+
+
+class _EarlyRepairs:
+    """생성 스트림과 겹쳐 실행하는 블록 수정 (생성 호출 1회당 1개).
+
+    검증에 실패한 블록의 수정은 요청 CancelToken의 하위 토큰으로 실행하므로, 요청이
+    취소되거나 생성이 실패해 cancel()하면 진행 중인 수정 호출도 중단된다.
+    """
+
+    def __init__(self, validator: MermaidValidator, repair: Callable[[str], Tuple[str, Dict[str, Any]]]):
+        self._validator = validator
+        self._repair = repair
+        parent = cancellation.current_token()
+        self._token = (
+            parent.child("diagram-repair") if parent is not None
+            else cancellation.CancelToken("diagram-repair")
+        )
+        self._executor = ThreadPoolExecutor(max_workers=len(_DIAGRAMS), thread_name_prefix="diagram-repair")
+        self._futures: Dict[str, Future] = {}
+
+    def watch(self, inner: Optional[Callable[..., Any]]) -> _MermaidFenceWatcher:
+        return _MermaidFenceWatcher(inner, self._on_block)
+
+    def _on_block(self, source: str) -> None:
+        """모델 스트림 스레드에서 호출 — 검증만 하고 수정은 워커로 넘긴다"""
+        key = _block_key(source)
+        if key in self._futures or not self._validator.validate_block(source):
+            return
+        self._futures[key] = self._executor.submit(contextvars.copy_context().run, self._run, source)
+
+    def _run(self, source: str) -> Tuple[str, Dict[str, Any]]:
+        with cancellation.bound(self._token):
+            return self._repair(source)
+
+    def _result(self, future: Future) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """수정 결과 1개 — 수정 호출이 실패하면 None (해당 블록만 원본 유지, 요청 취소는 전파)"""
+        try:
+            return future.result()
+        except cancellation.Cancelled:
+            raise
+        except Exception as e:
+            logger.warning(f"Mermaid 조기 수정 실패 — 블록 원본 유지: {type(e).__name__}: {e}")
+            return None
+
+    def apply(self, output: str) -> Tuple[str, Dict[str, Any], List[str]]:
+        """완료된 수정 결과를 출력의 같은 블록 위치에 교체 (진행 중인 수정은 기다린다).
+
+        출력은 _clean_diagram_output으로 정리된 텍스트이므로 블록은 _block_key로 맞춘다.
+        수정 호출이 실패한 블록은 규칙 기반 수정 결과(없으면 원본)를 유지하고, 다시 보내지 않는다.
+
+        Returns:
+            (교체된 출력, 수정 usage 합계, 이미 수정을 시도한 블록의 _block_key 목록)
+        """
+        try:
+            results = {key: self._result(future) for key, future in self._futures.items()}
+        finally:
+            self._executor.shutdown(wait=False)
+        attempted = []
+        for match in reversed(list(_MERMAID_BLOCK_RE.finditer(output))):
+            key = _block_key(match.group(1))
+            if key not in results:
+                continue
+            hit = results[key]
+            fixed = hit[0] if hit is not None else self._auto_repaired(match.group(1))
+            output = output[:match.start(1)] + fixed + output[match.end(1):]
+            attempted.append(_block_key(fixed))
+        usage = reduce(merge_usage, (hit[1] for hit in results.values() if hit is not None), {})
+        return output, usage, attempted
+
+    def _auto_repaired(self, source: str) -> str:
+        """규칙 기반 수정만 적용한 블록 소스 (고칠 것이 없으면 원본)"""
+        repaired, _ = self._validator.auto_repair(f"```mermaid\n{source}```")
+        match = _MERMAID_BLOCK_RE.search(repaired)
+        return match.group(1) if match else source
+
+    def cancel(self) -> None:
+        """생성 실패 — 대기·진행 중인 수정 중단"""
+        self._token.cancel(record=False)
+        skipped = sum(1 for future in self._futures.values() if future.cancel())
+        if skipped:
+            cancellation.cancellation_stats.record_skipped(skipped)
+        self._executor.shutdown(wait=False)
+
+
 class DiagramAgent:
-    """2단계: 다이어그램 생성 (프레임워크 독립적)"""
+    """2단계: 다이어그램 생성 (프레임워크 독립적) — 다이어그램별 병렬 생성(Scatter-Gather)"""
 
     def __init__(self):
         # 스킬 + reference 사전 주입 → tool call 완전 제거
-        skill_content = load_skill_content(
-            "mermaid-diagrams", ["pattern-examples.md", "templates.md"]
-        )
+        skill_content = preload_skill_content("diagram")
 
         system_prompt = f"""당신은 AI Agent 아키텍처 시각화 전문가입니다.
 
@@ -47,6 +224,9 @@ class DiagramAgent:
 ## 참조 스킬 및 레퍼런스 (사전 로드됨 — 도구 호출 불필요)
 {skill_content}"""
 
+        self._system_prompt = system_prompt
+
+        # fallback용 단일 호출 에이전트 (병렬 생성 실패 시) — 진행률 callback_handler 부착 대상
         cfg = get_profile("diagram")
         self.agent = create_spec_agent(
             system_prompt,
@@ -71,12 +251,7 @@ class DiagramAgent:
 **필수**: 시스템 프롬프트에 사전 로드된 스킬과 reference의 템플릿, 베스트 프랙티스만을 사용하세요.
 **필수**: Sequence Diagram에서 activate/deactivate 쌍을 반드시 확인하세요.
 
-**중요 - 출력 규칙**:
-- 내부 사고 과정이나 메타 코멘트를 출력에 포함하지 마세요
-- "스킬을 읽었으므로", "다이어그램을 생성하겠습니다" 같은 문구 금지
-- 바로 다이어그램만 출력하세요
-- **특정 프레임워크 컴포넌트(AgentCore Runtime, Gateway, GraphBuilder 등) 금지**
-- **Agent, Tool, User, External Service 등 추상 개념만 사용**
+{_DIAGRAM_OUTPUT_RULES}
 
 **출력 형식:**
 
@@ -100,52 +275,235 @@ flowchart TB
     [시스템 아키텍처 - 추상적 컴포넌트만]
 ```
 
-**특수 문자 이스케이프 (필수)**:
-- 노드 텍스트에 `>=`, `>`, `<`, `?`, `&`, `"` 등 특수 문자가 있으면 **반드시 따옴표로 감싸세요**
-- **화살표 라벨(`-->|...|`)에도 동일 규칙 적용**: `<`, `>`, `"` 를 라벨 안에 직접 쓰면 파싱 오류 발생
-  - 잘못된 예: `A -->|retry < 2| B`
-  - 올바른 예: `A -->|"retry < 2"| B`
-- 잘못된 예: `{{Score >= 70?}}`
-- 올바른 예: `{{"Score >= 70?"}}`
-
-**중요: 다이어그램에 HTML 태그 금지.**
+{_DIAGRAM_ESCAPE_RULES}
 """
 
-    def generate_diagrams(self, design_result: str, analysis: Dict[str, Any]) -> str:
-        """다이어그램 생성 (검증 + 재시도 1회)"""
+    def _build_single_diagram_prompt(self, spec: _DiagramSpec, design_result: str, context_section: str) -> str:
+        """다이어그램 1개 전용 프롬프트 구성"""
+        return f"""다음 Agent 설계를 기반으로 **{spec.number} {spec.title}** Mermaid 다이어그램 1개만 생성하세요:
 
-        prompt = self._build_prompt(design_result, analysis)
+{design_result}
 
-        # 1차 생성
-        result = self.agent(prompt)
-        output = extract_final_text(result)
-        self._last_usage = extract_usage(result)
+{context_section}
 
-        # 검증
-        is_valid, errors = self.validator.validate(output)
-        if is_valid:
-            return output
+**필수**: 시스템 프롬프트에 사전 로드된 스킬과 reference의 템플릿, 베스트 프랙티스만을 사용하세요.
+**필수**: Sequence Diagram에서 activate/deactivate 쌍을 반드시 확인하세요.
 
-        # 검증 실패 시 재시도 1회
-        logger.warning(f"Mermaid 검증 실패 ({len(errors)}건), 재생성 시도: {errors}")
-        error_feedback = "\n".join(f"- {e}" for e in errors)
-        retry_prompt = f"""이전 출력에서 다음 Mermaid 문법 오류가 발견되었습니다:
+{_DIAGRAM_OUTPUT_RULES}
+- 다른 다이어그램이나 `## 3.` 상위 헤딩은 작성하지 마세요 (다른 호출에서 생성)
 
-{error_feedback}
+**출력 형식:**
 
-위 오류를 수정하여 다이어그램을 다시 생성하세요.
-기존 출력:
+### {spec.number} {spec.title}
+```mermaid
+{spec.header}
+    [{spec.guide}]
+```
 
-{output}
+{_DIAGRAM_ESCAPE_RULES}
+"""
 
-수정된 전체 출력만 작성하세요. 설명이나 메타 코멘트 없이 바로 수정 결과만 출력하세요.
+    def _create_per_diagram_instance(self):
+        """병렬 호출용 Agent 인스턴스 생성"""
+        cfg = get_profile("diagram")
+        agent = create_spec_agent(
+            self._system_prompt,
+            model_id=cfg["model_id"],
+            max_tokens=cfg["max_tokens"],
+            temperature=cfg.get("temperature"),
+            tools=[],
+        )
+        # 진행률 측정용 OutputMeter만 공유 — 섹션 스트리밍 중이면 SectionStreamer는 벗긴다
+        # (다이어그램별 출력은 `###`로 시작하고 스레드별 delta가 섞이므로, 섹션은 조합 후 최종 섹션으로 전송)
+        agent.callback_handler = progress_handler(self.agent.callback_handler)
+        return agent
+
+    def _generate_single_diagram(self, spec: _DiagramSpec, design_result: str,
+                                 context_section: str) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """다이어그램 1개 생성 + 검증, 실패 시 해당 다이어그램만 수정 호출 1회 (스레드에서 실행)
+
+        Returns:
+            (다이어그램 마크다운, 전체 usage, 그중 재시도 usage)
+        """
+        cancellation.check()  # 대기 중 요청이 취소됐으면 인스턴스 생성·호출 생략
+        agent = self._create_per_diagram_instance()
+        result, early = self._call_with_early_repair(
+            agent, self._build_single_diagram_prompt(spec, design_result, context_section), spec.number
+        )
+        output = self._clean_diagram_output(extract_final_text(result))
+        usage = extract_usage(result)
+        output, retry_usage = self._finish_repair(output, early, spec.number)
+        return output, merge_usage(usage, retry_usage), retry_usage
+
+    def _call_with_early_repair(self, agent, prompt: str, label: str = "") -> Tuple[Any, _EarlyRepairs]:
+        """생성 호출 — 블록이 닫히는 대로 검증하고 실패 블록 수정을 생성과 겹쳐 시작"""
+        early = _EarlyRepairs(self.validator, lambda source: self._repair_source(source, label))
+        inner = agent.callback_handler
+        agent.callback_handler = early.watch(inner)
+        try:
+            return agent(prompt), early
+        except BaseException:
+            early.cancel()
+            raise
+        finally:
+            agent.callback_handler = inner
+
+    def _finish_repair(self, output: str, early: _EarlyRepairs, label: str = "") -> Tuple[str, Dict[str, Any]]:
+        """스트리밍 중 시작한 수정 결과 반영 + 스트림에서 놓친 실패 블록만 추가 수정"""
+        output, early_usage, attempted = early.apply(output)
+        late_usage: Dict[str, Any] = {}
+        if any(
+            _block_key(m.group(1)) not in attempted and self.validator.validate_block(m.group(1))
+            for m in _MERMAID_BLOCK_RE.finditer(output)
+        ):
+            output, late_usage = self._repair(output, label, attempted=attempted)
+        return output, merge_usage(early_usage, late_usage) if early_usage or late_usage else {}
+
+    def _repair_source(self, source: str, label: str = "") -> Tuple[str, Dict[str, Any]]:
+        """블록 1개(코드 펜스 제외) 수정 — 수정된 블록 소스와 재시도 usage"""
+        output, usage = self._repair(f"```mermaid\n{source}```", label)
+        match = _MERMAID_BLOCK_RE.search(output)
+        return (match.group(1) if match else source), usage
+
+    def _create_repair_instance(self):
+        """수정 호출용 Agent 인스턴스 — 스킬 없는 짧은 시스템 프롬프트, 호출마다 새 대화"""
+        cfg = get_profile("diagram_repair")
+        return create_spec_agent(
+            _REPAIR_SYSTEM,
+            model_id=cfg["model_id"],
+            max_tokens=cfg["max_tokens"],
+            temperature=cfg.get("temperature"),
+            tools=[],
+        )  # callback_handler는 공유하지 않음 — 스트리밍 섹션에 수정 블록이 섞이지 않도록
+
+    @staticmethod
+    def _build_repair_prompt(failing: List[Tuple[str, List[str]]]) -> str:
+        """실패한 블록 + 검증 오류만 담은 수정 프롬프트"""
+        blocks = []
+        for i, (source, errors) in enumerate(failing, 1):
+            error_feedback = "\n".join(f"- {e}" for e in errors)
+            blocks.append(f"### 블록 {i}\n오류:\n{error_feedback}\n```mermaid\n{source.rstrip()}\n```")
+        joined = "\n\n".join(blocks)
+        return f"""다음 Mermaid 블록 {len(failing)}개의 문법 오류를 수정하세요.
+
+{joined}
+
+{_DIAGRAM_ESCAPE_RULES}
+
+수정한 블록 {len(failing)}개를 같은 순서로 ```mermaid 코드 블록으로만 출력하세요 (헤딩·설명 없이).
 """
-        retry_result = self.agent(retry_prompt)
-        retry_output = extract_final_text(retry_result)
-        self._last_usage = merge_usage(self._last_usage, extract_usage(retry_result))
 
-        # 재시도 결과 검증 (실패해도 반환 — 최선의 결과 사용)
-        is_valid_retry, retry_errors = self.validator.validate(retry_output)
+    def _repair(self, output: str, label: str = "",
+                attempted: Collection[str] = ()) -> Tuple[str, Dict[str, Any]]:
+        """검증 실패 블록을 규칙 기반으로 먼저 고치고, 남은 블록만 stateless 수정 호출 1회로
+        고쳐 원래 위치에 교체. attempted(_block_key)의 블록(스트리밍 중 이미 수정을 시도)은 다시 보내지 않는다.
+
+        Returns:
+            (수정된 출력, 재시도 usage). LLM 수정 호출이 없으면 usage는 빈 dict.
+            수정 결과 블록 수가 맞지 않으면 규칙 기반 수정까지만 반영한다.
+        """
+        output, auto_repaired = self.validator.auto_repair(output)
+        if auto_repaired:
+            logger.info(f"Mermaid 규칙 기반 수정 {label} ({auto_repaired} 블록) — LLM 수정 호출 생략")
+        matches = list(_MERMAID_BLOCK_RE.finditer(output))
+        failing = [
+            (m, errors) for m in matches
+            if _block_key(m.group(1)) not in attempted and (errors := self.validator.validate_block(m.group(1)))
+        ]
+        if not failing:
+            return output, {}
+
+        logger.warning(
+            f"Mermaid 검증 실패 {label} ({len(failing)}/{len(matches)} 블록), 실패 블록만 수정 호출: "
+            f"{[errors for _, errors in failing]}"
+        )
+        cancellation.check()
+        result = self._create_repair_instance()(
+            self._build_repair_prompt([(m.group(1), errors) for m, errors in failing])
+        )
+        retry_usage = extract_usage(result)
+        fixed = _MERMAID_BLOCK_RE.findall(extract_final_text(result))
+        if len(fixed) != len(failing):
+            logger.warning(f"Mermaid 수정 결과 블록 수 불일치 {label} ({len(fixed)}/{len(failing)}) — 원본 유지")
+            return output, retry_usage
+
+        # 뒤쪽 블록부터 교체해 앞쪽 위치가 바뀌지 않게 한다
+        for (m, _), source in reversed(list(zip(failing, fixed))):
+            output = output[:m.start(1)] + source.strip() + "\n" + output[m.end(1):]
+
+        # 수정 결과 검증 (실패해도 반환 — 최선의 결과 사용)
+        is_valid_retry, retry_errors = self.validator.validate(output)
         if not is_valid_retry:
-            logger.warning(f"Mermaid 재시도 후에도 오류 존재 ({len(retry_errors)}건): {retry_errors}")
-        return retry_output
+            logger.warning(f"Mermaid 수정 후에도 오류 존재 {label} ({len(retry_errors)}건): {retry_errors}")
+        return output, retry_usage
+
+    @staticmethod
+    def _clean_diagram_output(text: str) -> str:
+        """다이어그램 1개 출력 정리 — `### 3.x` 헤딩 이전 메타 코멘트와, 모델이 지시와 달리 쓴
+        `## 3.` 상위 헤딩 제거 (조합 시 한 번만 붙인다)"""
+        text = _SECTION_HEADING_RE.sub('', text)
+        heading = _DIAGRAM_HEADING_RE.search(text)
+        if heading:
+            text = text[heading.start():]
+        return clean_internal_comments(text)
+
+    def _generate_diagrams_parallel(self, design_result: str, analysis: Dict[str, Any]) -> str:
+        """Scatter-Gather: 다이어그램별 병렬 생성 + 개별 검증/재시도"""
+        context_section = build_analysis_context(analysis)
+        results: List[Optional[str]] = [None] * len(_DIAGRAMS)
+        usages = []
+        retry_usages = []
+
+        with ThreadPoolExecutor(max_workers=min(len(_DIAGRAMS), DIAGRAM_PARALLEL_CALLS)) as executor:
+            # 워커는 contextvars를 복사하지 않으므로 요청의 CancelToken을 함께 전달
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._generate_single_diagram,
+                    spec, design_result, context_section,
+                )
+                for spec in _DIAGRAMS
+            ]
+            try:
+                for i, future in enumerate(futures):
+                    results[i], usage, retry_usage = future.result()
+                    usages.append(usage)
+                    retry_usages.append(retry_usage)
+            except BaseException as e:
+                # 하나라도 실패/취소되면 아직 시작하지 않은 워커는 실행하지 않음
+                skipped = sum(1 for future in futures if future.cancel())
+                if isinstance(e, cancellation.Cancelled) and skipped:
+                    cancellation.cancellation_stats.record_skipped(skipped)
+                raise
+
+        # Gather: ## 3. 헤딩 + 다이어그램 순서대로 조합
+        assembled = _VISUAL_DESIGN_HEADING + "\n\n" + "\n\n".join(text for text in results if text)
+        self._last_usage = reduce(merge_usage, usages) if usages else {}
+        self._last_retry_usage = reduce(merge_usage, retry_usages) if retry_usages else {}
+        return assembled.strip()
+
+    def _generate_diagrams_single(self, design_result: str, analysis: Dict[str, Any]) -> str:
+        """기존 단일 호출 방식 (병렬 생성 실패 시 fallback, 검증 + 실패 블록 수정 1회)"""
+
+        prompt = self._build_prompt(design_result, analysis)
+
+        # 1차 생성 (닫힌 블록부터 검증·수정 시작)
+        result, early = self._call_with_early_repair(self.agent, prompt)
+        output = extract_final_text(result)
+        self._last_usage = extract_usage(result)
+
+        # 스트리밍 중 수정 결과 반영 + 놓친 실패 블록만 수정 호출 1회
+        output, self._last_retry_usage = self._finish_repair(output, early)
+        self._last_usage = merge_usage(self._last_usage, self._last_retry_usage)
+        return output
+
+    def generate_diagrams(self, design_result: str, analysis: Dict[str, Any]) -> str:
+        """다이어그램 생성 — 다이어그램별 병렬 호출, 실패 시 단일 호출로 fallback"""
+        logger.info(f"DiagramAgent 병렬 모드: {len(_DIAGRAMS)}개 다이어그램")
+        try:
+            return self._generate_diagrams_parallel(design_result, analysis)
+        except cancellation.Cancelled:
+            raise
+        except Exception as e:
+            logger.warning(f"DiagramAgent 병렬 실패, 단일 호출로 fallback: {e}")
+            return self._generate_diagrams_single(design_result, analysis)
@@ -0,0 +1,240 @@
+"""느린 stage hedging (opt-in) — 지연 꼬리가 긴 서브에이전트 호출을 중복 실행해 먼저 끝난 쪽 채택.
+
+diagram / prompt / tool / data_integration은 병렬로 실행되므로 전체 소요 시간은 가장 느린
+stage가 정한다. 단일 Bedrock 호출의 지연 분포는 꼬리가 길어, 드물게 느린 호출 하나가
+명세서 전체를 붙잡는다.
+
+- 지연 기준: stage별 최근 완료 지연의 percentile (표본이 min_samples 미만이면 hedging 안 함)
+- stage가 기준을 넘도록 끝나지 않으면 별도 서브에이전트 인스턴스로 같은 stage를 한 번 더
+  실행하고, 먼저 성공한 결과를 채택한 뒤 다른 쪽은 하위 CancelToken으로 중단한다.
+  원본이 기준 전에 실패하면 hedge 없이 그대로 실패한다 (재시도가 아님).
+- 토큰 예산: stage가 완료될 때마다 사용 토큰 × budget_ratio만큼 적립하고(상한 budget_max),
+  hedge 1회는 해당 stage의 평균 사용 토큰(지수이동평균)을 미리 차감한다. hedge 시도가 끝나면
+  (이기든 취소되든) 예약분을 실제 사용 토큰으로 정산한다. 예산이 부족하면 hedge하지 않으므로
+  hedging으로 늘어나는 토큰은 전체 stage 사용량의 budget_ratio 이내다.
+- 사용 토큰은 시도 토큰과 그 하위 토큰(DiagramAgent의 스트리밍 중 수정 호출 등)의 합이다.
+- 동시 실행: 요청(부모 CancelToken)당 진행 중인 hedge는 1개다. admission은 spec / spec_section
+  요청마다 가장 넓은 stage 1개분(SPEC_HEDGE_LLM_CALLS)을 더 예약하므로, hedge 호출도
+  MAX_CONCURRENT_LLM_CALLS와 Bedrock 커넥션 풀 크기 안에서 실행된다.
+- 각 시도는 요청 CancelToken의 하위 토큰으로 실행되므로 요청이 취소되면 둘 다 중단된다.
+- 취소는 협조적이라 진 원본 시도는 다음 취소 지점까지 풀 인스턴스의 서브에이전트를 계속 쓴다.
+  기다리면 hedge 이득이 사라지므로 기다리지 않고, 아직 실행 중인 원본의 Future를
+  on_abandoned로 넘긴다 (호출 측이 해당 인스턴스를 재사용하지 않도록 — MultiStageSpecAgent.reset).
+
+환경변수:
+  SPEC_HEDGE                   -> "1"이면 활성화 (기본 비활성)
+  SPEC_HEDGE_PERCENTILE        -> hedge 시작 지연 percentile (기본 0.9)
+  SPEC_HEDGE_MIN_SAMPLES       -> percentile 계산 최소 표본 수 (기본 10)
+  SPEC_HEDGE_BUDGET_RATIO      -> stage 사용 토큰 대비 hedge 허용 비율 (기본 0.1)
+  SPEC_HEDGE_BUDGET_MAX_TOKENS -> 적립 예산 상한 (기본 200000)
+"""
+
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import cancellation
+from agent_config import SPEC_HEDGE_ENABLED
+
+logger = logging.getLogger(__name__)
+
+_HISTORY_SIZE = 100
+_EMA_ALPHA = 0.2
+_MAX_WORKERS = 16
+
+
+class Hedger:
+    """stage별 지연 이력 + 토큰 예산으로 hedge 여부를 결정하고 시도를 실행"""
+
+    def __init__(
+        self,
+        percentile: float = 0.9,
+        min_samples: int = 10,
+        budget_ratio: float = 0.1,
+        budget_max_tokens: int = 200000,
+    ):
+        self._percentile = min(max(percentile, 0.0), 1.0)
+        self._min_samples = max(min_samples, 1)
+        self._budget_ratio = budget_ratio
+        self._budget_max = budget_max_tokens
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._avg_tokens: Dict[str, float] = {}
+        self._budget = 0.0
+        self._hedging: Set[Optional[cancellation.CancelToken]] = set()  # hedge 실행 중인 요청
+        self._executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="spec-hedge")
+        self._counters = {
+            "hedged": 0, "hedge_wins": 0, "budget_denied": 0, "capacity_denied": 0,
+            "tokens_reserved": 0, "tokens_hedged": 0,
+        }
+
+    def run(
+        self,
+        name: str,
+        primary: Callable[[], Any],
+        backup: Callable[[], Any],
+        on_abandoned: Optional[Callable[[Future], None]] = None,
+    ) -> Any:
+        """stage 스레드에서 호출 — primary 결과(또는 hedge가 먼저 끝나면 backup 결과) 반환.
+
+        hedge가 이겼는데 primary가 아직 실행 중이면 primary의 Future로 on_abandoned를 호출한다.
+        """
+        parent = cancellation.current_token()
+        delay = self._delay(name)
+        started = time.monotonic()
+        if delay is None:
+            # 지연 이력 부족 — hedge 없이 실행하며 이력/비용만 기록
+            token = self._attempt_token(parent, name)
+            with cancellation.bound(token):
+                result = primary()
+            self._observe(name, time.monotonic() - started, token.tokens_used)
+            return result
+
+        attempts: List[Tuple[cancellation.CancelToken, Future]] = [
+            self._launch(parent, name, primary)
+        ]
+        done, _ = wait([attempts[0][1]], timeout=delay)
+        if not done:
+            reserve = self._reserve(name, parent)
+            if reserve is not None:
+                logger.info(
+                    f"[HEDGE] {name} {delay:.1f}s 초과 — 중복 실행 (예약 {reserve} tokens)"
+                )
+                hedge_token, hedge_future = self._launch(parent, f"{name}/hedge", backup)
+                hedge_future.add_done_callback(lambda _: self._settle(parent, reserve, hedge_token))
+                attempts.append((hedge_token, hedge_future))
+
+        pending = {future for _, future in attempts}
+        winner: Optional[int] = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for index, (_, future) in enumerate(attempts):
+                if future in done and future.exception() is None:
+                    winner = index
+                    break
+
+        for index, (token, _) in enumerate(attempts):
+            if index != winner:
+                token.cancel(record=False)
+        if winner and on_abandoned is not None and not attempts[0][1].done():
+            on_abandoned(attempts[0][1])
+        if winner is None:
+            raise attempts[0][1].exception()
+
+        token, future = attempts[winner]
+        if winner > 0:
+            with self._lock:
+                self._counters["hedge_wins"] += 1
+            logger.info(f"[HEDGE] {name} hedge 채택 ({time.monotonic() - started:.1f}s)")
+        self._observe(name, time.monotonic() - started, token.tokens_used)
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "budget_tokens": int(self._budget),
+                "thresholds": {
+                    name: round(value, 1)
+                    for name in self._latencies
+                    if (value := self._delay_locked(name)) is not None
+                },
+            }
+
+    # ── 내부 ─────────────────────────────────
+
+    def _attempt_token(
+        self, parent: Optional[cancellation.CancelToken], label: str
+    ) -> cancellation.CancelToken:
+        return parent.child(label) if parent is not None else cancellation.CancelToken(label)
+
+    def _launch(
+        self, parent: Optional[cancellation.CancelToken], label: str, fn: Callable[[], Any]
+    ) -> Tuple[cancellation.CancelToken, Future]:
+        token = self._attempt_token(parent, label)
+
+        def attempt():
+            with cancellation.bound(token):
+                return fn()
+
+        return token, self._executor.submit(contextvars.copy_context().run, attempt)
+
+    def _delay(self, name: str) -> Optional[float]:
+        with self._lock:
+            return self._delay_locked(name)
+
+    def _delay_locked(self, name: str) -> Optional[float]:
+        history = self._latencies.get(name)
+        if history is None or len(history) < self._min_samples:
+            return None
+        ordered = sorted(history)
+        return ordered[min(math.ceil(self._percentile * len(ordered)), len(ordered)) - 1]
+
+    def _reserve(self, name: str, request: Optional[cancellation.CancelToken]) -> Optional[int]:
+        """hedge 1회 비용(stage 평균 토큰)을 예산에서 차감하고 요청의 hedge 자리를 차지.
+        요청에 이미 진행 중인 hedge가 있거나 예산이 부족하면 None"""
+        with self._lock:
+            if request in self._hedging:
+                self._counters["capacity_denied"] += 1
+                return None
+            cost = self._avg_tokens.get(name)
+            if cost is None or cost > self._budget:
+                self._counters["budget_denied"] += 1
+                return None
+            self._budget -= cost
+            self._hedging.add(request)
+            self._counters["hedged"] += 1
+            self._counters["tokens_reserved"] += int(cost)
+            return int(cost)
+
+    def _settle(
+        self, request: Optional[cancellation.CancelToken], reserved: int, token: cancellation.CancelToken
+    ) -> None:
+        """hedge 시도 종료 — 요청의 hedge 자리 반납, 예약 토큰을 실제 사용량으로 정산"""
+        with self._lock:
+            self._hedging.discard(request)
+            self._budget = min(self._budget + reserved - token.tokens_used, self._budget_max)
+            self._counters["tokens_hedged"] += token.tokens_used
+
+    def _observe(self, name: str, seconds: float, tokens: int) -> None:
+        with self._lock:
+            self._latencies.setdefault(name, deque(maxlen=_HISTORY_SIZE)).append(seconds)
+            if tokens > 0:
+                prev = self._avg_tokens.get(name)
+                self._avg_tokens[name] = (
+                    float(tokens) if prev is None else (1 - _EMA_ALPHA) * prev + _EMA_ALPHA * tokens
+                )
+                self._budget = min(self._budget + tokens * self._budget_ratio, self._budget_max)
+
+
+_hedger: Optional[Hedger] = None
+_hedger_created = False
+_hedger_lock = threading.Lock()
+
+
+def _create_hedger_from_env() -> Optional[Hedger]:
+    if not SPEC_HEDGE_ENABLED:
+        return None
+    return Hedger(
+        percentile=float(os.environ.get("SPEC_HEDGE_PERCENTILE", 0.9)),
+        min_samples=int(os.environ.get("SPEC_HEDGE_MIN_SAMPLES", 10)),
+        budget_ratio=float(os.environ.get("SPEC_HEDGE_BUDGET_RATIO", 0.1)),
+        budget_max_tokens=int(os.environ.get("SPEC_HEDGE_BUDGET_MAX_TOKENS", 200000)),
+    )
+
+
+def get_hedger() -> Optional[Hedger]:
+    """프로세스 전역 Hedger (SPEC_HEDGE 미설정 시 None)"""
+    global _hedger, _hedger_created
+    if not _hedger_created:
+        with _hedger_lock:
+            if not _hedger_created:
+                _hedger = _create_hedger_from_env()
+                _hedger_created = True
+    return _hedger
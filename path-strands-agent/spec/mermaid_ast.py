@@ -0,0 +1,298 @@
+"""Mermaid 블록 tokenizer + parser — 검증(MermaidValidator)과 spec_meta 파싱(spec_parser)이 공유하는 AST.
+
+- flowchart/graph: 토큰 정규식 1회 스캔. 도형(`[..]`, `((..))`, `{{..}}` 등)은 텍스트째 토큰 1개,
+  화살표는 앞뒤 공백과 `|label|`까지 토큰 1개로 읽어 Python 단계 수를 줄이고, 줄(또는 `;`) 단위
+  문장을 노드 그룹(`A & B`)과 화살표의 연쇄(`A --> B --> C`)로 해석해 노드·엣지를 만든다.
+  `subgraph id[title]`의 제목은 노드 텍스트(node_texts)로만 기록한다 (노드는 아님).
+- sequenceDiagram: 줄마다 결합 정규식 1회로 participant/actor, 메시지, activate/deactivate
+  (명시적 + 인라인 +/-)를 읽는다.
+- 공통: 주석·따옴표 밖 괄호 개수를 블록 단위로 집계 (검증기 기존 규칙과 동일).
+
+같은 소스는 LRU 캐시로 한 번만 파싱하므로 DiagramAgent 검증 후 orchestrator의 spec_meta
+파싱은 캐시된 AST를 재사용한다 (반환 객체는 읽기 전용으로 취급). 그 밖의 다이어그램 타입은
+kind="unknown"으로 괄호 개수만 채운다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# 도형 텍스트: 따옴표 문자열 또는 줄바꿈·따옴표가 아닌 문자 (닫는 기호 직전까지 lazy)
+_SHAPE_TEXT = r'(?:"[^"\n]*"|[^"\n])*?'
+# 여는 기호 → 닫는 기호 (긴 것 먼저 — 토큰 정규식 alternation 순서와 같다)
+_SHAPES: Tuple[Tuple[str, str], ...] = (
+    ("(((", r"\)\)\)"), ("((", r"\)\)"), ("([", r"\]\)"), ("[[", r"\]\]"), ("[(", r"\)\]"),
+    ("[/", r"[/\\]\]"), ("[\\", r"[/\\]\]"), ("{{", r"\}\}"),
+    ("[", r"\]"), ("(", r"\)"), ("{", r"\}"), (">", r"\]"),
+)
+
+_SHAPE_MATCHERS = tuple(
+    (opener, re.compile(re.escape(opener) + "(" + _SHAPE_TEXT + ")" + closer))
+    for opener, closer in _SHAPES
+)
+
+_SHAPE_ALTERNATION = "|".join(
+    ("(?<=\\w)>" if opener == ">" else re.escape(opener)) + _SHAPE_TEXT + closer
+    for opener, closer in _SHAPES
+)
+
+_FLOW_TOKEN_RE = re.compile(
+    r"(?P<nl>\n[ \t]*)"
+    r"|(?P<comment>%%[^\n]*)"
+    r"|(?P<shape>" + _SHAPE_ALTERNATION + ")"
+    # -- label --> / == label ==> / -. label .-> (라벨 내 '-', '=' 미지원)
+    r"|(?P<arrow_text>[ \t]*(?P<inline_open>--|==|-\.)[ \t]+(?P<inline>[^\n|\-=]*?)[ \t]*"
+    r"(?P<inline_arrow>-{2,}>|-{3,}|={2,}>|={3,}|\.->|\.-)[ \t]*)"
+    r"|(?P<arrow>[ \t]*(?P<arrow_kind><?(?:-\.+->?|-{2,}(?:>|[xo](?!\w))?|={2,}(?:>|[xo](?!\w))?|~{3,}))"
+    r"(?:[ \t]*\|(?P<pipe>[^|\n]*)\|)?[ \t]*)"
+    r"|(?P<id>\w+)"
+    r"|(?P<classref>:::\w+)"
+    r"|(?P<amp>[ \t]*&[ \t]*)"
+    r"|(?P<semi>[ \t]*;[ \t]*)"
+    r"|(?P<open>[\[({])"   # 같은 줄에서 닫히지 않은 도형
+    r"|(?P<ws>[ \t\r]+)"
+    r"|(?P<other>.)"
+)
+
+# 괄호 집계에서 제외할 부분 (MermaidValidator 기존 규칙: 주석 → "..." → '...' 순서로 제거)
+_COMMENT_RE = re.compile(r"%%.*$", re.MULTILINE)
+_DQUOTE_RE = re.compile(r'"[^"]*"')
+_SQUOTE_RE = re.compile(r"'[^']*'")
+
+_BRACKET_CHARS = "[](){}"
+
+_FLOW_SKIP_KEYWORDS = frozenset(
+    ("subgraph", "end", "classDef", "class", "style", "linkStyle", "click", "direction")
+)
+
+# `subgraph id[title]` / `subgraph id [title]` — 제목은 노드 텍스트와 같은 규칙으로 검증
+_SUBGRAPH_TITLE_RE = re.compile(
+    r"[ \t]+\w+[ \t]*(?:(?P<shape>" + _SHAPE_ALTERNATION + r")|(?P<open>[\[({]))"
+)
+
+_SEQ_LINE_RE = re.compile(
+    r"(?P<activation>activate|deactivate)\s+(?P<activation_id>\S+)"
+    r"|(?:participant|actor)\s+(?P<participant>[^\s:]+)(?:\s+as\s+(?P<alias>.+))?$"
+    r"|(?P<src>[^\s:]+?)\s*(?P<arrow>--?>>|--?>|--?x|--?\))(?P<mod>[+-]?)\s*"
+    r"(?P<dst>[^\s:]+?)\s*:(?P<text>.*)$"
+)
+
+
+@dataclass(slots=True)
+class Node:
+    id: str
+    label: str
+    shape: str = ""       # 여는 도형 토큰 ("[", "((", "{" ...), 참조만 된 노드는 ""
+    quoted: bool = False
+
+
+@dataclass(slots=True)
+class Edge:
+    source: str
+    target: str
+    arrow: str
+    label: str = ""
+    quoted: bool = False
+    inline: str = ""      # 텍스트형 라벨(`-- text -->`)의 여는 기호 ("--", "==", "-."), `|label|`형은 ""
+
+
+@dataclass(slots=True)
+class Message:
+    source: str
+    target: str
+    arrow: str
+    modifier: str   # "+" (target activate) / "-" (source deactivate) / ""
+    text: str
+
+
+@dataclass(slots=True)
+class Diagram:
+    kind: str                  # "flowchart" / "graph" / "sequenceDiagram" / "unknown"
+    header: str                # 첫 줄 (다이어그램 타입 선언)
+    nodes: Dict[str, Node] = field(default_factory=dict)          # 등장 순서 (sequence: participant)
+    edges: List[Edge] = field(default_factory=list)
+    messages: List[Message] = field(default_factory=list)
+    node_texts: List[Tuple[str, bool]] = field(default_factory=list)  # 도형 텍스트 원문 + 따옴표 여부 (선언마다)
+    activations: List[Tuple[str, bool]] = field(default_factory=list)  # (participant, activate 여부) 실행 순서
+    brackets: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(_BRACKET_CHARS, 0))
+
+
+def detect_kind(header: str) -> str:
+    first = header.strip().lower()
+    if first.startswith("flowchart"):
+        return "flowchart"
+    if first.startswith("graph"):
+        return "graph"
+    if first.startswith("sequencediagram"):
+        return "sequenceDiagram"
+    return "unknown"
+
+
+@lru_cache(maxsize=128)
+def parse(source: str) -> Diagram:
+    """Mermaid 블록 소스(코드 펜스 제외) → Diagram"""
+    header, _, body = source.strip().partition("\n")
+    diagram = Diagram(kind=detect_kind(header), header=header.strip())
+    cleaned = _SQUOTE_RE.sub("", _DQUOTE_RE.sub("", _COMMENT_RE.sub("", source)))
+    for ch in _BRACKET_CHARS:
+        diagram.brackets[ch] = cleaned.count(ch)
+    if diagram.kind in ("flowchart", "graph"):
+        _parse_flow(diagram, body)
+    elif diagram.kind == "sequenceDiagram":
+        _parse_sequence(diagram, body)
+    return diagram
+
+
+# ── flowchart / graph ─────────────────────────
+
+
+def _parse_flow(diagram: Diagram, body: str) -> None:
+    """토큰 1회 스캔 — 줄(또는 `;`) 단위 문장을 노드 그룹과 화살표의 연쇄로 읽는다"""
+    prev_group: List[str] = []
+    group: List[str] = []
+    pending: Optional[Tuple[str, str, bool, str]] = None  # (arrow, label, quoted, inline)
+    node: Optional[Node] = None      # 직전 id 토큰의 노드 (도형이 바로 붙으면 선언)
+    node_end = -1
+    skip_line = False
+    line_start = True
+
+    def close_group() -> None:
+        nonlocal prev_group, group, pending
+        if group:
+            if pending is not None and prev_group:
+                arrow, label, quoted, inline = pending
+                for src in prev_group:
+                    for dst in group:
+                        diagram.edges.append(Edge(src, dst, arrow, label, quoted, inline))
+            prev_group, group, pending = group, [], None
+
+    for m in _FLOW_TOKEN_RE.finditer(body):
+        kind = m.lastgroup
+        if kind == "nl" or kind == "semi":
+            close_group()
+            prev_group, pending, node = [], None, None
+            skip_line = skip_line and kind == "semi"
+            line_start = True
+            continue
+        if skip_line or kind == "ws" or kind == "comment":
+            continue
+        if kind == "id":
+            text = m.group()
+            if line_start and text in _FLOW_SKIP_KEYWORDS:
+                if text == "subgraph":
+                    _subgraph_title(diagram, body, m.end())
+                skip_line = True
+                continue
+            line_start = False
+            node = diagram.nodes.get(text)
+            if node is None:
+                node = diagram.nodes[text] = Node(text, text)
+            node_end = m.end()
+            group.append(text)
+            continue
+        line_start = False
+        if kind == "shape" or kind == "open":
+            if node is not None and m.start() == node_end:
+                if kind == "shape":
+                    shape, raw = _split_shape(m.group())
+                else:
+                    # 닫히지 않은 도형 — 줄 끝까지를 텍스트로 본다
+                    end = body.find("\n", m.end())
+                    raw = body[m.end(): end if end >= 0 else len(body)]
+                    shape = m.group()
+                _declare(diagram, node, shape, raw)
+                node_end = m.end()
+                if kind == "open":
+                    skip_line = True
+            continue
+        if kind == "classref":
+            node_end = m.end() if node is not None and m.start() == node_end else node_end
+            continue
+        if kind == "amp":
+            node = None
+            continue
+        node = None
+        if kind == "arrow":
+            close_group()
+            pipe = m.group("pipe")
+            label, quoted = _label(pipe) if pipe is not None else ("", False)
+            pending = (m.group("arrow_kind"), label, quoted, "")
+        elif kind == "arrow_text":
+            close_group()
+            label, quoted = _label(m.group("inline"))
+            pending = (m.group("inline_arrow"), label, quoted, m.group("inline_open"))
+    close_group()
+
+
+def _subgraph_title(diagram: Diagram, body: str, pos: int) -> None:
+    """subgraph 제목 도형 텍스트를 node_texts에 추가 (노드는 만들지 않는다 — spec_meta 제외)"""
+    m = _SUBGRAPH_TITLE_RE.match(body, pos)
+    if m is None:
+        return
+    if m.group("shape") is not None:
+        raw = _split_shape(m.group("shape"))[1]
+    else:
+        # 닫히지 않은 제목 — 줄 끝까지를 텍스트로 본다
+        end = body.find("\n", m.end())
+        raw = body[m.end(): end if end >= 0 else len(body)]
+    diagram.node_texts.append((raw, _is_quoted(raw)))
+
+
+def _split_shape(token: str) -> Tuple[str, str]:
+    """도형 토큰 → (여는 기호, 텍스트). 토큰 정규식 alternation과 같은 순서로 판별"""
+    for opener, matcher in _SHAPE_MATCHERS:
+        if token.startswith(opener):
+            m = matcher.fullmatch(token)
+            if m:
+                return opener, m.group(1)
+    return token[0], token[1:-1]
+
+
+def _declare(diagram: Diagram, node: Node, shape: str, raw: str) -> None:
+    quoted = _is_quoted(raw)
+    diagram.node_texts.append((raw, quoted))
+    if shape == ">":
+        diagram.brackets["["] += 1  # 비대칭 도형 `A>text]`의 닫는 `]` 짝
+    if not node.shape or node.label == node.id:
+        node.label, node.shape, node.quoted = raw.strip().strip('"'), shape, quoted
+
+
+def _is_quoted(raw: str) -> bool:
+    text = raw.strip()
+    return len(text) >= 2 and text[0] == '"' and text[-1] == '"'
+
+
+def _label(raw: str) -> Tuple[str, bool]:
+    return raw.strip().strip('"'), _is_quoted(raw)
+
+
+# ── sequenceDiagram ───────────────────────────
+
+
+def _parse_sequence(diagram: Diagram, body: str) -> None:
+    nodes = diagram.nodes
+    for line in body.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("%%"):
+            continue
+        m = _SEQ_LINE_RE.match(line)
+        if m is None:
+            continue
+        if m.group("activation"):
+            diagram.activations.append((m.group("activation_id"), m.group("activation") == "activate"))
+        elif m.group("participant"):
+            node_id = m.group("participant")
+            alias = (m.group("alias") or "").strip()
+            nodes[node_id] = Node(node_id, alias or node_id, "participant")
+        else:
+            src, dst, modifier = m.group("src"), m.group("dst"), m.group("mod")
+            if src not in nodes:
+                nodes[src] = Node(src, src, "participant")
+            if dst not in nodes:
+                nodes[dst] = Node(dst, dst, "participant")
+            diagram.messages.append(Message(src, dst, m.group("arrow"), modifier, m.group("text").strip()))
+            if modifier == "+":
+                diagram.activations.append((dst, True))
+            elif modifier == "-":
+                diagram.activations.append((src, False))
@@ -1,7 +1,46 @@
-"""Mermaid 다이어그램 문법 검증기 (Python only, Node.js 의존 없음)"""
+"""Mermaid 다이어그램 문법 검증기 (Python only, Node.js 의존 없음)
+
+검증 실패 대부분은 기계적으로 고칠 수 있다 (노드 텍스트·엣지 라벨의 따옴표 누락,
+activate/deactivate 불일치). auto_repair는 이런 경우를 규칙 기반으로 고친 뒤 다시
+검증하며, 고칠 수 없는 블록만 LLM 수정 호출로 넘긴다.
+
+검사는 spec.mermaid_ast가 블록마다 한 번 만든 AST(괄호 집계, 노드 텍스트, 엣지 라벨,
+activate 순서)에서 읽는다. AST가 없는 다이어그램 타입(classDiagram 등)만 정규식으로
+노드 텍스트를 검사한다. 자동 수정은 원문 줄을 고쳐 쓰므로 줄 단위 정규식을 쓴다.
+"""
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from spec import mermaid_ast
+
+# 노드 정의 패턴: 대괄호/중괄호/소괄호 안의 텍스트 (따옴표 없는 경우만)
+_NODE_PATTERNS = (
+    re.compile(r'\[([^\]"]+)\]'),   # [text]
+    re.compile(r'\{([^}"]+)\}'),    # {text}
+    re.compile(r'\(([^)"]+)\)'),    # (text)
+)
+# 겹괄호 도형([[..]], ([..]), {{..}}, ((..)), [/..], [\..])의 안쪽 여는 문자
+_SHAPE_LEAD_CHARS = '[({/\\'
+# 엣지 라벨: -->|text|, ---|text|, -.->|text|, ==>|text|
+_EDGE_LABEL_RE = re.compile(r'(--+>?|-\.+->?|==+>?)\|([^|"]+)\|')
+# 텍스트형 엣지 라벨: -- text -->, == text ==>, -. text .-> (mermaid_ast 토큰 규칙과 동일 — 라벨 내 '-', '=' 미지원)
+_INLINE_EDGE_LABEL_RE = re.compile(
+    r'(?<![-=.])(--|==|-\.)([ \t]+)([^\n|"\-=]*?[^\s|"\-=])([ \t]*)(-{2,}>|-{3,}|={2,}>|={3,}|\.->|\.-)'
+)
+
+# 인라인 메시지 파싱: SOURCE ARROW MODIFIER TARGET: MESSAGE
+# ARROW: ->> / -->> / -x / --x / -> / -->
+# MODIFIER: + (activate target) / - (deactivate source) / 없음
+_INLINE_MSG_RE = re.compile(
+    r'^(\S+?)\s*'          # SOURCE
+    r'(?:--?>>?|--?x)'     # ARROW (non-capturing)
+    r'([+-]?)'             # MODIFIER
+    r'(\S+?)'             # TARGET
+    r'\s*:'                # colon
+)
+_ACTIVATE_RE = re.compile(r'activate\s+(\S+)')
+_DEACTIVATE_RE = re.compile(r'deactivate\s+(\S+)')
 
 
 class MermaidValidator:
@@ -31,17 +70,67 @@ class MermaidValidator:
             return (True, [])  # Mermaid 블록이 없으면 검증 스킵
 
         for i, block in enumerate(mermaid_blocks, 1):
-            block_errors = []
-            block_errors.extend(self._check_diagram_type(block))
-            block_errors.extend(self._check_bracket_pairs(block))
-            block_errors.extend(self._check_special_chars(block))
-            block_errors.extend(self._check_activate_deactivate(block))
-
-            for err in block_errors:
+            for err in self.validate_block(block):
                 errors.append(f"[블록 {i}] {err}")
 
         return (len(errors) == 0, errors)
 
+    def validate_block(self, block: str) -> List[str]:
+        """Mermaid 블록 1개(코드 펜스 제외) 검증 — 오류 목록 (블록 번호 없음)"""
+        diagram = mermaid_ast.parse(block)
+        errors: List[str] = []
+        errors.extend(self._check_diagram_type(block))
+        errors.extend(self._check_bracket_pairs(diagram))
+        if diagram.kind in ('flowchart', 'graph'):
+            errors.extend(self._check_node_texts(diagram))
+            errors.extend(self._check_edge_labels(diagram))
+        elif diagram.kind == 'sequenceDiagram':
+            errors.extend(self._check_activate_deactivate(diagram))
+        else:
+            errors.extend(self._check_special_chars(block))
+        return errors
+
+    def auto_repair(self, content: str) -> Tuple[str, int]:
+        """검증 실패 블록을 규칙 기반으로 수정 (LLM 호출 전 단계).
+
+        수정 후 오류가 줄어든 블록만 교체한다 (남은 오류는 LLM 수정 호출로 처리).
+
+        Returns:
+            (수정된 전체 텍스트, 오류 없이 고쳐진 블록 수)
+        """
+        repaired_count = 0
+        parts: List[str] = []
+        last = 0
+        for match in re.finditer(r'```mermaid\s*\n(.*?)```', content, re.DOTALL):
+            block = match.group(1)
+            errors = self.validate_block(block)
+            if not errors:
+                continue
+            repaired = self.repair_block(block)
+            remaining = self.validate_block(repaired)
+            if len(remaining) >= len(errors):
+                continue
+            if not remaining:
+                repaired_count += 1
+            parts.append(content[last:match.start(1)])
+            parts.append(repaired)
+            last = match.end(1)
+        if not parts:
+            return content, 0
+        parts.append(content[last:])
+        return ''.join(parts), repaired_count
+
+    def repair_block(self, block: str) -> str:
+        """Mermaid 블록 1개의 기계적 오류 수정 (따옴표 누락, activate/deactivate 불일치)"""
+        lines = block.split('\n')
+        repaired = [
+            line if line.strip().startswith('%%') else self._quote_labels(line)
+            for line in lines
+        ]
+        if block.strip().startswith('sequenceDiagram'):
+            repaired = self._balance_activations(repaired)
+        return '\n'.join(repaired)
+
     def _extract_mermaid_blocks(self, content: str) -> List[str]:
         """```mermaid ... ``` 코드 블록 추출"""
         pattern = r'```mermaid\s*\n(.*?)```'
@@ -60,19 +149,12 @@ class MermaidValidator:
         """Mermaid %% 주석 제거"""
         return re.sub(r'%%.*$', '', block, flags=re.MULTILINE)
 
-    def _check_bracket_pairs(self, block: str) -> List[str]:
-        """괄호 짝 확인 ({}, [], ())"""
+    def _check_bracket_pairs(self, diagram: mermaid_ast.Diagram) -> List[str]:
+        """괄호 짝 확인 ({}, [], ()) — 주석·따옴표 밖의 괄호 개수 (tokenizer 집계)"""
         errors = []
-        pairs = {'{': '}', '[': ']', '(': ')'}
-
-        # 주석, 따옴표 안의 내용 제거
-        cleaned = self._strip_comments(block)
-        cleaned = re.sub(r'"[^"]*"', '', cleaned)
-        cleaned = re.sub(r"'[^']*'", '', cleaned)
-
-        for open_char, close_char in pairs.items():
-            open_count = cleaned.count(open_char)
-            close_count = cleaned.count(close_char)
+        for open_char, close_char in (('{', '}'), ('[', ']'), ('(', ')')):
+            open_count = diagram.brackets[open_char]
+            close_count = diagram.brackets[close_char]
             if open_count != close_count:
                 errors.append(
                     f"'{open_char}{close_char}' 짝 불일치: "
@@ -80,43 +162,27 @@ class MermaidValidator:
                 )
         return errors
 
+    def _check_node_texts(self, diagram: mermaid_ast.Diagram) -> List[str]:
+        """flowchart/graph 노드 텍스트 내 특수문자 따옴표 미사용 감지 (AST 도형 텍스트)"""
+        errors = []
+        for text, quoted in diagram.node_texts:
+            found = None if quoted else self._find_special_char(text)
+            if found:
+                errors.append(
+                    f"노드 텍스트에 특수문자 '{found}' 발견 (따옴표 필요): "
+                    f"'{text.strip()[:60]}'"
+                )
+        return errors
+
     def _check_special_chars(self, block: str) -> List[str]:
-        """노드 텍스트 내 특수문자 따옴표 미사용 감지"""
+        """노드 텍스트 내 특수문자 따옴표 미사용 감지 (AST가 없는 다이어그램 타입용 정규식 검사)"""
         errors = []
         cleaned = self._strip_comments(block)
 
-        # 노드 정의 패턴: 대괄호/중괄호/소괄호 안의 텍스트 (따옴표 없는 경우만)
-        node_patterns = [
-            r'\[([^\]"]+)\]',   # [text]
-            r'\{([^}"]+)\}',    # {text}
-            r'\(([^)"]+)\)',    # (text)
-        ]
-        # 2글자 특수문자를 먼저 검사하여 >=/<=를 >/<보다 우선 감지
-        special_chars_multi = ['>=', '<=']
-        special_chars_single = ['&', '?']
-
-        for pattern in node_patterns:
-            matches = re.finditer(pattern, cleaned)
-            for match in matches:
+        for pattern in _NODE_PATTERNS:
+            for match in pattern.finditer(cleaned):
                 text = match.group(1)
-                found = None
-                # 2글자 특수문자 먼저
-                for sc in special_chars_multi:
-                    if sc in text:
-                        found = sc
-                        break
-                # 단독 > < 는 >=/<= 이 없을 때만 검사
-                if not found:
-                    for sc in ('>', '<'):
-                        if sc in text and '>=' not in text and '<=' not in text:
-                            found = sc
-                            break
-                # 나머지 단일문자
-                if not found:
-                    for sc in special_chars_single:
-                        if sc in text:
-                            found = sc
-                            break
+                found = self._find_special_char(text)
                 if found:
                     errors.append(
                         f"노드 텍스트에 특수문자 '{found}' 발견 (따옴표 필요): "
@@ -124,64 +190,131 @@ class MermaidValidator:
                     )
         return errors
 
-    def _check_activate_deactivate(self, block: str) -> List[str]:
-        """Sequence Diagram activate/deactivate 쌍 확인 (명시적 + 인라인 +/- 문법)
-
-        인라인 문법 의미:
-        - A->>+B: msg -> B(타겟)를 activate
-        - B-->>-A: msg -> B(소스)를 deactivate
-        """
-        if not block.strip().startswith('sequenceDiagram'):
-            return []
+    @staticmethod
+    def _find_special_char(text: str) -> Optional[str]:
+        """따옴표가 필요한 특수문자 (없으면 None)"""
+        # 2글자 특수문자를 먼저 검사하여 >=/<=를 >/<보다 우선 감지
+        for sc in ('>=', '<='):
+            if sc in text:
+                return sc
+        # 단독 > < 는 >=/<= 이 없을 때만 검사
+        for sc in ('>', '<'):
+            if sc in text:
+                return sc
+        # 나머지 단일문자
+        for sc in ('&', '?'):
+            if sc in text:
+                return sc
+        return None
 
+    def _check_edge_labels(self, diagram: mermaid_ast.Diagram) -> List[str]:
+        """엣지 라벨(-->|text|, -- text -->) 내 `<`/`>` 따옴표 미사용 감지 (flowchart/graph)"""
         errors = []
-        activate_counts: Dict[str, int] = {}
-        deactivate_counts: Dict[str, int] = {}
-
-        # 인라인 메시지 파싱: SOURCE ARROW MODIFIER TARGET: MESSAGE
-        # ARROW: ->> / -->> / -x / --x / -> / -->
-        # MODIFIER: + (activate target) / - (deactivate source) / 없음
-        inline_msg_re = re.compile(
-            r'^(\S+?)\s*'          # SOURCE
-            r'(?:--?>>?|--?x)'     # ARROW (non-capturing)
-            r'([+-]?)'             # MODIFIER
-            r'(\S+?)'             # TARGET
-            r'\s*:'                # colon
-        )
+        for edge in diagram.edges:
+            if edge.quoted:
+                continue
+            found = next((sc for sc in ('<', '>') if sc in edge.label), None)
+            if found:
+                label = (
+                    f"{edge.inline} {edge.label[:60]} {edge.arrow}" if edge.inline
+                    else f"|{edge.label[:60]}|"
+                )
+                errors.append(f"엣지 라벨에 특수문자 '{found}' 발견 (따옴표 필요): '{label}'")
+        return errors
+
+    @classmethod
+    def _quote_labels(cls, line: str) -> str:
+        """노드 텍스트·엣지 라벨 중 특수문자가 있는 것을 따옴표로 감싼다"""
+        def quote_node(match: re.Match) -> str:
+            text = match.group(1)
+            if cls._find_special_char(text) is None:
+                return match.group(0)
+            # [[..]] / ([..]) 등 겹괄호 도형은 안쪽 여는 문자를 도형 구문으로 남긴다
+            lead = len(text) - len(text.lstrip(_SHAPE_LEAD_CHARS))
+            body = text[lead:].rstrip()
+            trail = len(body) - len(body.rstrip('/\\'))  # [/..\] 평행사변형·사다리꼴
+            inner = body[:len(body) - trail].strip()
+            opener, closer = match.group(0)[0], match.group(0)[-1]
+            return f'{opener}{text[:lead]}"{inner}"{body[len(body) - trail:]}{closer}'
+
+        for pattern in _NODE_PATTERNS:
+            line = pattern.sub(quote_node, line)
+
+        def quote_edge(match: re.Match) -> str:
+            label = match.group(2)
+            if '<' not in label and '>' not in label:
+                return match.group(0)
+            return f'{match.group(1)}|"{label.strip()}"|'
 
-        for line in block.split('\n'):
-            line = line.strip()
+        def quote_inline_edge(match: re.Match) -> str:
+            opener, before, label, after, arrow = match.groups()
+            if '<' not in label and '>' not in label:
+                return match.group(0)
+            return f'{opener}{before}"{label.strip()}"{after}{arrow}'
 
-            # 명시적 activate/deactivate
-            activate_match = re.match(r'activate\s+(\S+)', line)
-            deactivate_match = re.match(r'deactivate\s+(\S+)', line)
+        line = _EDGE_LABEL_RE.sub(quote_edge, line)
+        return _INLINE_EDGE_LABEL_RE.sub(quote_inline_edge, line)
 
+    @staticmethod
+    def _balance_activations(lines: List[str]) -> List[str]:
+        """activate/deactivate를 실행 순서대로 추적 — 짝 없는 deactivate는 제거,
+        끝까지 닫히지 않은 activate는 블록 끝에 deactivate를 추가"""
+        active: Dict[str, int] = {}
+        result: List[str] = []
+        for line in lines:
+            stripped = line.strip()
+            indent = line[:len(line) - len(line.lstrip())]
+            activate_match = _ACTIVATE_RE.match(stripped)
+            deactivate_match = _DEACTIVATE_RE.match(stripped)
             if activate_match:
                 p = activate_match.group(1)
-                activate_counts[p] = activate_counts.get(p, 0) + 1
+                active[p] = active.get(p, 0) + 1
             elif deactivate_match:
                 p = deactivate_match.group(1)
-                deactivate_counts[p] = deactivate_counts.get(p, 0) + 1
+                if not active.get(p):
+                    continue  # activate하지 않은 participant — 줄 제거
+                active[p] -= 1
             else:
-                # 인라인 +/- 문법
-                m = inline_msg_re.match(line)
+                m = _INLINE_MSG_RE.match(stripped)
                 if m:
                     source, modifier, target = m.group(1), m.group(2), m.group(3)
                     if modifier == '+':
-                        # + -> activate TARGET
-                        activate_counts[target] = activate_counts.get(target, 0) + 1
+                        active[target] = active.get(target, 0) + 1
                     elif modifier == '-':
-                        # - -> deactivate SOURCE
-                        deactivate_counts[source] = deactivate_counts.get(source, 0) + 1
-
-        all_participants = set(activate_counts.keys()) | set(deactivate_counts.keys())
-        for participant in all_participants:
-            act = activate_counts.get(participant, 0)
-            deact = deactivate_counts.get(participant, 0)
-            if act != deact:
-                errors.append(
-                    f"Sequence Diagram '{participant}': "
-                    f"activate {act}회, deactivate {deact}회 (불일치)"
-                )
+                        if active.get(source):
+                            active[source] -= 1
+                        else:
+                            # 인라인 deactivate 표시만 제거하고 메시지는 유지
+                            stripped = stripped[:m.start(2)] + stripped[m.end(2):]
+                            line = indent + stripped
+            result.append(line)
 
-        return errors
+        # 닫히지 않은 activate — 마지막 비어 있지 않은 줄의 들여쓰기로 닫는다
+        while result and not result[-1].strip():
+            result.pop()
+        body_indent = next(
+            (line[:len(line) - len(line.lstrip())] for line in reversed(result) if line.strip()
+             and not line.strip().startswith('sequenceDiagram')),
+            '    ',
+        )
+        for participant, count in active.items():
+            result.extend(f"{body_indent}deactivate {participant}" for _ in range(count))
+        return result + ['']
+
+    def _check_activate_deactivate(self, diagram: mermaid_ast.Diagram) -> List[str]:
+        """Sequence Diagram activate/deactivate 쌍 확인 (명시적 + 인라인 +/- 문법)
+
+        인라인 문법 의미:
+        - A->>+B: msg -> B(타겟)를 activate
+        - B-->>-A: msg -> B(소스)를 deactivate
+        """
+        counts: Dict[str, List[int]] = {}
+        for participant, activate in diagram.activations:
+            counts.setdefault(participant, [0, 0])[0 if activate else 1] += 1
+
+        return [
+            f"Sequence Diagram '{participant}': "
+            f"activate {act}회, deactivate {deact}회 (불일치)"
+            for participant, (act, deact) in counts.items()
+            if act != deact
+        ]
@@ -1,9 +1,12 @@
-"""명세서 생성 조율 - DiagramAgent + PromptAgent + ToolAgent 병렬 실행"""
+"""명세서 생성 조율 - stage 의존성 그래프(spec/stage_graph.py)로 서브에이전트 병렬 실행"""
 
 import asyncio
 import logging
-from typing import Dict, Any, AsyncIterator, Optional, List
+from typing import Dict, Any, AsyncIterator, Callable, Optional, List, Tuple
 
+import events
+from agent_config import get_profile
+from strands_utils import reset_agent_state
 from token_tracker import merge_usage
 from spec.design_agent import DesignAgent
 from spec.diagram_agent import DiagramAgent
@@ -12,9 +15,70 @@ from spec.tool_agent import ToolAgent
 from spec.data_integration_agent import DataIntegrationAgent
 from spec.assembler import AssemblerAgent
 from spec import spec_parser
+from spec.section_stream import SECTION_IDS, final_section, streamed
+from spec.hedging import get_hedger
+from spec.stage_cache import get_stage_cache, load_spec_outputs, save_spec_outputs
+from spec.stage_graph import Stage, StageGraph
 
 logger = logging.getLogger(__name__)
 
+_AGENT_NAMES = {
+    "design": "DesignAgent",
+    "diagram": "DiagramAgent",
+    "prompt": "PromptAgent",
+    "tool": "ToolAgent",
+    "data_integration": "DataIntegrationAgent",
+}
+
+# spec_section으로 다시 생성할 수 있는 stage (= 섹션이 있는 stage)
+SECTION_STAGES = tuple(SECTION_IDS)
+
+# spec_id로 보관하는 stage 결과와 누락 시 기본값 (design_core는 섹션 재생성 시 downstream 입력)
+_OUTPUT_DEFAULTS: Dict[str, Any] = {
+    "design": "",
+    "design_core": "",
+    "diagram": "",
+    "prompt": "",
+    "tool": "",
+    "data_integration": {"items": []},
+}
+
+
+# stage → (spec_meta 키, stage 결과 파서) — stage 완료 시 해당 키만 부분 spec_meta로 전송
+_META_FIELDS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "design": ("design_summary", spec_parser.extract_design_summary),
+    "diagram": ("diagrams", spec_parser.extract_mermaid_diagrams),
+    "prompt": ("agent_prompts", spec_parser.extract_agent_prompts),
+    "tool": ("tools", spec_parser.extract_tools),
+    "data_integration": (
+        "data_integrations",
+        lambda bundle: bundle if isinstance(bundle, dict) else {"items": []},
+    ),
+}
+
+
+def _build_spec_meta(results: Dict[str, Any], parsed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """stage 결과 → 구조화 메타데이터 (시뮬레이션 탭 용). parsed에 이미 파싱된 키는 재사용"""
+    parsed = parsed or {}
+    return {
+        key: parsed[key] if key in parsed else extract(results[stage])
+        for stage, (key, extract) in _META_FIELDS.items()
+    }
+
+
+def _partial_spec_meta(stage_results: Dict[str, Any], parsed: Dict[str, Any]) -> Optional[events.SpecMeta]:
+    """완료된 stage 결과만 파싱한 부분 spec_meta (parsed에 누적). 파싱 실패는 무시"""
+    meta = {}
+    for stage, value in stage_results.items():
+        if stage not in _META_FIELDS:
+            continue
+        key, extract = _META_FIELDS[stage]
+        try:
+            meta[key] = parsed[key] = extract(value)
+        except Exception as e:
+            logger.warning(f"부분 spec_meta 파싱 실패 ({stage}, 무시): {e}")
+    return events.SpecMeta(meta, partial=True) if meta else None
+
 
 class MultiStageSpecAgent:
     """명세서 생성 조율 - DiagramAgent + PromptAgent + ToolAgent 병렬 실행"""
@@ -26,6 +90,164 @@ class MultiStageSpecAgent:
         self.tool_agent = ToolAgent()
         self.data_integration_agent = DataIntegrationAgent()
         self.assembler_agent = AssemblerAgent()
+        # 이번 대여 동안 실행한 stage 그래프 — reset에서 hedge에 진 원본 시도가 끝났는지 확인
+        self._graphs: List[StageGraph] = []
+
+    def reset(self):
+        """풀 반납 시 호출 — 서브 에이전트의 대화/메트릭/usage 상태 제거.
+
+        hedge에 진 원본 stage가 아직 서브에이전트를 쓰고 있으면(협조적 취소 전) 예외를 올려
+        풀이 이 인스턴스를 폐기하게 한다.
+        """
+        running = sum(1 for graph in self._graphs for attempt in graph.abandoned if not attempt.done())
+        self._graphs = []
+        if running:
+            raise RuntimeError(f"hedge에 진 원본 stage {running}개가 아직 실행 중")
+        for sub in (
+            self.design_agent,
+            self.diagram_agent,
+            self.prompt_agent,
+            self.tool_agent,
+            self.data_integration_agent,
+        ):
+            reset_agent_state(sub.agent)
+            sub._last_usage = {}
+        self.diagram_agent._last_retry_usage = {}
+
+    def _build_stages(
+        self,
+        analysis: Dict[str, Any],
+        improvement_plans: Optional[Dict[str, str]],
+        chat_history: Optional[List[Dict[str, str]]],
+        additional_context: Optional[Dict[str, str]],
+        selected_data_sources: Optional[List[dict]],
+        emit: Optional[Callable[[events.Event], None]] = None,
+    ) -> List[Stage]:
+        """명세서 stage 선언 — inputs가 준비되는 즉시 실행된다.
+
+        design은 필수(실패 시 전체 중단), 나머지는 실패 시 fallback으로 대체한다.
+        diagram/prompt/tool은 2.1/2.2만 필요하므로 design이 2.2 Agent Components까지
+        생성한 시점의 스냅샷(design_core)으로 바로 시작한다. 2.3/2.4를 포함한 전체
+        설계(design)는 최종 조합에 사용된다.
+        weight는 전체 진행률에서 각 stage가 차지하는 비중 (설계가 critical path).
+        emit이 있으면(streaming spec 모드) 텍스트 섹션 stage의 출력을 생성 중에 스트리밍한다.
+        cache_key는 stage 결과에 영향을 주는 입력 전체 + 모델 프로파일 (stage_cache 키 재료).
+        """
+        design_inputs = {
+            "analysis": analysis,
+            "improvement_plans": improvement_plans,
+            "chat_history": chat_history,
+            "additional_context": additional_context,
+        }
+        return [
+            Stage(
+                "design", "2. 에이전트 설계 패턴",
+                streamed(
+                    lambda _, publish: self.design_agent.analyze(
+                        analysis, improvement_plans, chat_history, additional_context,
+                        on_core=lambda core: publish("design_core", core),
+                    ),
+                    self.design_agent.agent, "design", emit,
+                ),
+                provides=("design_core",), agent=self.design_agent.agent, weight=3.0,
+                cache_key=lambda _: {**design_inputs, "profile": get_profile("design")},
+            ),
+            Stage(
+                "diagram", "3. 다이어그램",
+                streamed(
+                    lambda r: self.diagram_agent.generate_diagrams(r["design_core"], analysis),
+                    self.diagram_agent.agent, "diagram", emit,
+                ),
+                inputs=("design_core",), fallback="", agent=self.diagram_agent.agent,
+                hedge=self._hedge(
+                    "diagram_agent", DiagramAgent,
+                    lambda sub, r: sub.generate_diagrams(r["design_core"], analysis),
+                ),
+                cache_key=lambda r: {
+                    "design_core": r["design_core"], "analysis": analysis,
+                    "profile": get_profile("diagram"),
+                },
+            ),
+            Stage(
+                "prompt", "4. 프롬프트",
+                streamed(
+                    lambda r: self.prompt_agent.generate_prompts(r["design_core"], analysis),
+                    self.prompt_agent.agent, "prompt", emit,
+                ),
+                inputs=("design_core",), fallback="", agent=self.prompt_agent.agent,
+                hedge=self._hedge(
+                    "prompt_agent", PromptAgent,
+                    lambda sub, r: sub.generate_prompts(r["design_core"], analysis),
+                ),
+                cache_key=lambda r: {
+                    "design_core": r["design_core"], "analysis": analysis,
+                    "profile": [get_profile("prompt_single"), get_profile("prompt_parallel")],
+                },
+            ),
+            Stage(
+                "tool", "5. 도구",
+                streamed(
+                    lambda r: self.tool_agent.generate_tools(r["design_core"], analysis),
+                    self.tool_agent.agent, "tool", emit,
+                ),
+                inputs=("design_core",), fallback="", agent=self.tool_agent.agent,
+                hedge=self._hedge(
+                    "tool_agent", ToolAgent,
+                    lambda sub, r: sub.generate_tools(r["design_core"], analysis),
+                ),
+                cache_key=lambda r: {
+                    "design_core": r["design_core"], "analysis": analysis,
+                    "profile": get_profile("tool"),
+                },
+            ),
+            # Tier 3: 선택된 DS별 데이터 통합 설계 JSON (선택 없으면 내부적으로 빈 bundle)
+            Stage(
+                "data_integration", "데이터 통합",
+                lambda _: self.data_integration_agent.generate(analysis, selected_data_sources),
+                fallback={"items": []}, agent=self.data_integration_agent.agent,
+                hedge=self._hedge(
+                    "data_integration_agent", DataIntegrationAgent,
+                    lambda sub, _: sub.generate(analysis, selected_data_sources),
+                ),
+                cache_key=lambda _: {
+                    "analysis": analysis, "selected_data_sources": selected_data_sources,
+                    "profile": get_profile("tool"),
+                },
+                # 내부 실패 시 빈 bundle로 fallback하므로 items가 있는 결과만 캐시
+                cache_if=lambda bundle: bool(bundle.get("items")),
+            ),
+        ]
+
+    def _attach_retry_usage(self, usage: Dict[str, Any], stage: str) -> None:
+        """다이어그램 수정 호출 usage를 별도 키(`diagramRetry`)로 표시 — 합계에는 이미 포함"""
+        if stage != "diagram":
+            return
+        retry_usage = getattr(self.diagram_agent, '_last_retry_usage', {}) or {}
+        if retry_usage.get("totalTokens", 0) > 0:
+            usage["diagramRetry"] = retry_usage
+
+    def _hedge(
+        self,
+        attr: str,
+        factory: Callable[[], Any],
+        call: Callable[[Any, Dict[str, Any]], Any],
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """hedge 실행 함수 — 새 서브에이전트 인스턴스로 같은 호출 (동시 실행 중인 원본과 상태 분리).
+
+        hedge가 끝까지 실행되면 usage를 원본 인스턴스의 _last_usage(/_last_retry_usage)에 합산한다
+        (진 쪽은 취소되어 usage를 남기지 않는다).
+        """
+        def run(upstream: Dict[str, Any]) -> Any:
+            sub = factory()
+            result = call(sub, upstream)
+            primary = getattr(self, attr)
+            for usage_attr in ('_last_usage', '_last_retry_usage'):
+                if hasattr(sub, usage_attr):
+                    setattr(primary, usage_attr, merge_usage(
+                        getattr(primary, usage_attr, {}) or {}, getattr(sub, usage_attr) or {}
+                    ))
+            return result
+        return run
 
     async def generate_spec_stream(
         self,
@@ -34,108 +256,114 @@ class MultiStageSpecAgent:
         chat_history: Optional[List[Dict[str, str]]] = None,
         additional_context: Optional[Dict[str, str]] = None,
         selected_data_sources: Optional[List[dict]] = None,
-    ) -> AsyncIterator[dict]:
-        """명세서 생성 - dict yield (AgentCore 엔트리포인트에서 SSE 변환)"""
+        stream_sections: bool = False,
+        use_cache: bool = True,
+        completed: Optional[Dict[str, Any]] = None,
+        on_stage_result: Optional[Callable[[str, Any], None]] = None,
+    ) -> AsyncIterator[events.Event]:
+        """명세서 생성 - 이벤트 yield (AgentCore 엔트리포인트에서 SSE 변환)
+
+        stream_sections=True면 섹션 2-5를 생성 중에 events.Section으로 스트리밍하고,
+        각 stage 완료 시 정리된 최종 섹션을 보낸다. 최종 조합 text 스트림은 동일.
+        use_cache=False면 stage 캐시를 조회하지 않는다 (결과는 저장).
+        completed({stage 이름: 결과})는 중단된 run의 checkpoint — 해당 stage는 실행하지
+        않고 결과를 그대로 입력으로 쓴다. on_stage_result는 stage(및 design_core) 완료
+        시 스레드에서 호출된다 (checkpoint 저장용).
+        """
+        completed = dict(completed or {})
+        if completed.get("design"):
+            completed.setdefault("design_core", completed["design"])
 
         try:
-            # 1단계: Agent 설계 패턴 (0-40%) - Section 2: Agent Design Pattern
-            yield {'progress': 0, 'stage': '2. 에이전트 설계 패턴 분석 시작'}
-            task = asyncio.create_task(asyncio.to_thread(
-                self.design_agent.analyze,
+            # 1-5단계: stage 의존성 그래프 (0-95%)
+            #   design ─(2.2 완료 시 design_core)─┬─ diagram / prompt / tool
+            #   data_integration (설계 결과 불필요 → t=0부터 design과 병렬)
+            stages = self._build_stages(
                 analysis,
                 improvement_plans,
                 chat_history,
-                additional_context
-            ))
-            progress = 5
-            while not task.done():
-                await asyncio.sleep(3)
-                if not task.done():
-                    progress = min(progress + 5, 35)
-                    yield {'progress': progress, 'stage': '2. 에이전트 설계 패턴 분석 중...'}
-            design_result = await task
-            yield {'progress': 40, 'stage': '2. 에이전트 설계 패턴 완료'}
-
-            # 2-3단계: 다이어그램 + 프롬프트 + 도구 병렬 실행 (40-95%)
-            yield {'progress': 40, 'stage': '3. 다이어그램 & 4. 프롬프트 & 5. 도구 병렬 생성 시작'}
-
-            diagram_task = asyncio.create_task(asyncio.to_thread(
-                self.diagram_agent.generate_diagrams, design_result, analysis
-            ))
-            prompt_task = asyncio.create_task(asyncio.to_thread(
-                self.prompt_agent.generate_prompts, design_result, analysis
-            ))
-            tool_task = asyncio.create_task(asyncio.to_thread(
-                self.tool_agent.generate_tools, design_result, analysis
-            ))
-            # Tier 3: 선택된 DS별 데이터 통합 설계 JSON (선택 없으면 내부적으로 빈 bundle)
-            integration_task = asyncio.create_task(asyncio.to_thread(
-                self.data_integration_agent.generate, analysis, selected_data_sources
-            ))
-
-            progress = 45
-            while (
-                not diagram_task.done() or not prompt_task.done()
-                or not tool_task.done() or not integration_task.done()
-            ):
-                await asyncio.sleep(3)
-                if (
-                    not diagram_task.done() or not prompt_task.done()
-                    or not tool_task.done() or not integration_task.done()
-                ):
-                    progress = min(progress + 5, 90)
-                    stages_status = []
-                    if not diagram_task.done():
-                        stages_status.append("다이어그램")
-                    if not prompt_task.done():
-                        stages_status.append("프롬프트")
-                    if not tool_task.done():
-                        stages_status.append("도구")
-                    if not integration_task.done():
-                        stages_status.append("데이터 통합")
-                    stage_text = " & ".join(stages_status) + " 생성 중..."
-                    yield {'progress': progress, 'stage': stage_text}
-
-            raw_results = await asyncio.gather(
-                diagram_task, prompt_task, tool_task, integration_task,
-                return_exceptions=True,
+                additional_context,
+                selected_data_sources,
+                emit=(lambda event: graph.emit(event)) if stream_sections else None,
             )
+            total_weight = sum(stage.weight for stage in stages)
+            done_weight = sum(stage.weight for stage in stages if stage.name in completed)
+            # 완료 stage마다 부분 spec_meta 전송 — 최종 spec_meta는 파싱 결과를 재사용
+            parsed_meta: Dict[str, Any] = {}
+            if completed:
+                yield events.Progress(
+                    0, f"이전 실행에서 이어서 생성 (완료: {', '.join(s.label for s in stages if s.name in completed)})"
+                )
+                if stream_sections:
+                    for name in SECTION_STAGES:
+                        if name in completed:
+                            section = final_section(name, completed[name])
+                            if section is not None:
+                                yield section
+                partial = _partial_spec_meta(completed, parsed_meta)
+                if partial is not None:
+                    yield partial
+            else:
+                yield events.Progress(0, '2. 에이전트 설계 패턴 & 데이터 통합 분석 시작')
+            graph = StageGraph(
+                [stage for stage in stages if stage.name not in completed],
+                progress_range=(2 + int(91 * done_weight / total_weight), 93),
+                cache=get_stage_cache(),
+                read_cache=use_cache,
+                given=completed,
+                hedger=get_hedger(),
+            )
+            self._graphs.append(graph)
+            async for event in graph.run():
+                stage_done = (
+                    isinstance(event, events.StageStatus)
+                    and event.status == "done"
+                    and event.stage in graph.results
+                )
+                # 완료 이벤트를 보내기 전에 checkpoint 저장 (전송 직후 끊겨도 재개 시 재실행 안 함)
+                if stage_done and on_stage_result is not None:
+                    await asyncio.to_thread(on_stage_result, event.stage, graph.results[event.stage])
+                yield event
+                if stage_done and stream_sections:
+                    section = final_section(event.stage, graph.results[event.stage])
+                    if section is not None:
+                        yield section
+                if stage_done:
+                    partial = _partial_spec_meta({event.stage: graph.results[event.stage]}, parsed_meta)
+                    if partial is not None:
+                        yield partial
 
-            # 부분 실패 처리: 실패한 서브에이전트는 빈 문자열/빈 dict로 대체, 실패 내역 알림
-            sub_names = ["DiagramAgent", "PromptAgent", "ToolAgent", "DataIntegrationAgent"]
-            sub_defaults: list = ["", "", "", {"items": []}]
-            resolved: list = []
-            failed_agents: list[str] = []
-            for i, r in enumerate(raw_results):
-                if isinstance(r, BaseException):
-                    error_detail = f"{type(r).__name__}: {str(r)[:200]}"
-                    logger.error(f"[{sub_names[i]}] 실패: {error_detail}", exc_info=r)
-                    failed_agents.append(f"{sub_names[i]}({error_detail})")
-                    resolved.append(sub_defaults[i])
-                else:
-                    resolved.append(r)
-            if failed_agents:
-                yield {'warning': f"일부 에이전트 실패: {', '.join(failed_agents)}"}
-
-            diagram_result, prompt_result, tool_result, data_integrations = resolved
-            yield {'progress': 95, 'stage': '3-5. 다이어그램 & 프롬프트 & 도구 & 데이터 통합 완료'}
-
-            # 구조화 메타데이터 이벤트 (시뮬레이션 탭 용)
+            # 부분 실패 처리: 실패한 서브에이전트는 fallback으로 대체, 실패 내역 알림
+            if graph.failures:
+                failed_agents = [
+                    f"{_AGENT_NAMES[name]}({type(err).__name__}: {str(err)[:200]})"
+                    for name, err in graph.failures.items()
+                ]
+                yield events.Warning(f"일부 에이전트 실패: {', '.join(failed_agents)}")
+
+            design_result = graph.results["design"]
+            diagram_result = graph.results["diagram"]
+            prompt_result = graph.results["prompt"]
+            tool_result = graph.results["tool"]
+            data_integrations = graph.results["data_integration"]
+            done_label = '2-5. 설계 & 다이어그램 & 프롬프트 & 도구 & 데이터 통합 완료'
+            if graph.cache_hits:
+                logger.info(f"[MultiStageSpecAgent] stage 캐시 hit: {graph.cache_hits}")
+                done_label += f" (재사용: {', '.join(s.label for s in graph.stages.values() if s.name in graph.cache_hits)})"
+            yield events.Progress(95, done_label)
+
+            # 구조화 메타데이터 이벤트 (시뮬레이션 탭 용) + 섹션 재생성용 stage 결과 보관
             # 파싱 실패해도 기존 마크다운 플로우엔 영향 없도록 try/except
             try:
-                spec_meta = {
-                    'design_summary': spec_parser.extract_design_summary(design_result),
-                    'diagrams': spec_parser.extract_mermaid_diagrams(diagram_result),
-                    'agent_prompts': spec_parser.extract_agent_prompts(prompt_result),
-                    'tools': spec_parser.extract_tools(tool_result),
-                    'data_integrations': data_integrations if isinstance(data_integrations, dict) else {"items": []},
-                }
-                yield {'spec_meta': spec_meta}
+                spec_id = await asyncio.to_thread(
+                    save_spec_outputs, {name: graph.results[name] for name in _OUTPUT_DEFAULTS}
+                )
+                yield events.SpecMeta(_build_spec_meta(graph.results, parsed_meta), spec_id)
             except Exception as meta_err:
                 logger.warning(f"spec_meta 파싱 실패 (무시): {meta_err}")
 
             # 4단계: 최종 조합 (95-100%, 스트리밍) - Section 1,6-8: Summary, Decomposition
-            yield {'progress': 95, 'stage': '1,6-8. 요약 및 최종 조합 시작'}
+            yield events.Progress(95, '1,6-8. 요약 및 최종 조합 시작')
             async for chunk_data in self.assembler_agent.assemble_stream(
                 analysis,
                 design_result,
@@ -161,15 +389,110 @@ class MultiStageSpecAgent:
                     ),
                     getattr(self.data_integration_agent, '_last_usage', {}) or {}
                 )
+                self._attach_retry_usage(total_usage, "diagram")
                 if total_usage.get("totalTokens", 0) > 0:
-                    yield {'usage': total_usage}
+                    yield events.Usage(total_usage)
             except Exception as e:
                 logger.warning(f"Usage 집계 실패: {e}")
 
             # 최종 100% 도달
-            yield {'progress': 100, 'stage': '완료'}
+            yield events.Progress(100, '완료')
 
         except Exception as e:
             error_detail = f"{type(e).__name__}: {str(e)[:200]}"
             logger.error(f"[MultiStageSpecAgent] 명세서 생성 오류: {error_detail}", exc_info=True)
-            yield {'error': f'명세서 생성 중 오류가 발생했습니다. ({error_detail})'}
+            yield events.Error(f'명세서 생성 중 오류가 발생했습니다. ({error_detail})')
+
+    async def regenerate_section_stream(
+        self,
+        stage: str,
+        analysis: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None,
+        spec_id: Optional[str] = None,
+        improvement_plans: Optional[Dict[str, str]] = None,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        additional_context: Optional[Dict[str, str]] = None,
+        selected_data_sources: Optional[List[dict]] = None,
+    ) -> AsyncIterator[events.Event]:
+        """섹션 단위 재생성 - stage 하나만 다시 실행 (서브에이전트 호출 1회)
+
+        이전 명세서의 stage 결과는 previous({stage 이름: 결과}, design_core 선택)로 직접
+        받거나, 전체 생성 시 spec_meta 이벤트로 받은 spec_id로 stage 캐시에서 조회한다.
+        다른 stage 결과는 그대로 upstream 입력으로 사용하며, design을 다시 생성해도
+        diagram/prompt/tool은 갱신하지 않는다.
+        조합 단계는 LLM 없는 문자열 조합이므로 전체 문서 대신 바뀐 섹션(final)과
+        갱신된 spec_meta만 보내고, 클라이언트가 기존 문서의 해당 섹션을 교체한다.
+        stage 캐시는 조회하지 않는다 (새 결과는 저장).
+        """
+        label = stage
+        try:
+            if stage not in SECTION_STAGES:
+                yield events.Error(f"재생성할 수 없는 stage입니다: {stage}")
+                return
+            if not previous and spec_id:
+                previous = await asyncio.to_thread(load_spec_outputs, spec_id)
+            if not previous:
+                yield events.Error("이전 명세서 결과를 찾을 수 없습니다. 전체 명세서를 다시 생성해 주세요.")
+                return
+
+            stages = {
+                s.name: s
+                for s in self._build_stages(
+                    analysis,
+                    improvement_plans,
+                    chat_history,
+                    additional_context,
+                    selected_data_sources,
+                    emit=lambda event: graph.emit(event),
+                )
+            }
+            target = stages[stage]
+            label = target.label
+            outputs = {name: previous.get(name) or default for name, default in _OUTPUT_DEFAULTS.items()}
+            outputs["design_core"] = outputs["design_core"] or outputs["design"]
+            missing = [dep for dep in target.inputs if not outputs.get(dep)]
+            if missing:
+                yield events.Error(f"이전 명세서 결과에 {', '.join(missing)}가 없어 {label} 섹션을 다시 생성할 수 없습니다.")
+                return
+
+            yield events.Progress(0, f'{label} 재생성 시작')
+            graph = StageGraph(
+                [target],
+                progress_range=(5, 90),
+                cache=get_stage_cache(),
+                read_cache=False,
+                given={dep: outputs[dep] for dep in target.inputs},
+                hedger=get_hedger(),
+            )
+            self._graphs.append(graph)
+            async for event in graph.run():
+                yield event
+
+            if stage in graph.failures:
+                err = graph.failures[stage]
+                yield events.Error(
+                    f'{label} 재생성 중 오류가 발생했습니다. ({type(err).__name__}: {str(err)[:200]})'
+                )
+                return
+
+            outputs.update({name: graph.results[name] for name in (stage, *target.provides)})
+            yield final_section(stage, outputs[stage])
+
+            yield events.Progress(95, f'{label} 재생성 완료')
+            try:
+                spec_id = await asyncio.to_thread(save_spec_outputs, outputs)
+                yield events.SpecMeta(_build_spec_meta(outputs), spec_id)
+            except Exception as meta_err:
+                logger.warning(f"spec_meta 파싱 실패 (무시): {meta_err}")
+
+            usage = dict(getattr(getattr(self, f"{stage}_agent"), '_last_usage', {}) or {})
+            self._attach_retry_usage(usage, stage)
+            if usage.get("totalTokens", 0) > 0:
+                yield events.Usage(usage)
+
+            yield events.Progress(100, '완료')
+
+        except Exception as e:
+            error_detail = f"{type(e).__name__}: {str(e)[:200]}"
+            logger.error(f"[MultiStageSpecAgent] {label} 재생성 오류: {error_detail}", exc_info=True)
+            yield events.Error(f'{label} 재생성 중 오류가 발생했습니다. ({error_detail})')
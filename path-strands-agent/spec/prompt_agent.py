@@ -1,13 +1,16 @@
 """3a단계: Agent Prompt 설계 — 3개 이상 에이전트 시 병렬 분할(Scatter-Gather)"""
 
+import contextvars
 import logging
 import re
 from typing import Dict, Any, Optional, List
 
-from agent_config import get_profile
-from strands_utils import strands_utils, load_skill_content
+import cancellation
+from agent_config import PROMPT_PARALLEL_MAX_WORKERS, get_profile
+from strands_utils import strands_utils, preload_skill_content
 from token_tracker import extract_usage, merge_usage
 from spec._helpers import extract_final_text, build_analysis_context, parse_agent_names, clean_internal_comments
+from spec.section_stream import progress_handler
 
 logger = logging.getLogger(__name__)
 
@@ -48,9 +51,7 @@ class PromptAgent:
 
     def __init__(self):
         # 스킬 + reference 사전 주입 → tool call 완전 제거
-        skill_content = load_skill_content(
-            "prompt-engineering", ["role-templates.md"]
-        )
+        skill_content = preload_skill_content("prompt")
         self._enhanced_prompt = (
             _PROMPT_AGENT_SYSTEM
             + "\n\n## 참조 스킬 및 레퍼런스 (사전 로드됨 — 도구 호출 불필요)\n"
@@ -70,13 +71,17 @@ class PromptAgent:
     def _create_per_agent_instance(self):
         """병렬 호출용 Agent 인스턴스 생성"""
         cfg = get_profile("prompt_parallel")
-        return strands_utils.get_agent(
+        agent = strands_utils.get_agent(
             system_prompts=self._enhanced_prompt,
             model_id=cfg["model_id"],
             max_tokens=cfg["max_tokens"],
             temperature=cfg.get("temperature"),
             tools=[]
         )
+        # 진행률 측정용 OutputMeter만 공유 — 섹션 스트리밍 중이면 SectionStreamer는 벗긴다
+        # (병렬 워커의 delta가 한 섹션에 섞이지 않도록, 섹션은 조합 후 최종 섹션으로 전송)
+        agent.callback_handler = progress_handler(self.agent.callback_handler)
+        return agent
 
     @staticmethod
     def _compact_design_context(agent_name: str, design_result: str) -> str:
@@ -173,6 +178,7 @@ class PromptAgent:
     def _generate_single_agent_prompt(self, agent_name: str, agent_index: int,
                                       design_result: str, context_section: str) -> tuple:
         """1개 에이전트의 프롬프트를 생성 (스레드에서 실행)"""
+        cancellation.check()  # 대기 중 요청이 취소됐으면 인스턴스 생성·호출 생략
         agent = self._create_per_agent_instance()
         prompt = self._build_single_agent_prompt(agent_name, agent_index, design_result, context_section)
         result = agent(prompt)
@@ -192,21 +198,30 @@ class PromptAgent:
 
         logger.info(f"PromptAgent 병렬 모드: {len(agent_names)}개 에이전트 ({', '.join(agent_names)})")
 
-        with ThreadPoolExecutor(max_workers=min(len(agent_names), 6)) as executor:
+        with ThreadPoolExecutor(max_workers=min(len(agent_names), PROMPT_PARALLEL_MAX_WORKERS)) as executor:
             future_to_index = {}
             for i, name in enumerate(agent_names):
+                # 워커는 contextvars를 복사하지 않으므로 요청의 CancelToken을 함께 전달
                 future = executor.submit(
+                    contextvars.copy_context().run,
                     self._generate_single_agent_prompt,
                     name, i + 1, design_result, context_section
                 )
                 future_to_index[future] = i
 
-            for future in as_completed(future_to_index):
-                idx = future_to_index[future]
-                text, usage = future.result()
-                results[idx] = text
-                usages.append(usage)
-                logger.info(f"PromptAgent 병렬: {agent_names[idx]} 완료 ({idx + 1}/{len(agent_names)})")
+            try:
+                for future in as_completed(future_to_index):
+                    idx = future_to_index[future]
+                    text, usage = future.result()
+                    results[idx] = text
+                    usages.append(usage)
+                    logger.info(f"PromptAgent 병렬: {agent_names[idx]} 완료 ({idx + 1}/{len(agent_names)})")
+            except BaseException as e:
+                # 하나라도 실패/취소되면 아직 시작하지 않은 워커는 실행하지 않음
+                skipped = sum(1 for future in future_to_index if future.cancel())
+                if isinstance(e, cancellation.Cancelled) and skipped:
+                    cancellation.cancellation_stats.record_skipped(skipped)
+                raise
 
         # Gather: ## 4. 헤딩 + 에이전트별 결과 조합
         assembled = "## 4. Agent Prompts\n\n"
@@ -269,6 +284,8 @@ class PromptAgent:
             logger.info(f"PromptAgent: {len(agent_names)}개 에이전트 감지 → 병렬 모드")
             try:
                 return self._generate_prompts_parallel(agent_names, design_result, analysis)
+            except cancellation.Cancelled:
+                raise
             except Exception as e:
                 logger.warning(f"PromptAgent 병렬 실패, 단일 호출로 fallback: {e}")
                 return self._generate_prompts_single(design_result, analysis)
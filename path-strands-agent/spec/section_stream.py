@@ -0,0 +1,132 @@
+"""명세서 섹션 스트리밍 — 서브에이전트 출력을 생성 중에 섹션 id 단위로 전달.
+
+streaming spec 모드(payload `stream_sections: true`)에서만 사용한다.
+서브에이전트는 스레드에서 동기 호출되므로, callback_handler 체인으로 스트리밍 delta를
+받아 정리된 라인만 events.Section(id, text)으로 내보낸다.
+
+- 첫 `## ` 헤딩 전 텍스트(스킬 로드 등 메타 코멘트), tool_call/tool_result 블록,
+  메타 코멘터리 라인은 제외 — clean_internal_comments와 같은 규칙을 라인 단위로 적용
+- 완성된 라인 단위로 전송 (토큰 delta마다 이벤트를 만들지 않음)
+- 병렬 워커(PromptAgent/DiagramAgent의 호출별 인스턴스)에는 streamer를 붙이지 않는다
+  (progress_handler) — 스레드별 delta가 한 섹션에 섞이지 않도록 최종 섹션만 보낸다.
+- stage 완료 시 clean_internal_comments를 거친 최종 텍스트를 final=True로 한 번 더 보낸다.
+  클라이언트는 final 섹션으로 스트리밍 누적분을 교체한다 (tool 재호출 등으로 생긴
+  중복·잔재 보정).
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import events
+from spec._helpers import clean_internal_comments, is_meta_line
+from spec.assembler import render_data_integrations_md
+
+# stage 이름 → 섹션 id (최종 문서 순서)
+SECTION_IDS: Dict[str, str] = {
+    "design": "design",
+    "diagram": "diagram",
+    "prompt": "prompt",
+    "tool": "tool",
+    "data_integration": "data_integration",
+}
+
+_HEADING_RE = re.compile(r'^##\s+')
+_TOOL_BLOCK_OPEN_RE = re.compile(r'<(tool_call|tool_result)>')
+_TOOL_BLOCK_CLOSE_RE = re.compile(r'</(tool_call|tool_result)>')
+
+
+class SectionStreamer:
+    """callback_handler 체인 — 스트리밍 delta를 정리된 라인 단위 Section 이벤트로 변환"""
+
+    def __init__(
+        self,
+        inner: Optional[Callable[..., Any]],
+        section_id: str,
+        emit: Callable[[events.Event], None],
+    ):
+        self._inner = inner
+        self._section_id = section_id
+        self._emit = emit
+        self._partial = ""
+        self._started = False
+        self._in_tool_block = False
+
+    def __call__(self, **kwargs):
+        if self._inner is not None:
+            self._inner(**kwargs)
+        data = kwargs.get("data")
+        if not isinstance(data, str) or not data:
+            return
+        self._partial += data
+        if "\n" not in data:
+            return
+        *lines, self._partial = self._partial.split("\n")
+        kept = [line for line in lines if self._keep(line)]
+        if kept:
+            self._emit(events.Section(self._section_id, "\n".join(kept) + "\n"))
+
+    def _keep(self, line: str) -> bool:
+        if self._in_tool_block:
+            if _TOOL_BLOCK_CLOSE_RE.search(line):
+                self._in_tool_block = False
+            return False
+        if _TOOL_BLOCK_OPEN_RE.search(line):
+            self._in_tool_block = not _TOOL_BLOCK_CLOSE_RE.search(line)
+            return False
+        if not self._started:
+            if not _HEADING_RE.match(line):
+                return False
+            self._started = True
+        return not is_meta_line(line)
+
+
+@contextmanager
+def streaming(agent: Any, section_id: str, emit: Callable[[events.Event], None]) -> Iterator[None]:
+    """with 블록 동안 agent 출력을 섹션 스트리밍 (기존 callback_handler는 유지)"""
+    inner = agent.callback_handler
+    agent.callback_handler = SectionStreamer(inner, section_id, emit)
+    try:
+        yield
+    finally:
+        agent.callback_handler = inner
+
+
+def progress_handler(handler: Optional[Callable[..., Any]]) -> Optional[Callable[..., Any]]:
+    """SectionStreamer를 벗긴 callback_handler — 병렬 워커 인스턴스용.
+
+    여러 스레드의 delta가 한 streamer에 섞이면 섹션 텍스트가 뒤엉키므로, 워커는 진행률
+    OutputMeter만 공유하고 섹션은 stage 완료 후 조합된 최종 섹션(final_section)으로만 보낸다.
+    """
+    while isinstance(handler, SectionStreamer):
+        handler = handler._inner
+    return handler
+
+
+def streamed(
+    run: Callable[..., Any],
+    agent: Any,
+    stage: str,
+    emit: Optional[Callable[[events.Event], None]],
+) -> Callable[..., Any]:
+    """Stage.run 래퍼 — emit이 없으면(일반 모드) run을 그대로 반환"""
+    if emit is None:
+        return run
+
+    def wrapped(*args):
+        with streaming(agent, SECTION_IDS[stage], emit):
+            return run(*args)
+
+    return wrapped
+
+
+def final_section(stage: str, result: Any) -> Optional[events.Section]:
+    """stage 결과 → 최종 섹션 이벤트 (섹션이 없는 stage면 None)"""
+    section_id = SECTION_IDS.get(stage)
+    if section_id is None:
+        return None
+    if stage == "data_integration":
+        text = render_data_integrations_md(result if isinstance(result, dict) else None)
+    else:
+        text = clean_internal_comments(result or "")
+    return events.Section(section_id, text, final=True)
@@ -1,20 +1,22 @@
 """서브 에이전트 결과 마크다운을 구조화 데이터로 파싱.
 
-결정적 regex 기반 파서. 실패하면 빈 값 또는 원본 유지로 graceful degrade.
+결정적 regex 기반 파서 (mermaid 블록은 spec.mermaid_ast 공유 AST). 실패하면 빈 값 또는 원본 유지로 graceful degrade.
 orchestrator에서 spec_meta SSE 이벤트로 프론트에 전달하기 위한 모듈.
 """
 
 import re
 from typing import Dict, Any, List, Optional
 
+from spec import mermaid_ast
 from spec._helpers import parse_agent_names
 
 
 def extract_mermaid_diagrams(md: str) -> List[Dict[str, Any]]:
     """마크다운에서 mermaid 코드블록과 직전 헤딩(###)을 추출.
 
-    각 블록에 대해 flowchart/graph는 노드·엣지를 1차 파싱. sequenceDiagram은 파싱하지
-    않고 원본만 보관한다. 파싱 실패 시 parsed_nodes=[]/parsed_edges=[]로 둔다.
+    각 블록을 mermaid_ast로 파싱한다 (MermaidValidator 검증 때 만든 AST가 캐시에 있으면 재사용).
+    flowchart/graph는 노드·엣지, sequenceDiagram은 participant를 노드로, 메시지를
+    엣지(label=메시지 텍스트)로 담는다. 파싱 실패 시 parsed_nodes=[]/parsed_edges=[]로 둔다.
     """
     results: List[Dict[str, Any]] = []
     pattern = re.compile(r"```mermaid\s*\n(.*?)```", re.DOTALL)
@@ -22,12 +24,12 @@ def extract_mermaid_diagrams(md: str) -> List[Dict[str, Any]]:
         source = match.group(1).strip()
         start = match.start()
         title = _find_preceding_heading(md, start)
-        kind = _detect_mermaid_kind(source)
+        kind = mermaid_ast.detect_kind(source.split("\n", 1)[0])
         nodes: List[Dict[str, str]] = []
         edges: List[Dict[str, str]] = []
-        if kind in ("flowchart", "graph"):
+        if kind != "unknown":
             try:
-                nodes, edges = _parse_flowchart(source)
+                nodes, edges = _diagram_nodes_edges(mermaid_ast.parse(match.group(1)))
             except Exception:
                 nodes, edges = [], []
         results.append({
@@ -129,80 +131,22 @@ def _find_preceding_heading(md: str, before_offset: int) -> str:
     return matches[-1].group(1).strip()
 
 
-def _detect_mermaid_kind(source: str) -> str:
-    first = source.lstrip().split("\n", 1)[0].strip().lower()
-    if first.startswith("flowchart"):
-        return "flowchart"
-    if first.startswith("graph"):
-        return "graph"
-    if first.startswith("sequencediagram"):
-        return "sequenceDiagram"
-    return "unknown"
-
-
-def _parse_flowchart(source: str) -> tuple[List[Dict[str, str]], List[Dict[str, str]]]:
-    """flowchart/graph 블록에서 노드와 엣지를 파싱.
-
-    지원 엣지: `-->`, `---`, `-.->`, `==>`, `--|label|-->`, `-->|label|`.
-    """
-    nodes: Dict[str, Dict[str, str]] = {}
-    edges: List[Dict[str, str]] = []
-
-    # 첫 줄(방향 선언) 제외
-    lines = source.strip().split("\n")[1:]
-
-    # 노드 참조: id 또는 id[label]/id(label)/id{label}/id((label))/... (id만 캡처)
-    node_ref_re = (
-        r"([A-Za-z_][\w]*)"
-        r"(?:\[\[[^\]]+\]\]|\[/[^/]+/\]|\[\\[^\\]+\\\]|\(\([^)]+\)\)|\{\{[^}]+\}\}|\[[^\]]+\]|\([^)]+\)|\{[^}]+\}|>[^\]]+\])?"
-    )
-    node_decl_re = re.compile(
-        r"(?P<id>[A-Za-z_][\w]*)"
-        r"(?:"
-        r"\[\[(?P<l1>[^\]]+)\]\]"
-        r"|\[/(?P<l2>[^/]+)/\]"
-        r"|\[\\(?P<l3>[^\\]+)\\\]"
-        r"|\(\((?P<l4>[^)]+)\)\)"
-        r"|\{\{(?P<l5>[^}]+)\}\}"
-        r"|\[(?P<l6>[^\]]+)\]"
-        r"|\((?P<l7>[^)]+)\)"
-        r"|\{(?P<l8>[^}]+)\}"
-        r")"
-    )
-
-    for raw in lines:
-        line = raw.strip()
-        if not line or line.startswith("%%") or line.startswith("subgraph") or line == "end":
-            continue
-        if line.startswith("classDef") or line.startswith("class ") or line.startswith("linkStyle") or line.startswith("style "):
-            continue
-
-        # 노드 선언 추출
-        for m in node_decl_re.finditer(line):
-            node_id = m.group("id")
-            label = next((m.group(g) for g in ("l1", "l2", "l3", "l4", "l5", "l6", "l7", "l8") if m.group(g)), node_id)
-            label = label.strip().strip('"')
-            if node_id not in nodes or nodes[node_id]["label"] == node_id:
-                nodes[node_id] = {"id": node_id, "label": label}
-
-        # 엣지 추출 — 노드가 괄호 라벨을 동반해도 매칭 가능
-        edge_re = re.compile(
-            rf"{node_ref_re}\s*"
-            r"(?:-{2,3}>|-{2,3}|-\.->|={2,3}>)"
-            r"(?:\s*\|([^|]*)\|)?"
-            rf"\s*{node_ref_re}"
-        )
-        for em in edge_re.finditer(line):
-            src = em.group(1)
-            label = (em.group(2) or "").strip()
-            dst = em.group(3)
-            # 노드 참조만으로 등장한 id는 id=label로 등록
-            for nid in (src, dst):
-                if nid not in nodes:
-                    nodes[nid] = {"id": nid, "label": nid}
-            edges.append({"source": src, "target": dst, "label": label})
-
-    return list(nodes.values()), edges
+def _diagram_nodes_edges(
+    diagram: mermaid_ast.Diagram,
+) -> tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """AST → parsed_nodes/parsed_edges (sequenceDiagram: participant/메시지)."""
+    nodes = [{"id": node.id, "label": node.label} for node in diagram.nodes.values()]
+    if diagram.kind == "sequenceDiagram":
+        edges = [
+            {"source": msg.source, "target": msg.target, "label": msg.text}
+            for msg in diagram.messages
+        ]
+    else:
+        edges = [
+            {"source": edge.source, "target": edge.target, "label": edge.label}
+            for edge in diagram.edges
+        ]
+    return nodes, edges
 
 
 def _extract_labeled_codeblock(section: str, label_regex: str) -> Optional[str]:
@@ -0,0 +1,102 @@
+"""명세서 run 기록/재개 — event_id 부여 + checkpoint 저장, 재연결 시 replay.
+
+엔트리포인트가 spec 요청을 run으로 감싼다:
+  새 요청   -> run_id 발급, events.SpecRun 전송 후 orchestrator 이벤트를 기록하며 전송
+  재연결    -> (run_id, last_event_id) — 기록된 이벤트를 replay하고, 완료되지 않은 run이면
+               checkpoint에서 완료 stage를 복원해 남은 stage부터 이어서 실행
+
+event_id는 text 병합(sse_coalescer) 이후의 프레임 단위로 매기므로 replay 결과가
+처음 전송한 프레임과 같다. 이벤트는 _FLUSH_EVENTS개 또는 _FLUSH_SECONDS마다 묶어서
+기록한다 (stage 결과는 완료 즉시 저장되므로 이벤트 기록이 조금 늦어도 재개 지점은 같다).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import events
+from spec.checkpoint_store import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    CheckpointStore,
+    SequencedEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+_FLUSH_EVENTS = 32
+_FLUSH_SECONDS = 0.5
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+class RunCheckpoint:
+    """orchestrator에 넘기는 run 핸들 — 복원된 stage 결과 + 완료 stage 저장"""
+
+    def __init__(self, store: CheckpointStore, run_id: str, completed: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self.run_id = run_id
+        self.completed: Dict[str, Any] = completed or {}
+
+    def save(self, name: str, value: Any) -> None:
+        """stage 완료 시 호출 (스레드에서 실행) — 저장 실패는 run을 중단시키지 않는다"""
+        try:
+            self.store.save_stage(self.run_id, name, value)
+        except Exception as e:
+            logger.warning(f"[SPEC RUN] {self.run_id[:8]} stage '{name}' checkpoint 실패: {e}")
+
+
+def _append(store: CheckpointStore, run_id: str, batch: List[SequencedEvent]) -> None:
+    """이벤트 기록 실패는 스트림을 중단시키지 않는다 (재연결 replay만 불완전해짐)"""
+    try:
+        store.append_events(run_id, batch)
+    except Exception as e:
+        logger.warning(f"[SPEC RUN] {run_id[:8]} 이벤트 기록 실패: {e}")
+
+
+async def replay(store: CheckpointStore, run_id: str, after: int = 0) -> AsyncIterator[events.Sequenced]:
+    """기록된 이벤트 중 after 이후를 순서대로 yield"""
+    for event_id, wire in await asyncio.to_thread(store.events_after, run_id, after):
+        yield events.Sequenced(wire, event_id)
+
+
+async def record(
+    store: CheckpointStore,
+    run_id: str,
+    source: AsyncIterator[Any],
+    start_id: int = 0,
+) -> AsyncIterator[events.Sequenced]:
+    """source 이벤트에 event_id를 붙여 기록하며 yield.
+
+    정상 종료 시 run 상태를 done(오류 이벤트가 있었으면 failed)으로 바꾼다.
+    소비 측 이탈/예외로 끝나면 running으로 남겨 재연결 시 이어서 실행한다.
+    """
+    event_id = start_id
+    pending: List[SequencedEvent] = []
+    flushed_at = time.monotonic()
+    failed = False
+    completed = False
+    try:
+        async for event in source:
+            event_id += 1
+            wire = events.to_wire(event)
+            failed = failed or "error" in wire
+            pending.append((event_id, wire))
+            if len(pending) >= _FLUSH_EVENTS or time.monotonic() - flushed_at >= _FLUSH_SECONDS:
+                batch, pending = pending, []
+                flushed_at = time.monotonic()
+                await asyncio.to_thread(_append, store, run_id, batch)
+            yield events.Sequenced(wire, event_id)
+        completed = True
+    finally:
+        # 취소/aclose 중에는 await할 수 없으므로 남은 이벤트와 상태는 동기 기록 (소량)
+        _append(store, run_id, pending)
+        if completed:
+            try:
+                store.set_status(run_id, STATUS_FAILED if failed else STATUS_DONE)
+            except Exception as e:
+                logger.warning(f"[SPEC RUN] {run_id[:8]} 상태 기록 실패: {e}")
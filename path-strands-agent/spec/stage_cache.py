@@ -0,0 +1,246 @@
+"""명세서 stage 결과 캐시 (content-addressed).
+
+작은 변경(채팅 메시지 추가, 개선 방안 수정 등) 후 재생성할 때 입력이 바이트 단위로
+같은 stage는 다시 실행하지 않는다. 키는 stage 이름 + 정확한 입력 + 모델 프로파일 +
+코드/스킬 fingerprint의 sha256이므로, 프롬프트·스킬이 바뀐 배포에서는 자동으로 무효화된다.
+
+값은 JSON 직렬화 가능한 dict ({"result": ..., "provides": {...}}).
+완료된 명세서의 stage 결과 전체도 spec_id로 보관해 spec_section(섹션 단위 재생성)이
+이전 결과를 다시 받지 않고 참조할 수 있게 한다. 명세서 결과는 stage 결과 여러 개를 합친
+큰 항목이므로 stage 캐시와 별도 크기의 LRU에 두어 서로 밀어내지 않는다 (디스크 store는 공유).
+
+Backend 선택 (환경변수):
+  SPEC_STAGE_CACHE          -> "memory" (기본) | "sqlite" (메모리 LRU + 디스크) | "none"
+  SPEC_STAGE_CACHE_SIZE     -> 메모리 LRU 최대 항목 수 (기본 128)
+  SPEC_OUTPUTS_CACHE_SIZE   -> spec_id별 명세서 결과 메모리 LRU 최대 항목 수 (기본 32)
+  SPEC_STAGE_CACHE_DB       -> SQLite 파일 경로 (기본: /tmp/path-spec-stage-cache.db)
+  SPEC_STAGE_CACHE_TTL_DAYS -> 디스크 항목 보존 기간 (기본 7일)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+_DEFAULT_DB_PATH = "/tmp/path-spec-stage-cache.db"
+_DEFAULT_MAX_ENTRIES = 128
+_DEFAULT_OUTPUTS_MAX_ENTRIES = 32
+_DEFAULT_TTL_DAYS = 7
+_PURGE_EVERY_N_SAVES = 50
+
+_ROOT = Path(__file__).resolve().parent.parent
+_fingerprint: Optional[str] = None
+_fingerprint_lock = threading.Lock()
+
+
+def code_fingerprint() -> str:
+    """spec 패키지 소스 + skills 파일 내용 해시 (최초 1회 계산)"""
+    global _fingerprint
+    if _fingerprint is None:
+        with _fingerprint_lock:
+            if _fingerprint is None:
+                digest = hashlib.sha256()
+                files = sorted(_ROOT.joinpath("spec").glob("*.py"))
+                files += sorted(p for p in _ROOT.joinpath("skills").rglob("*") if p.is_file())
+                for path in files:
+                    digest.update(str(path.relative_to(_ROOT)).encode("utf-8"))
+                    digest.update(path.read_bytes())
+                _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+
+def stage_key(stage: str, material: Any) -> str:
+    """stage 입력(+프로파일)의 canonical JSON sha256"""
+    canonical = json.dumps(
+        {"v": CACHE_VERSION, "code": code_fingerprint(), "stage": stage, "inputs": material},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _SQLiteStageStore:
+    """디스크 backend — 컨테이너 재시작 후에도 유지"""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spec_stage_cache ("
+            " cache_key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def load(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at FROM spec_stage_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self._ttl:
+            return None
+        return row[0]
+
+    def save(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO spec_stage_cache (cache_key, value, updated_at)"
+                " VALUES (?, ?, ?)",
+                (key, payload, now),
+            )
+            self._saves += 1
+            if self._saves % _PURGE_EVERY_N_SAVES == 0:
+                self._conn.execute(
+                    "DELETE FROM spec_stage_cache WHERE updated_at < ?", (now - self._ttl,)
+                )
+
+
+class StageCache:
+    """메모리 LRU (+ 선택적 디스크 store) — stage 스레드에서 호출되므로 thread-safe"""
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, store: Optional[_SQLiteStageStore] = None):
+        self._max_entries = max(max_entries, 0)
+        self._store = store
+        self._lock = threading.Lock()
+        # 직렬화된 문자열로 보관 — 호출자가 결과를 수정해도 캐시가 오염되지 않도록
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+        if payload is None and self._store is not None:
+            try:
+                payload = self._store.load(key)
+            except sqlite3.Error as e:
+                logger.warning(f"[STAGE CACHE] 디스크 조회 실패: {e}")
+            if payload is not None:
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, payload)
+        if payload is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        return json.loads(payload)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[STAGE CACHE] 직렬화 실패 (저장 생략): {e}")
+            return
+        with self._lock:
+            self._counters["stores"] += 1
+            self._remember(key, payload)
+        if self._store is not None:
+            try:
+                self._store.save(key, payload)
+            except sqlite3.Error as e:
+                logger.warning(f"[STAGE CACHE] 디스크 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "disk": self._store is not None,
+            }
+
+    def _remember(self, key: str, payload: str) -> None:
+        """lock 보유 상태에서 호출"""
+        if self._max_entries == 0:
+            return
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+
+_cache: Optional[StageCache] = None
+_outputs_cache: Optional[StageCache] = None
+_cache_created = False
+_cache_lock = threading.Lock()
+
+
+def _create_caches_from_env() -> Tuple[Optional[StageCache], Optional[StageCache]]:
+    """(stage 캐시, 명세서 결과 캐시) — 디스크 store는 하나를 공유 (키 prefix로 구분)"""
+    backend = os.environ.get("SPEC_STAGE_CACHE", "memory").lower()
+    if backend == "none":
+        return None, None
+    max_entries = int(os.environ.get("SPEC_STAGE_CACHE_SIZE", _DEFAULT_MAX_ENTRIES))
+    outputs_max_entries = int(os.environ.get("SPEC_OUTPUTS_CACHE_SIZE", _DEFAULT_OUTPUTS_MAX_ENTRIES))
+    store = None
+    if backend == "sqlite":
+        path = os.environ.get("SPEC_STAGE_CACHE_DB", _DEFAULT_DB_PATH)
+        ttl = float(os.environ.get("SPEC_STAGE_CACHE_TTL_DAYS", _DEFAULT_TTL_DAYS)) * 86400
+        try:
+            store = _SQLiteStageStore(path, ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"[STAGE CACHE] SQLite 초기화 실패, 메모리 캐시만 사용: {e}")
+    return StageCache(max_entries, store), StageCache(outputs_max_entries, store)
+
+
+def _ensure_caches() -> None:
+    global _cache, _outputs_cache, _cache_created
+    if not _cache_created:
+        with _cache_lock:
+            if not _cache_created:
+                _cache, _outputs_cache = _create_caches_from_env()
+                _cache_created = True
+
+
+def get_stage_cache() -> Optional[StageCache]:
+    """프로세스 전역 stage 캐시 (SPEC_STAGE_CACHE=none이면 None)"""
+    _ensure_caches()
+    return _cache
+
+
+def get_spec_outputs_cache() -> Optional[StageCache]:
+    """프로세스 전역 명세서 결과(spec_id) 캐시 (SPEC_STAGE_CACHE=none이면 None)"""
+    _ensure_caches()
+    return _outputs_cache
+
+
+def _outputs_key(spec_id: str) -> str:
+    return f"spec:{spec_id}"
+
+
+def save_spec_outputs(outputs: Dict[str, Any]) -> Optional[str]:
+    """명세서 stage 결과 전체 저장 → spec_id (캐시 비활성화 시 None)"""
+    cache = get_spec_outputs_cache()
+    if cache is None:
+        return None
+    spec_id = uuid.uuid4().hex
+    cache.put(_outputs_key(spec_id), outputs)
+    return spec_id
+
+
+def load_spec_outputs(spec_id: str) -> Optional[Dict[str, Any]]:
+    """spec_id로 저장된 stage 결과 조회 (만료/다른 컨테이너면 None)"""
+    cache = get_spec_outputs_cache()
+    if cache is None:
+        return None
+    return cache.get(_outputs_key(spec_id))
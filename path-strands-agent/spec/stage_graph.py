@@ -0,0 +1,325 @@
+"""명세서 stage 의존성 그래프 실행기.
+
+각 stage는 필요한 upstream stage(inputs)를 선언하고, 입력이 모두 준비되는 즉시
+asyncio.to_thread로 시작한다. 고정 barrier(설계 → 나머지 일괄) 대신 그래프로
+스케줄링하므로 설계 결과를 읽지 않는 DataIntegrationAgent는 t=0부터 설계와 병렬
+실행되고, 새 stage(검증 단계 등)는 orchestrator의 대기 루프 수정 없이 추가할 수 있다.
+
+- 중간 결과(provides): stage는 실행 도중 publish(name, value)로 중간 결과를 먼저
+  공개할 수 있고, 이를 inputs로 선언한 downstream은 stage 완료를 기다리지 않고 시작한다
+  (예: design이 2.2 Agent Components까지 생성되면 design_core 공개).
+  완료 시까지 공개하지 않은 provides는 stage 최종 결과로 채운다.
+
+- 실패 처리: fallback이 있는 stage는 대체값으로 결과를 채우고 downstream을 계속 실행,
+  fallback이 없는(필수) stage가 실패하면 그래프 전체를 중단하고 예외를 전파한다.
+  to_thread 스레드는 취소할 수 없으므로 실행 중인 stage가 끝날 때까지 기다린 뒤
+  전파한다 (풀 반납된 인스턴스를 백그라운드 스레드가 계속 쓰지 않도록).
+- 캐시: cache와 stage.cache_key가 있으면 입력(cache_key(upstream))의 해시로 결과를
+  조회해 hit이면 실행하지 않는다 (StageStatus cached=True, self.cache_hits에 기록).
+  cache_if(result)가 참인 결과만 저장한다 (fallback성 빈 결과 제외).
+- 진행 이벤트: stage 시작/완료/실패마다 events.StageStatus, stage 완료 즉시 또는
+  heartbeat마다 전체 가중 진행률 events.Progress(progress_range 구간)를 yield한다.
+  stage 스레드는 emit(event)로 임의 이벤트(섹션 스트리밍 등)를 끼워 넣을 수 있다.
+- given: 그래프 밖에서 이미 준비된 입력. stage 일부만 다시 실행할 때 upstream 결과를
+  넘기면 해당 입력은 준비된 것으로 취급한다 (results에도 포함).
+- hedging: hedger(spec/hedging.py)가 있으면 stage.hedge가 선언된 stage는 지연 기준을
+  넘길 때 hedge(upstream)로 한 번 더 실행해 먼저 끝난 결과를 쓴다. hedge가 이긴 뒤에도
+  실행 중인 원본 시도(stage.agent 등 원본 인스턴스를 사용)는 self.abandoned에 남긴다.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import events
+from progress import HEARTBEAT_SECONDS, OutputMeter, StageTracker, scale
+from spec.hedging import Hedger
+from spec.stage_cache import StageCache, stage_key
+
+logger = logging.getLogger(__name__)
+
+_REQUIRED = object()
+# 스레드 → 이벤트 루프 inbox 항목 종류
+_RESULT = "result"
+_EVENT = "event"
+
+
+def _discard(item) -> None:
+    """run() 밖(시작 전/종료 후)에 도착한 publish/emit은 버린다"""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """그래프 노드 1개.
+
+    run은 upstream 결과 dict({input 이름: 결과})를 받는 동기 함수이며 스레드에서 실행된다.
+    provides가 있으면 두 번째 인자로 publish(name, value) 콜백도 받는다 (스레드 안전).
+    hedge는 run과 같은 결과를 내는 별도 실행 함수(다른 서브에이전트 인스턴스, 스트리밍 없음)로,
+    지정된 stage만 hedging 대상이 된다.
+    agent를 지정하면 OutputMeter를 부착해 출력량 기반 진행률을 추정한다.
+    cache_key는 upstream 결과로 캐시 키 재료(입력 + 모델 프로파일, JSON 직렬화 가능)를 만든다.
+    """
+
+    name: str
+    label: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+    fallback: Any = _REQUIRED
+    agent: Any = None
+    weight: float = 1.0
+    cache_key: Optional[Callable[[Dict[str, Any]], Any]] = None
+    cache_if: Callable[[Any], bool] = bool
+    hedge: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    @property
+    def required(self) -> bool:
+        return self.fallback is _REQUIRED
+
+
+class StageGraph:
+    """선언된 stage들을 의존성 순서대로(가능한 한 병렬로) 실행"""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        progress_range: Tuple[int, int] = (0, 100),
+        interval: float = HEARTBEAT_SECONDS,
+        cache: Optional[StageCache] = None,
+        read_cache: bool = True,
+        given: Optional[Dict[str, Any]] = None,
+        hedger: Optional[Hedger] = None,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"중복 stage: {stage.name}")
+            self.stages[stage.name] = stage
+        # 중간 결과 이름 -> 공개하는 stage
+        self._providers: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for name in stage.provides:
+                if name in self.stages or name in self._providers:
+                    raise ValueError(f"중복 결과 이름: {name}")
+                self._providers[name] = stage.name
+        # 그래프 밖에서 이미 준비된 입력 (섹션 재생성 시 이전 명세서의 stage 결과)
+        self._given = dict(given or {})
+        self._hedger = hedger
+        self._validate()
+        self._lo, self._hi = progress_range
+        self._interval = interval
+        self._cache = cache
+        self._read_cache = read_cache
+        self.cache_hits: list[str] = []
+        self.results: Dict[str, Any] = dict(self._given)
+        self.failures: Dict[str, BaseException] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}  # name -> (시작, 종료) 초 (실행 시작 기준)
+        self.abandoned: List[Future] = []  # hedge에 진 뒤 아직 실행 중인 원본 시도
+        self._post: Callable[[tuple], None] = _discard
+
+    def emit(self, event: events.Event) -> None:
+        """stage 스레드에서 이벤트 전달 (스레드 안전) — run()이 순서대로 yield한다"""
+        self._post((_EVENT, event))
+
+    async def run(self) -> AsyncIterator[events.Event]:
+        """그래프 실행 — 진행 이벤트를 yield, 결과는 self.results에 기록"""
+        started_at = time.monotonic()
+        trackers: Dict[str, StageTracker] = {}
+        running: Dict[asyncio.Task, str] = {}
+        fatal: Optional[BaseException] = None
+        loop = asyncio.get_running_loop()
+        inbox: asyncio.Queue = asyncio.Queue()
+        next_item: Optional[asyncio.Task] = None
+        self._post = lambda item: loop.call_soon_threadsafe(inbox.put_nowait, item)
+
+        def make_publish(stage: Stage) -> Callable[[str, Any], None]:
+            def publish(name: str, value: Any) -> None:
+                if name not in stage.provides:
+                    raise ValueError(f"{stage.name}: 선언되지 않은 중간 결과 '{name}'")
+                self._post((_RESULT, name, value))
+            return publish
+
+        def accept(name: str, value: Any):
+            if name in self.results:
+                return
+            self.results[name] = value
+            self.timings[name] = (self.timings[self._providers[name]][0], time.monotonic() - started_at)
+            yield events.StageStatus(name, "done")
+
+        def drain():
+            """스레드에서 도착한 중간 결과/이벤트를 도착 순서대로 처리"""
+            nonlocal next_item
+            items = []
+            if next_item is not None and next_item.done():
+                items.append(next_item.result())
+                next_item = None
+            while not inbox.empty():
+                items.append(inbox.get_nowait())
+            for kind, *rest in items:
+                if kind is _RESULT:
+                    yield from accept(*rest)
+                else:
+                    yield rest[0]
+
+        def launch_ready():
+            for stage in self.stages.values():
+                if stage.name in trackers:
+                    continue
+                if not all(dep in self.results for dep in stage.inputs):
+                    continue
+                meter = OutputMeter.attach(stage.agent) if stage.agent is not None else None
+                trackers[stage.name] = StageTracker(stage.name, meter)
+                upstream = {dep: self.results[dep] for dep in stage.inputs}
+                key = None
+                if self._cache is not None and stage.cache_key is not None:
+                    key = stage_key(stage.name, stage.cache_key(upstream))
+                task = asyncio.create_task(asyncio.to_thread(
+                    self._execute, stage, upstream, make_publish(stage), key
+                ))
+                running[task] = stage.name
+                self.timings[stage.name] = (time.monotonic() - started_at, 0.0)
+                yield events.StageStatus(stage.name, "started")
+
+        try:
+            for event in launch_ready():
+                yield event
+
+            while running:
+                if next_item is None:
+                    next_item = asyncio.create_task(inbox.get())
+                done, _ = await asyncio.wait(
+                    [*running, next_item],
+                    timeout=self._interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                # 완료 전 도착한 publish/이벤트를 먼저 반영
+                for event in drain():
+                    yield event
+                finished = [task for task in done if task in running]
+                if done and not finished:
+                    continue  # 중간 결과/이벤트만 도착 — 진행률 갱신 불필요
+
+                for task in finished:
+                    name = running.pop(task)
+                    stage = self.stages[name]
+                    error = task.exception()
+                    result, cached = task.result() if error is None else (None, False)
+                    trackers[name].finish(record=error is None and not cached)
+                    self.timings[name] = (self.timings[name][0], time.monotonic() - started_at)
+                    if error is None:
+                        # 미공개 provides는 최종 결과로 채움
+                        self.results[name] = result
+                        if cached:
+                            self.cache_hits.append(name)
+                        yield events.StageStatus(name, "done", cached=cached)
+                        for provided in stage.provides:
+                            for event in accept(provided, self.results[name]):
+                                yield event
+                        continue
+                    self.failures[name] = error
+                    error_detail = f"{type(error).__name__}: {str(error)[:200]}"
+                    logger.error(f"[STAGE GRAPH] {name} 실패: {error_detail}", exc_info=error)
+                    if stage.required:
+                        fatal = fatal or error
+                    else:
+                        self.results[name] = stage.fallback
+                    yield events.StageStatus(name, "failed", error_detail)
+                    if not stage.required:
+                        for provided in stage.provides:
+                            for event in accept(provided, stage.fallback):
+                                yield event
+
+                if fatal is None:
+                    for event in launch_ready():
+                        yield event
+                if running:
+                    yield events.Progress(
+                        scale(self._fraction(trackers), self._lo, self._hi),
+                        self._running_text(running.values(), fatal is not None),
+                    )
+        finally:
+            # 소비 측 이탈(aclose/취소) — 스레드는 계속 돌지만 결과는 버린다
+            for task in running:
+                task.cancel()
+            if next_item is not None:
+                next_item.cancel()
+            self._post = _discard
+
+        if fatal is not None:
+            raise fatal
+        logger.info(
+            "[STAGE GRAPH] 완료 "
+            + " ".join(f"{name}={start:.1f}-{end:.1f}s" for name, (start, end) in self.timings.items())
+        )
+
+    # ── 내부 ─────────────────────────────────
+
+    def _execute(
+        self,
+        stage: Stage,
+        upstream: Dict[str, Any],
+        publish: Callable[[str, Any], None],
+        key: Optional[str],
+    ) -> Tuple[Any, bool]:
+        """stage 스레드 본체 — 캐시 조회 → 실행 → 저장. (결과, cache hit 여부) 반환"""
+        if key is not None and self._read_cache:
+            entry = self._cache.get(key)
+            if entry is not None:
+                for name, value in entry["provides"].items():
+                    publish(name, value)
+                return entry["result"], True
+
+        provided: Dict[str, Any] = {}
+
+        def recording_publish(name: str, value: Any) -> None:
+            provided[name] = value
+            publish(name, value)
+
+        args = (upstream, recording_publish) if stage.provides else (upstream,)
+        if stage.hedge is not None and self._hedger is not None:
+            result = self._hedger.run(
+                stage.name, lambda: stage.run(*args), lambda: stage.hedge(upstream),
+                on_abandoned=self.abandoned.append,
+            )
+        else:
+            result = stage.run(*args)
+        if key is not None and stage.cache_if(result):
+            self._cache.put(key, {"result": result, "provides": provided})
+        return result, False
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            for dep in stage.inputs:
+                if dep not in self.stages and dep not in self._providers and dep not in self._given:
+                    raise ValueError(f"{stage.name}: 알 수 없는 입력 stage '{dep}'")
+        # 위상 정렬로 순환 검사 (중간 결과 입력은 공개하는 stage에 대한 의존으로 취급)
+        remaining = {
+            name: {self._providers.get(dep, dep) for dep in stage.inputs if dep not in self._given}
+            for name, stage in self.stages.items()
+        }
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"stage 순환 의존: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _fraction(self, trackers: Dict[str, StageTracker]) -> float:
+        total = sum(stage.weight for stage in self.stages.values())
+        if total <= 0:
+            return 0.0
+        done = sum(
+            stage.weight * trackers[name].fraction()
+            for name, stage in self.stages.items()
+            if name in trackers
+        )
+        return done / total
+
+    def _running_text(self, names: Iterable[str], aborting: bool) -> str:
+        labels = " & ".join(self.stages[name].label for name in names)
+        return f"{labels} {'정리 중...' if aborting else '생성 중...'}"
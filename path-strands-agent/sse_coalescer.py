@@ -0,0 +1,129 @@
+"""SSE text 이벤트 병합 — 고빈도 text delta를 시간/바이트 한도 프레임으로 묶는다.
+
+pattern_analyze/chat은 모델 토큰 delta마다, Assembler는 100자마다 이벤트를 내보낸다.
+이벤트마다 AgentCore SSE 프레이밍 → Next.js relay → 브라우저 파서를 거치므로,
+인접한 text 이벤트를 max_delay(기본 30ms) 또는 max_bytes(기본 2KB) 단위로 병합한다.
+
+- 첫 text 이벤트는 즉시 전송 (time to first byte 유지)
+- events.Text만 병합 (같은 session_id끼리, progress는 마지막 값 유지)
+- 그 외 이벤트(Progress, Usage, Error, SpecMeta, Warning, Result 등)는 대기 중인
+  text를 먼저 flush한 뒤 그대로 통과 → 이벤트 순서 보존
+
+원본 스트림은 별도 task가 큐로 옮기므로, 원본이 멈춰 있어도 max_delay가 지나면 flush된다.
+
+환경변수:
+  SSE_COALESCE_MS     -> 프레임 최대 지연 ms (기본 30, 0이면 병합 비활성화)
+  SSE_COALESCE_BYTES  -> 프레임 최대 text 바이트 (기본 2048)
+"""
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Optional
+
+import events
+
+COALESCE_SECONDS = int(os.environ.get("SSE_COALESCE_MS", 30)) / 1000
+COALESCE_BYTES = int(os.environ.get("SSE_COALESCE_BYTES", 2048))
+
+_QUEUE_SIZE = 256
+_END = object()
+
+
+class _Pending:
+    """병합 중인 text 프레임"""
+
+    __slots__ = ("parts", "nbytes", "progress", "session_id", "deadline")
+
+    def __init__(self, event: events.Text, deadline: float):
+        self.parts = [event.text]
+        self.nbytes = len(event.text.encode("utf-8"))
+        self.progress = event.progress
+        self.session_id = event.session_id
+        self.deadline = deadline
+
+    def accepts(self, event: events.Text) -> bool:
+        return event.session_id == self.session_id
+
+    def add(self, event: events.Text) -> None:
+        self.parts.append(event.text)
+        self.nbytes += len(event.text.encode("utf-8"))
+        if event.progress is not None:
+            self.progress = event.progress
+
+    def to_event(self) -> events.Text:
+        return events.Text("".join(self.parts), self.progress, self.session_id)
+
+
+async def coalesce_text(
+    source: AsyncIterator[Any],
+    max_delay: float = COALESCE_SECONDS,
+    max_bytes: int = COALESCE_BYTES,
+) -> AsyncIterator[Any]:
+    """인접 text 이벤트를 병합한 스트림 반환 (max_delay <= 0이면 그대로 통과)"""
+    if max_delay <= 0:
+        async for event in source:
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+
+    async def pump():
+        try:
+            async for event in source:
+                await queue.put(event)
+        except Exception as e:  # 원본 예외는 소비 측에서 다시 발생
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    pump_task = asyncio.create_task(pump())
+    pending: Optional[_Pending] = None
+    sent_text = False
+    try:
+        while True:
+            if pending is None:
+                item = await queue.get()
+            else:
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(), timeout=max(pending.deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    yield pending.to_event()
+                    pending = None
+                    continue
+
+            if item is _END or isinstance(item, Exception):
+                if pending is not None:
+                    yield pending.to_event()
+                    pending = None
+                if item is _END:
+                    return
+                raise item
+
+            if not isinstance(item, events.Text):
+                if pending is not None:
+                    yield pending.to_event()
+                    pending = None
+                yield item
+                continue
+
+            if not sent_text:
+                # 첫 text는 지연 없이 전송
+                sent_text = True
+                yield item
+                continue
+
+            if pending is not None and not pending.accepts(item):
+                yield pending.to_event()
+                pending = None
+            if pending is None:
+                pending = _Pending(item, loop.time() + max_delay)
+            else:
+                pending.add(item)
+            if pending.nbytes >= max_bytes:
+                yield pending.to_event()
+                pending = None
+    finally:
+        pump_task.cancel()
@@ -4,15 +4,23 @@ Strands SDK Utilities - Agent 생성 및 관리를 위한 유틸리티
 
 from strands import Agent
 from strands.models import BedrockModel
-from strands.models.bedrock import CacheConfig
+from strands.models.bedrock import DEFAULT_BEDROCK_REGION, CacheConfig
+from strands.handlers.callback_handler import null_callback_handler
+from strands.telemetry.metrics import EventLoopMetrics
 import logging
 import os
+import threading
+from contextlib import contextmanager
+import boto3
 import botocore.config
 
+import cancellation
+
 logger = logging.getLogger(__name__)
 
 # Model configuration is centralized in agent_config.py
 from agent_config import DEFAULT_MODEL as DEFAULT_MODEL_ID  # noqa: E402
+from agent_config import BEDROCK_MAX_POOL_CONNECTIONS  # noqa: E402
 
 
 # Bedrock API 호출 타임아웃 및 재시도 설정
@@ -23,6 +31,189 @@ BEDROCK_CLIENT_CONFIG = botocore.config.Config(
 )
 
 
+# 프로세스 공유 boto3 Session — botocore loader(서비스 모델 JSON 파싱) 캐시를 재사용.
+# Session은 thread-safe하지 않으므로 client 생성은 lock으로 직렬화한다.
+_boto_session: "boto3.Session | None" = None
+_boto_session_lock = threading.Lock()
+
+
+def get_boto_session() -> boto3.Session:
+    """프로세스 공유 boto3 Session (최초 호출 시 생성)"""
+    global _boto_session
+    if _boto_session is None:
+        with _boto_session_lock:
+            if _boto_session is None:
+                _boto_session = boto3.Session()
+    return _boto_session
+
+
+class BedrockClientRegistry:
+    """프로세스 전역 bedrock-runtime client 레지스트리.
+
+    (region, endpoint, read_timeout, connect_timeout)마다 client 1개를 만들어 모든
+    BedrockModel이 공유한다 → urllib3 connection pool(TLS 연결)이 요청 간 재사용된다.
+    pool 크기는 spec fan-out 기준(BEDROCK_MAX_POOL_CONNECTIONS)으로 설정한다.
+
+    botocore는 pool이 가득 차면 대기하지 않고 pool 밖의 새 연결을 열었다가 버리므로,
+    "pool wait"은 in-flight 호출 수가 pool 크기 이상일 때 시작된 호출 수로 집계하고
+    urllib3의 "Connection pool is full" 경고 횟수를 함께 센다.
+    """
+
+    def __init__(self, max_pool_connections: int = BEDROCK_MAX_POOL_CONNECTIONS):
+        self.max_pool_connections = max_pool_connections
+        self._clients: dict[tuple, object] = {}
+        self._keys_by_client: dict[int, tuple] = {}
+        self._stats: dict[tuple, dict] = {}
+        self._stats_lock = threading.Lock()
+        self._pool_full_discards = 0
+
+    def get(self, region_name: str, config: botocore.config.Config, endpoint_url: str | None = None):
+        """키에 해당하는 공유 client 반환 (없으면 공유 Session에서 생성)"""
+        key = (region_name, endpoint_url, config.read_timeout, config.connect_timeout)
+        with _boto_session_lock:
+            client = self._clients.get(key)
+            if client is not None:
+                return client
+            client = get_boto_session().client(
+                "bedrock-runtime",
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=config.merge(
+                    botocore.config.Config(max_pool_connections=self.max_pool_connections)
+                ),
+            )
+            self._clients[key] = client
+            self._keys_by_client[id(client)] = key
+        with self._stats_lock:
+            self._stats[key] = {"calls": 0, "in_flight": 0, "peak_in_flight": 0, "pool_waits": 0}
+        logger.info(
+            f"[BEDROCK CLIENT] 생성 region={region_name} read_timeout={config.read_timeout} "
+            f"max_pool_connections={self.max_pool_connections}"
+        )
+        return client
+
+    @contextmanager
+    def track(self, client):
+        """client 호출(스트림 소비 완료까지) 동안 in-flight 집계"""
+        key = self._keys_by_client.get(id(client))
+        if key is None:
+            yield
+            return
+        with self._stats_lock:
+            entry = self._stats[key]
+            if entry["in_flight"] >= self.max_pool_connections:
+                entry["pool_waits"] += 1
+            entry["calls"] += 1
+            entry["in_flight"] += 1
+            entry["peak_in_flight"] = max(entry["peak_in_flight"], entry["in_flight"])
+        try:
+            yield
+        finally:
+            with self._stats_lock:
+                entry["in_flight"] -= 1
+
+    def record_pool_full(self) -> None:
+        with self._stats_lock:
+            self._pool_full_discards += 1
+
+    def stats(self) -> dict:
+        """ping 응답용 client별 호출/in-flight/pool wait 통계"""
+        with self._stats_lock:
+            return {
+                "max_pool_connections": self.max_pool_connections,
+                "pool_full_discards": self._pool_full_discards,
+                "clients": [
+                    {"region": key[0], "read_timeout": key[2], **entry}
+                    for key, entry in self._stats.items()
+                ],
+            }
+
+
+bedrock_clients = BedrockClientRegistry()
+
+
+class _PoolFullCounter(logging.Handler):
+    """urllib3 "Connection pool is full, discarding connection" 경고 집계"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "Connection pool is full" in record.getMessage():
+            bedrock_clients.record_pool_full()
+
+
+logging.getLogger("urllib3.connectionpool").addHandler(_PoolFullCounter(level=logging.WARNING))
+
+
+class _RegistrySession:
+    """BedrockModel에 boto_session으로 전달하는 shim.
+
+    BedrockModel.__init__은 session.client(...)로 매번 새 client를 만들므로,
+    그 호출을 레지스트리 조회로 대체해 공유 client를 주입한다.
+    """
+
+    @property
+    def region_name(self) -> str | None:
+        return get_boto_session().region_name
+
+    def client(self, service_name: str, config=None, endpoint_url=None, region_name=None, **_kwargs):
+        return bedrock_clients.get(region_name, config or BEDROCK_CLIENT_CONFIG, endpoint_url)
+
+
+_registry_session = _RegistrySession()
+
+
+class SharedClientBedrockModel(BedrockModel):
+    """공유 client를 사용하고 호출 중 in-flight 수를 레지스트리에 보고하는 BedrockModel.
+
+    요청에 CancelToken이 바인딩돼 있으면(cancellation.py) 취소된 요청의 호출은 시작하지
+    않고, 진행 중인 스트림은 cancel_signal로 다음 chunk 경계에서 중단한 뒤 Cancelled를 낸다.
+    """
+
+    async def stream(self, *args, **kwargs):
+        token = cancellation.current_token()
+        if token is None:
+            with bedrock_clients.track(self.client):
+                async for event in super().stream(*args, **kwargs):
+                    yield event
+            return
+
+        token.check()
+        # Strands가 넘기는 agent cancel_signal을 토큰에 연결 (구버전은 kwargs로 무시됨)
+        signal = kwargs.get("cancel_signal") or threading.Event()
+        kwargs["cancel_signal"] = signal
+        output_chars = 0
+        usage = None
+        with bedrock_clients.track(self.client), token.link(signal):
+            upstream = super().stream(*args, **kwargs)
+            try:
+                async for event in upstream:
+                    if token.cancelled:
+                        break
+                    delta = event.get("contentBlockDelta", {}).get("delta", {})
+                    output_chars += len(delta.get("text", ""))
+                    usage = event.get("metadata", {}).get("usage", usage)
+                    yield event
+            finally:
+                await upstream.aclose()
+        if token.cancelled:
+            cancellation.cancellation_stats.record_aborted(output_chars)
+            raise cancellation.Cancelled(f"{token.label} 취소됨 (스트림 중단)")
+        if usage:
+            token.record_usage(usage)
+            cancellation.cancellation_stats.observe_call(usage, output_chars)
+
+
+def create_bedrock_runtime_client(config: botocore.config.Config = BEDROCK_CLIENT_CONFIG):
+    """BedrockModel과 동일한 키의 공유 bedrock-runtime client (warm-up/직접 호출용)"""
+    region = (
+        get_boto_session().region_name
+        or os.environ.get("AWS_REGION")
+        or DEFAULT_BEDROCK_REGION
+    )
+    return bedrock_clients.get(
+        region, config.merge(botocore.config.Config(user_agent_extra="strands-agents"))
+    )
+
+
 class StrandsUtils:
     """Strands Agent SDK 유틸리티"""
     
@@ -61,12 +252,13 @@ class StrandsUtils:
         model_kwargs = dict(
             model_id=model_id,
             max_tokens=max_tokens,
+            boto_session=_registry_session,  # 레지스트리의 공유 client 주입
             boto_client_config=client_config,
             cache_config=CacheConfig(strategy="auto"),
         )
         if temperature is not None:
             model_kwargs["temperature"] = temperature
-        model = BedrockModel(**model_kwargs)
+        model = SharedClientBedrockModel(**model_kwargs)
         
         # Agent 생성 (콘솔 출력 비활성화)
         plugins = kwargs.get("plugins", None)
@@ -82,6 +274,18 @@ class StrandsUtils:
         return Agent(**agent_kwargs)
 
 
+def reset_agent_state(agent: Agent) -> None:
+    """풀 재사용을 위한 호출 단위 상태 초기화.
+
+    대화 메시지, 누적 토큰 메트릭(extract_usage가 읽는 accumulated_usage),
+    진행률 측정용 callback_handler를 생성 직후 상태로 되돌린다.
+    시스템 프롬프트/모델/도구/플러그인은 그대로 재사용한다.
+    """
+    agent.messages.clear()
+    agent.event_loop_metrics = EventLoopMetrics()
+    agent.callback_handler = null_callback_handler
+
+
 def safe_extract_text(result) -> str:
     """AgentResult에서 텍스트를 안전하게 추출.
 
@@ -110,6 +314,16 @@ _SKILLS_DIR = os.path.join(os.path.dirname(__file__), "skills")
 
 _skill_content_cache: dict[str, str] = {}
 
+# 에이전트별 사전 주입 스킬 조합 (warm-up이 동일 조합을 미리 로드)
+SKILL_PRELOADS: dict[str, tuple[str, list[str]]] = {
+    "feasibility": (
+        "feasibility-evaluation",
+        ["scoring-criteria.md", "improvement-suggestions.md", "risk-patterns.md"],
+    ),
+    "diagram": ("mermaid-diagrams", ["pattern-examples.md", "templates.md"]),
+    "prompt": ("prompt-engineering", ["role-templates.md"]),
+}
+
 
 def load_skill_content(skill_name: str, reference_files: list[str] | None = None) -> str:
     """스킬 SKILL.md 본문 + 지정 reference 파일을 사전 로드하여 프롬프트용 텍스트 반환.
@@ -157,6 +371,12 @@ def load_skill_content(skill_name: str, reference_files: list[str] | None = None
     return result
 
 
+def preload_skill_content(name: str) -> str:
+    """SKILL_PRELOADS에 등록된 에이전트의 스킬 조합을 로드 (캐시됨)"""
+    skill_name, reference_files = SKILL_PRELOADS[name]
+    return load_skill_content(skill_name, reference_files)
+
+
 def create_spec_agent(system_prompt: str, max_tokens: int = 8192,
                       model_id: str | None = None, temperature: float | None = None,
                       tools=None, plugins=None):
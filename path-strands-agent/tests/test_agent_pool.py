@@ -0,0 +1,90 @@
+"""AgentPool — 정상 반납 시 재사용, 예외·취소(연결 종료) 시 폐기, reset 실패·max_idle 초과 시 폐기"""
+
+import asyncio
+import itertools
+
+import pytest
+
+from agent_pool import AgentPool
+
+
+class _Agent:
+    def __init__(self, n):
+        self.n = n
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+
+def _pool(reset=lambda agent: agent.reset(), **kwargs):
+    counter = itertools.count()
+    return AgentPool("test", factory=lambda: _Agent(next(counter)), reset=reset, min_idle=0, **kwargs)
+
+
+def test_lease_reuses_instance_after_normal_exit():
+    async def run():
+        pool = _pool()
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        return pool, first, second
+
+    pool, first, second = asyncio.run(run())
+    assert first is second and first.resets == 2
+    stats = pool.stats()
+    assert (stats["created"], stats["hits"], stats["misses"], stats["reused"]) == (1, 1, 1, 2)
+
+
+def test_lease_discards_instance_on_error():
+    async def run():
+        pool = _pool()
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as first:
+                raise RuntimeError("boom")
+        async with pool.lease() as second:
+            pass
+        return pool, first, second
+
+    pool, first, second = asyncio.run(run())
+    assert first is not second and first.resets == 0
+    assert pool.stats()["discarded"] == 1
+
+
+def test_lease_discards_instance_when_consumer_is_cancelled():
+    async def run():
+        pool = _pool()
+        leased = asyncio.Event()
+
+        async def consumer():
+            async with pool.lease():
+                leased.set()
+                await asyncio.Event().wait()   # 스트림 전송 중 클라이언트 연결 종료
+
+        task = asyncio.create_task(consumer())
+        await leased.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        async with pool.lease() as after:
+            pass
+        return pool, after
+
+    pool, after = asyncio.run(run())
+    assert after.n == 1   # 취소된 대여의 인스턴스는 다시 나가지 않는다
+    assert pool.stats()["discarded"] == 1 and pool.stats()["created"] == 2
+
+
+def test_reset_failure_and_max_idle_discard():
+    def failing_reset(agent):
+        raise ValueError("dirty")
+
+    pool = _pool(reset=failing_reset)
+    pool.release(_Agent(0))
+    assert pool.stats()["discarded"] == 1 and pool.stats()["idle"] == 0
+
+    pool = _pool(max_idle=1)
+    pool.release(_Agent(0))
+    pool.release(_Agent(1))
+    assert pool.stats()["idle"] == 1 and pool.stats()["discarded"] == 1
@@ -0,0 +1,84 @@
+"""CheckpointStore (SQLite / 메모리) — events_after 순서, load_stages, TTL 만료·정리"""
+
+import pytest
+
+from spec import checkpoint_store
+from spec.checkpoint_store import (
+    STATUS_DONE,
+    STATUS_RUNNING,
+    InMemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(checkpoint_store.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def make_store(request, tmp_path):
+    def make(ttl_seconds=3600):
+        if request.param == "sqlite":
+            return SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"), ttl_seconds)
+        return InMemoryCheckpointStore(ttl_seconds)
+    return make
+
+
+def test_events_after_returns_later_events_in_order(make_store, clock):
+    store = make_store()
+    store.create_run("r1")
+    store.create_run("r2")
+    store.append_events("r1", [(1, {"text": "a"}), (2, {"progress": 10, "stage": "설계"})])
+    store.append_events("r2", [(1, {"text": "other"})])
+    store.append_events("r1", [(3, {"text": "b"}), (4, {"spec_meta": {"k": [1]}})])
+
+    assert store.events_after("r1", 2) == [(3, {"text": "b"}), (4, {"spec_meta": {"k": [1]}})]
+    assert [event_id for event_id, _ in store.events_after("r1", 0)] == [1, 2, 3, 4]
+    assert store.events_after("r1", 4) == [] and store.events_after("missing", 0) == []
+    run = store.get_run("r1")
+    assert (run["status"], run["last_event_id"]) == (STATUS_RUNNING, 4)
+
+
+def test_load_stages_returns_saved_values(make_store, clock):
+    store = make_store()
+    store.create_run("r1")
+    store.save_stage("r1", "design", "## 1. 설계")
+    store.save_stage("r1", "data_integration", {"sources": ["crm"]})
+    store.save_stage("r1", "design", "## 1. 설계 (갱신)")   # 같은 stage는 덮어쓴다
+    store.set_status("r1", STATUS_DONE)
+
+    assert store.load_stages("r1") == {"design": "## 1. 설계 (갱신)", "data_integration": {"sources": ["crm"]}}
+    assert store.load_stages("r2") == {}
+    assert store.get_run("r1")["status"] == STATUS_DONE
+
+
+def test_expired_runs_are_hidden_and_purged(make_store, clock):
+    store = make_store(ttl_seconds=60)
+    store.create_run("old")
+    store.append_events("old", [(1, {"text": "a"})])
+    store.save_stage("old", "design", "x")
+    clock[0] += 30
+    store.create_run("fresh")
+    clock[0] += 40   # old: 70s, fresh: 40s
+
+    assert store.get_run("old") is None and store.get_run("fresh") is not None
+    # 만료 run 정리 (SQLite는 _PURGE_EVERY_N_RUNS번째 create_run마다)
+    for n in range(checkpoint_store._PURGE_EVERY_N_RUNS):
+        store.create_run(f"new-{n}")
+    assert store.events_after("old", 0) == [] and store.load_stages("old") == {}
+    assert store.get_run("fresh") is not None
+
+
+def test_sqlite_store_survives_reopen(tmp_path, clock):
+    path = str(tmp_path / "checkpoints.db")
+    store = SQLiteCheckpointStore(path)
+    store.create_run("r1")
+    store.append_events("r1", [(1, {"text": "a"})])
+    store.save_stage("r1", "design", "x")
+
+    reopened = SQLiteCheckpointStore(path)   # 컨테이너 프로세스 재시작
+    assert reopened.events_after("r1", 0) == [(1, {"text": "a"})]
+    assert reopened.load_stages("r1") == {"design": "x"}
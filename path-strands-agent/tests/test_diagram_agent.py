@@ -0,0 +1,141 @@
+"""DiagramAgent — 스트리밍 중 닫힌 블록의 수정이 생성과 겹쳐 실행되고, 생성 실패 시 중단되며,
+정리된 출력의 같은 블록에 반영되고, 수정 실패가 다이어그램을 버리지 않는지 확인"""
+
+import threading
+
+import pytest
+
+import cancellation
+from spec.diagram_agent import DiagramAgent
+from spec.mermaid_validator import MermaidValidator
+
+_BROKEN = "```mermaid\nflowchrt TD\n    A --> B\n```\n"   # 타입 오타 — 규칙 기반으로 못 고쳐 LLM 수정
+_FIXED = "flowchart TD\n    A --> B\n"
+
+
+class _Result:
+    def __init__(self, text):
+        self.message = {"content": [{"text": text}]}
+
+
+def _diagram_agent():
+    agent = DiagramAgent.__new__(DiagramAgent)
+    agent.validator = MermaidValidator()
+    return agent
+
+
+class _Generator:
+    """블록을 스트리밍한 뒤 after_block()을 실행하고 나머지 설명을 이어 쓰는 생성 에이전트"""
+
+    def __init__(self, after_block, block=_BROKEN):
+        self.callback_handler = None
+        self._after_block = after_block
+        self._block = block
+
+    def __call__(self, prompt):
+        text = "### 3.1 Agent Workflow\n" + self._block
+        for line in text.splitlines(keepends=True):
+            self.callback_handler(data=line)
+        self._after_block()
+        self.callback_handler(data="설명\n")
+        return _Result(text + "설명\n")
+
+
+def _assert_started(event):
+    assert event.wait(timeout=2.0), "블록이 닫혔는데 수정이 시작되지 않음"
+
+
+def test_repair_starts_while_generation_continues(monkeypatch):
+    agent = _diagram_agent()
+    repair_started = threading.Event()
+
+    def repair_instance():
+        def call(prompt):
+            repair_started.set()
+            return _Result(f"```mermaid\n{_FIXED}```")
+        return call
+
+    monkeypatch.setattr(agent, "_create_repair_instance", repair_instance)
+    # 생성이 끝나기 전에 수정 호출이 시작돼야 반환된다
+    generator = _Generator(lambda: _assert_started(repair_started))
+
+    result, early = agent._call_with_early_repair(generator, "prompt", "3.1")
+    output, usage = agent._finish_repair(result.message["content"][0]["text"], early, "3.1")
+
+    assert generator.callback_handler is None   # 감싼 handler 복원
+    assert _FIXED in output and "flowchrt" not in output
+    assert agent.validator.validate(output) == (True, [])
+
+
+def test_generation_failure_cancels_running_repair(monkeypatch):
+    agent = _diagram_agent()
+    repair_started = threading.Event()
+    repair_cancelled = threading.Event()
+
+    def repair_instance():
+        def call(prompt):
+            repair_started.set()
+            token = cancellation.current_token()
+            for _ in range(400):
+                if token.cancelled:
+                    repair_cancelled.set()
+                    raise cancellation.Cancelled("수정 중단")
+                threading.Event().wait(0.005)
+            return _Result(f"```mermaid\n{_FIXED}```")
+        return call
+
+    def fail():
+        _assert_started(repair_started)
+        raise RuntimeError("model stream failed")
+
+    monkeypatch.setattr(agent, "_create_repair_instance", repair_instance)
+    generator = _Generator(fail)
+
+    with pytest.raises(RuntimeError):
+        agent._call_with_early_repair(generator, "prompt", "3.1")
+
+    assert repair_cancelled.wait(timeout=2.0)
+    assert generator.callback_handler is None
+
+
+def _counting_repair_instance(calls, reply):
+    def repair_instance():
+        def call(prompt):
+            calls.append(prompt)
+            return reply()
+        return call
+    return repair_instance
+
+
+def test_early_repair_matches_block_changed_by_cleaning(monkeypatch):
+    agent = _diagram_agent()
+    calls = []
+    monkeypatch.setattr(agent, "_create_repair_instance",
+                        _counting_repair_instance(calls, lambda: _Result(f"```mermaid\n{_FIXED}```")))
+    # 빈 줄 3개는 clean_internal_comments가 2개로 줄인다 — 스트림 원본과 정리된 블록이 다름
+    generator = _Generator(lambda: None, block="```mermaid\nflowchrt TD\n\n\n\n    A --> B\n```\n")
+
+    result, early = agent._call_with_early_repair(generator, "prompt", "3.1")
+    cleaned = agent._clean_diagram_output(result.message["content"][0]["text"])
+    assert "\n\n\n" not in cleaned
+    output, _ = agent._finish_repair(cleaned, early, "3.1")
+
+    assert _FIXED in output and "flowchrt" not in output
+    assert len(calls) == 1   # 정리 후에도 같은 블록으로 맞춰 다시 수정하지 않는다
+
+
+def test_failed_early_repair_keeps_block_without_raising(monkeypatch):
+    agent = _diagram_agent()
+    calls = []
+
+    def fail():
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(agent, "_create_repair_instance", _counting_repair_instance(calls, fail))
+    generator = _Generator(lambda: None)
+
+    result, early = agent._call_with_early_repair(generator, "prompt", "3.1")
+    output, usage = agent._finish_repair(result.message["content"][0]["text"], early, "3.1")
+
+    assert "flowchrt TD" in output and "설명" in output   # 블록·설명 유지
+    assert usage == {} and len(calls) == 1
@@ -0,0 +1,125 @@
+"""엔트리포인트 핸들러 — 풀 인스턴스 호출 인자가 에이전트 메서드 시그니처와 맞는지, spec run 재개가
+놓친 이벤트만 replay하고 완료 stage를 건너뛰는지 실제로 구동해 확인"""
+
+import asyncio
+from types import SimpleNamespace
+
+import agent_pool
+import agentcore_entrypoint as entrypoint
+import events
+from feasibility_agent import FeasibilityAgent
+from spec import checkpoint_store
+
+
+class _FakeStrandsAgent:
+    callback_handler = None
+
+
+def _feasibility_agent(result):
+    agent = FeasibilityAgent.__new__(FeasibilityAgent)
+    agent.agent = _FakeStrandsAgent()
+    agent.reevaluate = lambda *args: dict(result)
+    return agent
+
+
+def _collect(stream):
+    async def run():
+        return [event async for event in stream]
+    return asyncio.run(run())
+
+
+def test_feasibility_update_streams_result(monkeypatch):
+    agent = _feasibility_agent({"feasibility_score": 42, "_usage": {"totalTokens": 7}})
+    pool = agent_pool.AgentPool("feasibility", factory=lambda: agent, reset=lambda a: None, min_idle=0)
+    monkeypatch.setitem(agent_pool._pools, "feasibility", pool)
+
+    payload = {
+        "formData": {"painPoint": "x"},
+        "previousEvaluation": {"feasibility_score": 30},
+        "improvementPlans": {"data_access": "API 연동"},
+        # spec 전용 옵션이 섞여 와도 feasibility 재평가는 영향을 받지 않는다
+        "stream_sections": True,
+        "use_stage_cache": False,
+    }
+    emitted = _collect(entrypoint._handle_feasibility_update(payload))
+
+    assert not [e for e in emitted if isinstance(e, events.Error)]
+    results = [e for e in emitted if isinstance(e, events.Result)]
+    assert len(results) == 1 and results[0].result == {"feasibility_score": 42}
+    assert any(isinstance(e, events.Usage) for e in emitted)
+    assert pool.stats()["reused"] == 1
+
+
+def test_spec_resume_replays_missed_events_and_skips_completed_stages(monkeypatch):
+    store = checkpoint_store.InMemoryCheckpointStore()
+    monkeypatch.setattr(checkpoint_store, "_store", store)
+    completed_at_start = []
+
+    async def handle_spec(payload, checkpoint=None):
+        completed_at_start.append(sorted(checkpoint.completed))
+        for stage in ("design", "diagram"):
+            if stage in checkpoint.completed:
+                continue
+            yield events.Progress(50, stage)
+            yield events.Text(f"{stage} 본문\n")
+            checkpoint.save(stage, f"{stage} 결과")
+            if len(completed_at_start) == 1:
+                await asyncio.Event().wait()   # 첫 연결은 design 완료 후 끊긴다
+
+    monkeypatch.setattr(entrypoint, "_handle_spec", handle_spec)
+    context = SimpleNamespace(session_id="sess")
+    payload = {"type": "spec", "analysis": {"pain_point": "x"}}
+
+    async def run():
+        stream = entrypoint.invoke(dict(payload), context)
+        first = [await stream.__anext__() for _ in range(3)]   # spec_run, progress, text
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        run_id = first[0]["spec_run"]["run_id"]
+        # 클라이언트는 event 2까지만 받음 — 3(design 본문)부터 다시 받아야 한다
+        resumed = [
+            event async for event in
+            entrypoint.invoke({**payload, "run_id": run_id, "last_event_id": 2}, context)
+        ]
+        return first, resumed
+
+    first, resumed = asyncio.run(run())
+
+    assert [e["event_id"] for e in first] == [1, 2, 3]
+    assert [e["event_id"] for e in resumed] == [3, 4, 5, 6]
+    assert resumed[0]["text"] == "design 본문\n"
+    assert resumed[1]["spec_run"]["resumed"] is True and resumed[1]["spec_run"]["completed"] == ["design"]
+    assert [e.get("stage") for e in resumed[2:3]] == ["diagram"] and resumed[3]["text"] == "diagram 본문\n"
+    assert completed_at_start == [[], ["design"]]   # 재개 run은 design을 다시 실행하지 않는다
+
+
+def test_pattern_agent_cache_miss_takes_pooled_instance(monkeypatch):
+    created = []
+
+    class _PatternAgent:
+        def __init__(self):
+            self.messages = []
+            created.append(self)
+
+        def add_message(self, role, content):
+            self.messages.append((role, content))
+
+        def estimated_bytes(self):
+            return 1
+
+    pool = agent_pool.AgentPool("pattern_analyzer", factory=_PatternAgent, min_idle=0)
+    monkeypatch.setitem(agent_pool._pools, "pattern_analyzer", pool)
+    monkeypatch.setattr(entrypoint, "_restore_pattern_agent", lambda *args: False)
+    conversation = [{"role": "user", "content": "안녕"}, {"role": "system", "content": "x"}]
+
+    async def run():
+        first = await entrypoint._get_or_create_pattern_agent("pool-test-session", conversation)
+        again = await entrypoint._get_or_create_pattern_agent("pool-test-session", conversation)
+        return first, again
+
+    (agent, stateful), (cached, cached_stateful) = asyncio.run(run())
+
+    assert pool.stats()["misses"] == 1 and created == [agent]
+    assert stateful is False and agent.messages == [("user", "안녕"), ("user", "x")]
+    assert cached is agent and cached_stateful is True   # 세션 캐시 hit — 풀을 다시 쓰지 않음
+    entrypoint._pattern_sessions.pop("pool-test-session")
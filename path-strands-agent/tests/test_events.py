@@ -0,0 +1,50 @@
+"""events — 이벤트 타입별 wire 형식이 기존 dict/JSON payload와 같은지, Event 베이스가 추상인지 확인"""
+
+import json
+
+import pytest
+
+import events
+
+
+def _json(event):
+    return json.dumps(events.to_wire(event), ensure_ascii=False)
+
+
+_CASES = [
+    # feasibility_agent가 json.dumps하던 payload
+    (events.Result({"feasibility_score": 70}), {"result": {"feasibility_score": 70}}),
+    (events.Usage({"totalTokens": 12}), {"usage": {"totalTokens": 12}}),
+    (events.Error("평가 중 오류가 발생했습니다.", 100, "오류 발생"),
+     {"stage": "오류 발생", "progress": 100, "error": "평가 중 오류가 발생했습니다."}),
+    (events.Error("요청 데이터가 허용 크기를 초과합니다."), {"error": "요청 데이터가 허용 크기를 초과합니다."}),
+    # pattern 스트림 / 엔트리포인트의 text
+    (events.Text("안녕"), {"text": "안녕"}),
+    (events.Text("안녕", session_id="s1"), {"text": "안녕", "sessionId": "s1"}),
+    # orchestrator / assembler
+    (events.Progress(0, "2. 에이전트 설계 패턴 분석 시작"), {"progress": 0, "stage": "2. 에이전트 설계 패턴 분석 시작"}),
+    (events.Text("## 1.", 60), {"text": "## 1.", "progress": 60}),
+    (events.Warning("일부 에이전트 실패: tool"), {"warning": "일부 에이전트 실패: tool"}),
+    (events.SpecMeta({"agents": 2}), {"spec_meta": {"agents": 2}}),
+    (events.SpecMeta({"agents": 2}, "abc", partial=True), {"spec_meta": {"agents": 2}, "spec_id": "abc", "partial": True}),
+    (events.Queued(2, "spec"),
+     {"queued": {"position": 2, "priority": "spec"}, "progress": 0, "stage": "요청 대기 중... (대기 순서 2번째)"}),
+    (events.StageStatus("design", "done", cached=True), {"stage_status": {"stage": "design", "status": "done", "cached": True}}),
+    (events.StageStatus("tool", "failed", "timeout"), {"stage_status": {"stage": "tool", "status": "failed", "error": "timeout"}}),
+    (events.Section("3", "본문", final=True), {"section": {"id": "3", "text": "본문", "final": True}}),
+    (events.SpecRun("r1"), {"spec_run": {"run_id": "r1", "resumed": False}}),
+    (events.SpecRun("r1", True, ["design"]), {"spec_run": {"run_id": "r1", "resumed": True, "completed": ["design"]}}),
+    (events.Sequenced({"text": "a"}, 7), {"text": "a", "event_id": 7}),
+]
+
+
+@pytest.mark.parametrize("event, old_payload", _CASES)
+def test_wire_shape_matches_old_payload(event, old_payload):
+    assert _json(event) == json.dumps(old_payload, ensure_ascii=False)   # 키 순서까지 동일
+
+
+def test_every_event_type_is_covered_and_base_is_abstract():
+    assert {type(event) for event, _ in _CASES} == set(events.Event.__subclasses__())
+    with pytest.raises(TypeError):
+        events.Event()
+    assert events.to_wire({"status": "ok"}) == {"status": "ok"}   # 단일 JSON 응답은 그대로
@@ -0,0 +1,187 @@
+"""Hedger — hedge 채택, 진 원본 시도 처리, 진 원본이 쓰던 풀 인스턴스 재사용 여부,
+토큰 예산 정산(하위 토큰 usage 포함), 요청당 동시 hedge 1개"""
+
+import asyncio
+import threading
+import types
+
+import cancellation
+from agent_pool import AgentPool
+from spec.hedging import Hedger
+from spec.orchestrator import MultiStageSpecAgent
+from spec.stage_graph import Stage, StageGraph
+
+
+def _warm_hedger() -> Hedger:
+    """지연 이력(0.01s)과 토큰 예산이 이미 쌓인 Hedger — 0.01s 넘게 걸리면 바로 hedge"""
+    hedger = Hedger(min_samples=1, budget_ratio=1.0)
+    hedger._observe("slow", 0.01, 100)
+    return hedger
+
+
+class _SlowPrimary:
+    """release 전까지 끝나지 않는 원본 시도 — 취소 여부만 기록"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.cancelled = threading.Event()
+
+    def __call__(self, *args):
+        token = cancellation.current_token()
+        while not self.release.wait(0.005):
+            if token.cancelled:
+                self.cancelled.set()
+        return "primary"
+
+
+def test_hedge_wins_and_reports_running_primary():
+    hedger = _warm_hedger()
+    primary = _SlowPrimary()
+    abandoned = []
+
+    result = hedger.run("slow", primary, lambda: "backup", on_abandoned=abandoned.append)
+
+    assert result == "backup"
+    assert hedger.stats()["hedge_wins"] == 1
+    assert len(abandoned) == 1 and not abandoned[0].done()
+    assert primary.cancelled.wait(1.0)  # 진 쪽 토큰은 취소된다
+    primary.release.set()
+    assert abandoned[0].result(timeout=1.0) == "primary"
+
+
+def test_primary_win_is_not_reported():
+    hedger = _warm_hedger()
+    abandoned = []
+
+    def backup():
+        threading.Event().wait(0.2)
+        return "backup"
+
+    def primary():
+        threading.Event().wait(0.05)
+        return "primary"
+
+    assert hedger.run("slow", primary, backup, on_abandoned=abandoned.append) == "primary"
+    assert abandoned == []
+
+
+def _wait_settled(hedger, hedged=1):
+    for _ in range(200):
+        with hedger._lock:
+            if not hedger._hedging and hedger._counters["hedged"] == hedged:
+                return
+        threading.Event().wait(0.005)
+    raise AssertionError("hedge 시도가 정산되지 않음")
+
+
+def test_budget_is_settled_with_actual_hedge_usage_including_child_tokens():
+    hedger = _warm_hedger()   # 평균 100 tokens, 예산 100
+    primary = _SlowPrimary()
+
+    def backup():
+        # 스트리밍 중 수정 호출처럼 시도 토큰의 하위 토큰에서 기록된 usage도 시도 사용량이다
+        cancellation.current_token().child("diagram-repair").record_usage({"totalTokens": 30})
+        cancellation.current_token().record_usage({"totalTokens": 10})
+        return "backup"
+
+    request = cancellation.CancelToken("spec")
+    with cancellation.bound(request):
+        assert hedger.run("slow", primary, backup) == "backup"
+    _wait_settled(hedger)
+    primary.release.set()
+
+    stats = hedger.stats()
+    assert (stats["tokens_reserved"], stats["tokens_hedged"]) == (100, 40)
+    assert stats["budget_tokens"] == 100 - 40 + 40   # 예약 100 → 실제 40으로 정산 + 완료 적립 40
+    assert hedger._avg_tokens["slow"] == 0.8 * 100 + 0.2 * 40
+    assert request.tokens_used == 40   # 요청 토큰까지 합산
+
+
+def test_one_hedge_at_a_time_per_request():
+    hedger = Hedger(min_samples=1, budget_ratio=1.0)
+    hedger._observe("slow", 0.01, 100)
+    hedger._observe("other", 0.01, 100)   # 예산 200 — 예산이 아니라 자리 때문에 거절돼야 한다
+    first = _SlowPrimary()
+    backup_started = threading.Event()
+    backup_release = threading.Event()
+
+    def late_primary():
+        threading.Event().wait(0.05)   # 기준(0.01s)을 넘긴 뒤 끝난다
+        return "primary"
+
+    def slow_backup():
+        backup_started.set()
+        backup_release.wait(1.0)
+        return "backup"
+
+    request = cancellation.CancelToken("spec")
+    results = {}
+
+    def run(name, primary, backup):
+        with cancellation.bound(request):
+            results[name] = hedger.run(name, primary, backup)
+
+    worker = threading.Thread(target=run, args=("slow", first, slow_backup))
+    worker.start()
+    assert backup_started.wait(1.0)
+    run("other", late_primary, lambda: "backup")   # 기준을 넘겨도 hedge 없이 원본으로 끝난다
+    backup_release.set()
+    worker.join(1.0)
+    first.release.set()
+
+    assert results == {"slow": "backup", "other": "primary"}
+    assert hedger.stats()["hedged"] == 1 and hedger.stats()["capacity_denied"] == 1
+
+
+def _spec_agent(graphs):
+    agent = MultiStageSpecAgent.__new__(MultiStageSpecAgent)
+    for attr in ("design_agent", "diagram_agent", "prompt_agent", "tool_agent", "data_integration_agent"):
+        setattr(agent, attr, types.SimpleNamespace(agent=types.SimpleNamespace(messages=[])))
+    agent._graphs = graphs
+    return agent
+
+
+def _run_graph(graph):
+    async def run():
+        return [event async for event in graph.run()]
+    asyncio.run(run())
+
+
+def test_pool_discards_instance_while_hedged_out_primary_runs():
+    primary = _SlowPrimary()
+    graph = StageGraph(
+        [Stage("slow", "느린 stage", primary, fallback="", hedge=lambda upstream: "backup")],
+        hedger=_warm_hedger(),
+    )
+    spec_agent = _spec_agent([])
+    pool = AgentPool("spec", factory=lambda: spec_agent, reset=lambda a: a.reset(), min_idle=0)
+
+    async def lease_and_run():
+        async with pool.lease() as leased:
+            leased._graphs.append(graph)
+            await asyncio.to_thread(_run_graph, graph)
+
+    asyncio.run(lease_and_run())
+
+    assert graph.results["slow"] == "backup"
+    assert pool.stats()["discarded"] == 1 and pool.stats()["idle"] == 0
+    primary.release.set()
+    graph.abandoned[0].result(timeout=1.0)
+
+
+def test_pool_reuses_instance_once_hedged_out_primary_finished():
+    primary = _SlowPrimary()
+    graph = StageGraph(
+        [Stage("slow", "느린 stage", primary, fallback="", hedge=lambda upstream: "backup")],
+        hedger=_warm_hedger(),
+    )
+    _run_graph(graph)
+    primary.release.set()
+    graph.abandoned[0].result(timeout=1.0)
+
+    spec_agent = _spec_agent([graph])
+    pool = AgentPool("spec", factory=lambda: spec_agent, reset=lambda a: a.reset(), min_idle=0)
+    pool.release(spec_agent)
+
+    assert pool.stats()["reused"] == 1 and pool.stats()["discarded"] == 0
+    assert spec_agent._graphs == []
@@ -0,0 +1,166 @@
+"""JobQueue / spec_submit·status·result — 등록 → 상태 → 결과, 대기열 상한, job_id 검증, 실패 작업, 세션 격리"""
+
+import asyncio
+
+import pytest
+
+import agentcore_entrypoint as entrypoint
+import events
+from job_queue import JOB_DONE, JOB_FAILED, JOB_QUEUED, JobFailed, JobQueue, QueueFull
+
+_JOB_ID = "0123456789abcdef0123"
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_queue_runs_jobs_and_keeps_results_until_ttl():
+    now = [100.0]
+
+    async def run():
+        queue = JobQueue("test", workers=1, max_queued=5, ttl_seconds=10, clock=lambda: now[0])
+
+        async def work(job):
+            job.progress = 50
+            return {"ok": job.id}
+
+        first = queue.submit(work, job_id="a")
+        second = queue.submit(work, job_id="b")
+        assert queue.submit(work, job_id="a") is first   # 같은 job_id 재등록은 멱등
+        assert queue.status("b")["position"] == 2
+        await _settle()
+        return queue, first, second
+
+    queue, first, second = asyncio.run(run())
+    assert (first.status, first.result) == (JOB_DONE, {"ok": "a"})
+    assert queue.status("b")["status"] == JOB_DONE and "position" not in queue.status("b")
+    now[0] += 11
+    assert queue.get("a") is None and queue.stats()["retained"] == 0
+
+
+def test_full_queue_rejects_and_failures_are_recorded():
+    async def run():
+        queue = JobQueue("test", workers=1, max_queued=1, ttl_seconds=60)
+
+        async def expected_failure(job):
+            raise JobFailed("생성 오류")
+
+        async def crash(job):
+            raise ValueError("boom")
+
+        expected = queue.submit(expected_failure)
+        with pytest.raises(QueueFull):
+            queue.submit(crash)   # 첫 작업이 아직 대기 중
+        await _settle()
+        crashed = queue.submit(crash)
+        await _settle()
+        return queue, expected, crashed
+
+    queue, expected, crashed = asyncio.run(run())
+    assert (expected.status, expected.error) == (JOB_FAILED, "생성 오류")
+    assert crashed.status == JOB_FAILED and crashed.error.startswith("ValueError")
+    assert queue.stats()["rejected"] == 1 and queue.stats()["failed"] == 2
+
+
+def test_jobs_are_bound_to_their_owner():
+    async def run():
+        queue = JobQueue("test", workers=1, max_queued=5, ttl_seconds=60)
+
+        async def work(job):
+            return job.owner
+
+        mine = queue.submit(work, job_id="same", owner="session-a")
+        theirs = queue.submit(work, job_id="same", owner="session-b")
+        await _settle()
+        return queue, mine, theirs
+
+    queue, mine, theirs = asyncio.run(run())
+    assert mine is not theirs and (mine.result, theirs.result) == ("session-a", "session-b")
+    assert queue.get("same", "session-a") is mine
+    assert queue.get("same", "session-c") is None and queue.status("same") is None
+
+
+# ── 엔트리포인트 spec_submit / spec_status / spec_result ──
+
+def _spec_stream(*emitted):
+    async def stream(payload, session_id):
+        for event in emitted:
+            yield event
+    return stream
+
+
+@pytest.fixture
+def spec_jobs(monkeypatch):
+    queue = JobQueue("spec", workers=1, max_queued=1, ttl_seconds=60)
+    monkeypatch.setattr(entrypoint, "_spec_jobs", queue)
+    return queue
+
+
+def test_submit_status_result(monkeypatch, spec_jobs):
+    monkeypatch.setattr(entrypoint, "_spec_run_stream", _spec_stream(
+        events.Sequenced({"spec_run": {"run_id": "r1", "resumed": False}}, 1),
+        events.Sequenced({"progress": 40, "stage": "설계"}, 2),
+        events.Sequenced({"text": "# 명세서\n"}, 3),
+        events.Sequenced({"spec_meta": {"agents": 2}, "spec_id": "s1"}, 4),
+        events.Sequenced({"usage": {"totalTokens": 9}}, 5),
+    ))
+
+    async def run():
+        submitted = entrypoint._handle_spec_job_action("spec_submit", {"job_id": _JOB_ID}, "sess")
+        pending = entrypoint._handle_spec_job_action("spec_result", {"job_id": _JOB_ID}, "sess")
+        await _settle()
+        status = entrypoint._handle_spec_job_action("spec_status", {"job_id": _JOB_ID}, "sess")
+        result = entrypoint._handle_spec_job_action("spec_result", {"job_id": _JOB_ID}, "sess")
+        return submitted, pending, status, result
+
+    submitted, pending, status, result = asyncio.run(run())
+    assert submitted["job"]["status"] == JOB_QUEUED and submitted["job"]["position"] == 1
+    assert "result" not in pending
+    assert status["job"]["status"] == JOB_DONE and status["job"]["progress"] == 40
+    assert (status["job"]["run_id"], status["job"]["last_event_id"]) == ("r1", 5)
+    assert result["result"] == {
+        "specification": "# 명세서\n",
+        "spec_meta": {"agents": 2},
+        "spec_id": "s1",
+        "usage": {"totalTokens": 9},
+    }
+
+
+def test_full_queue_and_invalid_job_ids(monkeypatch, spec_jobs):
+    monkeypatch.setattr(entrypoint, "_spec_run_stream", _spec_stream())
+
+    async def run():
+        first = entrypoint._handle_spec_job_action("spec_submit", {}, "sess")
+        second = entrypoint._handle_spec_job_action("spec_submit", {}, "sess")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert "job" in first and "대기열" in second["error"]
+
+    handle = entrypoint._handle_spec_job_action
+    assert "유효하지 않은" in handle("spec_status", {"job_id": "short"}, "sess")["error"]
+    assert "유효하지 않은" in handle("spec_status", {"job_id": "x" * 65}, "sess")["error"]
+    assert "유효하지 않은" in handle("spec_status", {"job_id": 123}, "sess")["error"]
+    assert "필요" in handle("spec_status", {}, "sess")["error"]
+    assert "찾을 수 없" in handle("spec_result", {"job_id": _JOB_ID}, "sess")["error"]
+
+
+def test_failed_job_and_other_session(monkeypatch, spec_jobs):
+    monkeypatch.setattr(entrypoint, "_spec_run_stream", _spec_stream(
+        events.Sequenced({"progress": 10, "stage": "분석"}, 1),
+        events.Sequenced({"error": "명세서 생성 중 오류가 발생했습니다."}, 2),
+    ))
+
+    async def run():
+        entrypoint._handle_spec_job_action("spec_submit", {"job_id": _JOB_ID}, "sess")
+        await _settle()
+        mine = entrypoint._handle_spec_job_action("spec_result", {"job_id": _JOB_ID}, "sess")
+        other = entrypoint._handle_spec_job_action("spec_result", {"job_id": _JOB_ID}, "other")
+        return mine, other
+
+    mine, other = asyncio.run(run())
+    assert mine["job"]["status"] == JOB_FAILED and "result" not in mine
+    assert mine["job"]["error"] == "명세서 생성 중 오류가 발생했습니다."
+    assert "찾을 수 없" in other["error"]   # job_id를 알아도 다른 세션은 조회 불가
@@ -0,0 +1,65 @@
+"""Mermaid 검증/자동 수정 — AST 검증기가 교체 전 정규식 검증기(benchmarks 사본)와 같은 오류를 내는지 확인"""
+
+import re
+
+import pytest
+
+from benchmarks.mermaid_ast_bench import regex_validate
+from spec import mermaid_ast
+from spec.mermaid_validator import MermaidValidator
+
+
+def _kinds(errors):
+    """오류 메시지에서 인용된 원문 텍스트를 뗀 종류 (겹괄호 도형은 두 검증기의 인용 범위가 다르다)"""
+    return sorted(re.sub(r": '.*'$", "", error) for error in errors)
+
+
+_SUBGRAPH_CASES = [
+    "subgraph A[Foo (bar)]",
+    "subgraph A[Retry > 3?]",
+    "subgraph A [Score >= 70]",
+    'subgraph A["Score >= 70"]',
+    "subgraph A{Foo?}",
+    "subgraph A(Foo?)",
+    "subgraph A[Foo (bar]",
+    "subgraph A[Foo & (bar]",
+    "subgraph A[[Foo & bar]]",
+    "subgraph A[Input/Output]",
+    "subgraph Retry & Backoff",
+    "subgraph A",
+]
+
+
+@pytest.mark.parametrize("line", _SUBGRAPH_CASES)
+def test_subgraph_titles_match_pre_ast_validator(line):
+    block = f"flowchart TD\n    {line}\n        X[Load] --> Y[Store]\n    end\n"
+    assert _kinds(MermaidValidator().validate_block(block)) == _kinds(regex_validate(block))
+
+
+def test_subgraph_title_is_not_a_node():
+    diagram = mermaid_ast.parse("flowchart TD\n    subgraph G[Retry > 3?]\n        X --> Y\n    end\n")
+    assert list(diagram.nodes) == ["X", "Y"]
+    assert diagram.node_texts == [("Retry > 3?", False)]
+
+
+@pytest.mark.parametrize("line, shown, repaired", [
+    ("A -- x < y --> B", "'-- x < y -->'", 'A -- "x < y" --> B'),
+    ("A == retry > 2 ==> B", "'== retry > 2 ==>'", 'A == "retry > 2" ==> B'),
+    ("A -. n < 3 .-> B", "'-. n < 3 .->'", 'A -. "n < 3" .-> B'),
+    ("A -->|a > b| B", "'|a > b|'", 'A -->|"a > b"| B'),
+])
+def test_edge_label_message_and_repair_keep_label_form(line, shown, repaired):
+    validator = MermaidValidator()
+    block = f"flowchart TD\n    {line}\n"
+    errors = validator.validate_block(block)
+    assert len(errors) == 1 and errors[0].endswith(shown)
+
+    fixed, count = validator.auto_repair(f"```mermaid\n{block}```")
+    assert count == 1
+    assert f"    {repaired}\n" in fixed
+    assert validator.validate(fixed) == (True, [])
+
+
+def test_inline_edge_repair_leaves_plain_and_quoted_labels():
+    block = 'flowchart TD\n    A --- B -- ok --> C\n    C -- "x < y" --> D\n'
+    assert MermaidValidator().repair_block(block) == block
@@ -0,0 +1,119 @@
+"""AdmissionScheduler — 승인 순서, 위치 알림, 대기 중 승인 유실 여부"""
+
+import asyncio
+
+from scheduler import AdmissionScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_grant_order_priority_then_session_then_fifo():
+    scheduler = AdmissionScheduler(capacity=2)
+    busy = scheduler.submit("pattern_chat", "busy")
+    other = scheduler.submit("pattern_chat", "other")
+    assert busy.granted and other.granted
+
+    spec = scheduler.submit("spec", "s1")
+    feasibility = scheduler.submit("feasibility", "s2")
+    chat_busy = scheduler.submit("pattern_chat", "busy")   # 같은 세션이 이미 실행 중
+    chat_idle = scheduler.submit("pattern_chat", "s3")
+    assert [scheduler.position(t) for t in (chat_idle, chat_busy, feasibility, spec)] == [1, 2, 3, 4]
+
+    scheduler.release(other)
+    assert chat_idle.granted and not chat_busy.granted
+    scheduler.release(chat_idle)
+    assert chat_busy.granted and not feasibility.granted
+    scheduler.release(chat_busy)
+    assert feasibility.granted and not spec.granted
+    scheduler.release(busy)
+    assert not spec.granted     # weight 2 — feasibility가 끝날 때까지 대기
+    scheduler.release(feasibility)
+    assert spec.granted and scheduler.stats()["in_use"] == 2
+
+
+def test_aging_promotes_long_waiting_spec():
+    clock = _Clock()
+    scheduler = AdmissionScheduler(capacity=1, aging_seconds=10.0, clock=clock)
+    running = scheduler.submit("pattern_chat", "a")
+    spec = scheduler.submit("spec", "b")
+    clock.now = 35.0   # spec 승격 → feasibility와 같은 클래스, 먼저 도착
+    feasibility = scheduler.submit("feasibility", "c")
+    scheduler.release(running)
+    assert spec.granted and not feasibility.granted
+
+
+def test_aged_spec_at_head_does_not_block_chat():
+    clock = _Clock()
+    scheduler = AdmissionScheduler(capacity=2, aging_seconds=10.0, clock=clock)
+    first = scheduler.submit("pattern_chat", "a")
+    spec = scheduler.submit("spec", "b")          # weight가 한도로 잘려 2
+    clock.now = 100.0                             # 오래 기다렸어도 chat 클래스까지는 승격되지 않는다
+    chat = scheduler.submit("pattern_chat", "c")  # 남은 1자리로 바로 실행
+    assert first.granted and chat.granted and not spec.granted
+    assert scheduler.position(spec) == 1
+    scheduler.release(first)
+    scheduler.release(chat)
+    assert spec.granted
+
+
+def test_head_of_line_is_not_overtaken_by_smaller_request():
+    clock = _Clock()
+    scheduler = AdmissionScheduler(capacity=2, aging_seconds=10.0, clock=clock)
+    first = scheduler.submit("pattern_chat", "a")
+    spec = scheduler.submit("spec", "b")
+    clock.now = 100.0                                # 승격된 spec이 feasibility보다 앞
+    feasibility = scheduler.submit("feasibility", "c")   # 자리가 1개 남았지만 spec을 추월하지 않는다
+    assert not spec.granted and not feasibility.granted
+    scheduler.release(first)
+    assert spec.granted and not feasibility.granted
+
+
+def test_grant_during_yield_is_not_lost():
+    async def run():
+        scheduler = AdmissionScheduler(capacity=1)
+        running = scheduler.submit("pattern_chat", "a")
+        waiter = scheduler.submit("pattern_chat", "b")
+        positions = []
+
+        async def consume():
+            async for position in scheduler.wait(waiter, interval=30.0):
+                positions.append(position)
+                # 소비자가 위치 이벤트를 처리하는 사이(제너레이터 재개 전)에 승인된다
+                scheduler.release(running)
+
+        await asyncio.wait_for(consume(), timeout=1.0)
+        return positions, waiter.granted
+
+    positions, granted = asyncio.run(run())
+    assert positions == [1]
+    assert granted
+
+
+def test_abandoned_waiter_wakes_others_with_new_position():
+    async def run():
+        scheduler = AdmissionScheduler(capacity=1)
+        running = scheduler.submit("pattern_chat", "a")
+        leaving = scheduler.submit("pattern_chat", "b")
+        waiter = scheduler.submit("pattern_chat", "c")
+        positions = []
+
+        async def consume():
+            async for position in scheduler.wait(waiter, interval=30.0):
+                positions.append(position)
+                if len(positions) == 1:
+                    asyncio.get_running_loop().call_soon(scheduler.release, leaving)
+                else:
+                    asyncio.get_running_loop().call_soon(scheduler.release, running)
+
+        await asyncio.wait_for(consume(), timeout=1.0)
+        return positions, scheduler.stats()
+
+    positions, stats = asyncio.run(run())
+    assert positions == [2, 1]
+    assert stats["abandoned"] == 1 and stats["in_use"] == 1
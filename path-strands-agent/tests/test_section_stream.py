@@ -0,0 +1,109 @@
+"""섹션 스트리밍 — 병렬 워커 인스턴스가 SectionStreamer를 공유하지 않는지 확인"""
+
+import threading
+
+import events
+from progress import OutputMeter
+from spec import diagram_agent as diagram_module
+from spec import prompt_agent as prompt_module
+from spec import section_stream
+from spec.diagram_agent import DiagramAgent
+from spec.mermaid_validator import MermaidValidator
+from spec.prompt_agent import PromptAgent
+
+
+class _FakeResult:
+    def __init__(self, text):
+        self.message = {"content": [{"text": text}]}
+
+
+class _FakeWorker:
+    """get_agent 대체 — 호출 시 출력 라인을 한 글자씩 callback_handler로 흘린다"""
+
+    barrier: threading.Barrier
+    handlers: list
+
+    def __init__(self, **kwargs):
+        self.callback_handler = None
+
+    def __call__(self, prompt):
+        name = prompt.split('**"', 1)[1].split('"**', 1)[0]
+        text = f"## {name}\n**System Prompt:** {name} 전용 지시\n"
+        self.handlers.append(self.callback_handler)
+        self.barrier.wait(timeout=5)  # 모든 워커가 동시에 출력하도록
+        for ch in text:
+            if self.callback_handler is not None:
+                self.callback_handler(data=ch)
+        return _FakeResult(text)
+
+
+def test_parallel_prompt_workers_share_meter_not_streamer(monkeypatch):
+    names = ["Planner", "Retriever", "Writer"]
+    _FakeWorker.barrier = threading.Barrier(len(names))
+    _FakeWorker.handlers = []
+    monkeypatch.setattr(prompt_module.strands_utils, "get_agent", staticmethod(lambda **kw: _FakeWorker(**kw)))
+
+    agent = PromptAgent.__new__(PromptAgent)
+    agent._enhanced_prompt = "system"
+    agent.agent = _FakeWorker()
+    meter = OutputMeter.attach(agent.agent)
+
+    emitted = []
+    with section_stream.streaming(agent.agent, "prompt", emitted.append):
+        assert isinstance(agent.agent.callback_handler, section_stream.SectionStreamer)
+        output = agent._generate_prompts_parallel(names, "## 2.2 Agent Components\n", {})
+
+    # 워커 delta는 섹션으로 나가지 않고 (최종 섹션은 orchestrator가 조합 결과로 전송), 진행률만 누적
+    assert _FakeWorker.handlers == [meter] * len(names)
+    assert not [e for e in emitted if isinstance(e, events.Section)]
+    assert meter.chars == sum(len(f"## {n}\n**System Prompt:** {n} 전용 지시\n") for n in names)
+    assert output.index("## Planner") < output.index("## Retriever") < output.index("## Writer")
+
+
+class _FakeDiagramWorker(_FakeWorker):
+    """create_spec_agent 대체 — `### 3.x` 헤딩 + 유효한 mermaid 블록 출력"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+
+    def __call__(self, prompt):
+        number = prompt.split("**", 2)[1].split()[0]
+        text = f"### {number} Diagram\n```mermaid\nflowchart TD\n    A{number[-1]} --> B\n```\n"
+        self.handlers.append(self.callback_handler)
+        self.barrier.wait(timeout=5)
+        for ch in text:
+            self.callback_handler(data=ch)
+        return _FakeResult(text)
+
+
+def test_parallel_diagram_workers_share_meter_not_streamer(monkeypatch):
+    _FakeDiagramWorker.barrier = threading.Barrier(len(diagram_module._DIAGRAMS))
+    _FakeDiagramWorker.handlers = []
+    monkeypatch.setattr(diagram_module, "create_spec_agent", _FakeDiagramWorker)
+
+    agent = DiagramAgent.__new__(DiagramAgent)
+    agent._system_prompt = "system"
+    agent.validator = MermaidValidator()
+    agent.agent = _FakeDiagramWorker()
+    meter = OutputMeter.attach(agent.agent)
+
+    emitted = []
+    with section_stream.streaming(agent.agent, "diagram", emitted.append):
+        output = agent._generate_diagrams_parallel("## 2. Design\n", {})
+
+    # 워커마다 fence watcher가 OutputMeter를 감싸고, SectionStreamer는 붙지 않는다
+    assert [h._inner for h in _FakeDiagramWorker.handlers] == [meter] * 3
+    assert not [e for e in emitted if isinstance(e, events.Section)]
+    assert meter.chars > 0
+    assert output.startswith("## 3. Visual Design")
+    assert output.index("### 3.1") < output.index("### 3.2") < output.index("### 3.3")
+
+
+def test_progress_handler_unwraps_nested_streamers():
+    meter = OutputMeter()
+    wrapped = section_stream.SectionStreamer(
+        section_stream.SectionStreamer(meter, "a", lambda e: None), "b", lambda e: None
+    )
+    assert section_stream.progress_handler(wrapped) is meter
+    assert section_stream.progress_handler(meter) is meter
+    assert section_stream.progress_handler(None) is None
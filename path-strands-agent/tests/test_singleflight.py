@@ -0,0 +1,93 @@
+"""SingleFlight — 합류 요청의 replay + live 수신, 구독자 이탈 시 원본 취소, 오류 전파"""
+
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight, request_key
+
+
+def test_request_key_ignores_key_order():
+    assert request_key("spec", {"a": 1, "b": [1, 2]}) == request_key("spec", {"b": [1, 2], "a": 1})
+    assert request_key("spec", {"a": 1}) != request_key("feasibility", {"a": 1})
+
+
+def test_follower_replays_buffer_then_receives_live_events():
+    async def run():
+        flight = SingleFlight()
+        step = asyncio.Event()
+        started = 0
+
+        async def source():
+            nonlocal started
+            started += 1
+            yield "a"
+            yield "b"
+            await step.wait()
+            yield "c"
+
+        async def collect():
+            return [event async for event in flight.stream("k", source)]
+
+        leader = asyncio.create_task(collect())
+        while not flight._flights or len(flight._flights["k"].events) < 2:
+            await asyncio.sleep(0)
+        follower = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        step.set()
+        return await leader, await follower, started, flight.stats()
+
+    leader, follower, started, stats = asyncio.run(run())
+    assert leader == follower == ["a", "b", "c"]
+    assert started == 1
+    assert stats == {"started": 1, "joined": 1, "cancelled": 0, "in_flight": 0}
+
+
+def test_last_subscriber_leaving_cancels_source():
+    async def run():
+        flight = SingleFlight()
+        closed = asyncio.Event()
+
+        async def source():
+            try:
+                yield "a"
+                await asyncio.Event().wait()
+            finally:
+                closed.set()
+
+        stream = flight.stream("k", source)
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+        await asyncio.wait_for(closed.wait(), timeout=1.0)
+        return flight.stats()
+
+    stats = asyncio.run(run())
+    assert stats["cancelled"] == 1 and stats["in_flight"] == 0
+
+
+def test_source_error_reaches_every_subscriber():
+    async def run():
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def source():
+            yield "a"
+            await gate.wait()
+            raise ValueError("boom")
+
+        async def collect():
+            got = []
+            with pytest.raises(ValueError):
+                async for event in flight.stream("k", source):
+                    got.append(event)
+            return got
+
+        first = asyncio.create_task(collect())
+        second = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        gate.set()
+        return await first, await second, flight.stats()
+
+    first, second, stats = asyncio.run(run())
+    assert first == second == ["a"]
+    assert stats["in_flight"] == 0
@@ -0,0 +1,79 @@
+"""coalesce_text — text delta 병합, 이벤트 순서 보존, 멈춘 원본의 지연 flush, 원본 예외 전파"""
+
+import asyncio
+
+import pytest
+
+import events
+from sse_coalescer import coalesce_text
+
+
+async def _from(items, stall=None):
+    for item in items:
+        yield item
+    if stall is not None:
+        await stall.wait()
+
+
+def _collect(source, **kwargs):
+    async def run():
+        return [event async for event in coalesce_text(source, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_first_text_is_immediate_and_rest_merge_until_other_event():
+    out = _collect(_from([
+        events.Text("a", 1), events.Text("b", 2), events.Text("c", 3),
+        events.Progress(50, "p"),
+        events.Text("d"),
+    ]), max_delay=10.0)
+    assert out == [
+        events.Text("a", 1), events.Text("bc", 3),
+        events.Progress(50, "p"),
+        events.Text("d"),
+    ]
+
+
+def test_byte_limit_and_session_change_flush_frames():
+    out = _collect(_from([
+        events.Text("x"),
+        events.Text("가나", session_id="s"), events.Text("다", session_id="s"),   # 9 bytes ≥ 8
+        events.Text("y", session_id="s"), events.Text("z", session_id="t"),
+    ]), max_delay=10.0, max_bytes=8)
+    assert [(e.text, e.session_id) for e in out] == [
+        ("x", None), ("가나다", "s"), ("y", "s"), ("z", "t"),
+    ]
+
+
+def test_stalled_source_is_flushed_after_max_delay():
+    async def run():
+        stall = asyncio.Event()
+        stream = coalesce_text(_from([events.Text("a"), events.Text("b"), events.Text("c")], stall),
+                               max_delay=0.02)
+        first = await stream.__anext__()
+        merged = await asyncio.wait_for(stream.__anext__(), timeout=1.0)
+        await stream.aclose()
+        return first, merged
+
+    assert asyncio.run(run()) == (events.Text("a"), events.Text("bc"))
+
+
+def test_source_error_is_raised_after_pending_text():
+    async def failing():
+        yield events.Text("a")
+        yield events.Text("b")
+        raise RuntimeError("boom")
+
+    async def run():
+        got = []
+        with pytest.raises(RuntimeError):
+            async for event in coalesce_text(failing(), max_delay=10.0):
+                got.append(event)
+        return got
+
+    assert asyncio.run(run()) == [events.Text("a"), events.Text("b")]
+
+
+def test_disabled_passes_through():
+    items = [events.Text("a"), events.Text("b")]
+    assert _collect(_from(items), max_delay=0) == items
@@ -0,0 +1,97 @@
+"""stage 캐시 / spec_id 명세서 결과 — 별도 LRU로 서로 밀어내지 않고, spec_section이 spec_id·inline 결과로 재생성"""
+
+import asyncio
+
+import pytest
+
+import events
+from spec import orchestrator, stage_cache
+from spec.orchestrator import MultiStageSpecAgent
+from spec.stage_cache import StageCache, load_spec_outputs, save_spec_outputs
+
+_TOOL_MD = "## 5. Tools\n\n### 5.1 search_docs\n- **Purpose**: 문서 검색\n"
+_PREVIOUS = {
+    "design": "## 2. 설계\n설계 본문",
+    "design_core": "## 2. 설계\n핵심",
+    "diagram": "## 3. Visual Design\n",
+    "prompt": "## 4. Prompts\n",
+    "tool": "## 5. Tools\n이전 도구",
+    "data_integration": {"items": []},
+}
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    stage, outputs = StageCache(max_entries=4), StageCache(max_entries=2)
+    monkeypatch.setattr(stage_cache, "_cache", stage)
+    monkeypatch.setattr(stage_cache, "_outputs_cache", outputs)
+    monkeypatch.setattr(stage_cache, "_cache_created", True)
+    return stage, outputs
+
+
+def test_spec_outputs_have_their_own_bounded_lru(caches):
+    stage, outputs = caches
+    spec_id = save_spec_outputs(_PREVIOUS)
+    for n in range(10):
+        stage.put(f"stage-{n}", {"result": n})   # stage 항목이 많아도 명세서 결과는 남는다
+    assert load_spec_outputs(spec_id) == _PREVIOUS
+
+    later = [save_spec_outputs({"tool": str(n)}) for n in range(2)]
+    assert load_spec_outputs(spec_id) is None   # 명세서 결과 LRU(2개) 안에서만 밀려난다
+    assert [load_spec_outputs(i) for i in later] == [{"tool": "0"}, {"tool": "1"}]
+    assert stage.stats()["entries"] == 4 and outputs.stats()["evictions"] == 1
+
+
+class _SubAgent:
+    def __init__(self):
+        self.agent = type("StrandsAgent", (), {"callback_handler": None})()
+        self._last_usage = {}
+        self.calls = []
+
+    def generate_tools(self, design_core, analysis):
+        self.calls.append(design_core)
+        self._last_usage = {"totalTokens": 5}
+        return _TOOL_MD
+
+
+def _spec_agent(monkeypatch):
+    monkeypatch.setattr(orchestrator, "get_hedger", lambda: None)
+    agent = MultiStageSpecAgent.__new__(MultiStageSpecAgent)
+    for name in ("design", "diagram", "prompt", "tool", "data_integration"):
+        setattr(agent, f"{name}_agent", _SubAgent())
+    agent._graphs = []
+    return agent
+
+
+def _regenerate(agent, **kwargs):
+    async def run():
+        return [e async for e in agent.regenerate_section_stream("tool", {"pain_point": "x"}, **kwargs)]
+    return asyncio.run(run())
+
+
+def _check_regenerated(agent, emitted):
+    assert not [e for e in emitted if isinstance(e, events.Error)]
+    assert agent.tool_agent.calls == ["## 2. 설계\n핵심"]   # 이전 design_core를 입력으로 1회 호출
+    [section] = [e for e in emitted if isinstance(e, events.Section)]
+    assert (section.section_id, section.final) == ("tool", True) and "search_docs" in section.text
+    [meta] = [e for e in emitted if isinstance(e, events.SpecMeta)]
+    assert meta.spec_meta["tools"][0]["name"] == "search_docs"
+    saved = load_spec_outputs(meta.spec_id)
+    assert saved["tool"] == _TOOL_MD and saved["design"] == _PREVIOUS["design"]
+
+
+def test_spec_section_with_spec_id(monkeypatch, caches):
+    agent = _spec_agent(monkeypatch)
+    spec_id = save_spec_outputs(_PREVIOUS)
+    _check_regenerated(agent, _regenerate(agent, spec_id=spec_id))
+
+
+def test_spec_section_with_inline_outputs(monkeypatch, caches):
+    agent = _spec_agent(monkeypatch)
+    _check_regenerated(agent, _regenerate(agent, previous=dict(_PREVIOUS)))
+
+
+def test_spec_section_with_unknown_spec_id(monkeypatch, caches):
+    agent = _spec_agent(monkeypatch)
+    emitted = _regenerate(agent, spec_id="0" * 32)
+    assert isinstance(emitted[-1], events.Error) and agent.tool_agent.calls == []
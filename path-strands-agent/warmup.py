@@ -0,0 +1,165 @@
+"""서버 listen 이후 백그라운드 warm-up.
+
+AgentCore 초기화 타임아웃(30초) 때문에 무거운 모듈은 lazy import하지만,
+그대로 두면 첫 사용자가 strands/boto3/pydantic import, Bedrock client 생성,
+스킬 파일 읽기 비용을 모두 부담한다. app.run()이 포트를 열면 별도 스레드에서
+이 작업들을 미리 수행해 첫 요청 지연을 없앤다.
+
+이 모듈은 엔트리포인트 최상단에서 import되므로 무거운 의존성을 import하지 않는다.
+
+환경변수:
+  WARMUP_ENABLED    -> "0"이면 비활성화 (기본 "1")
+  WARMUP_TLS_PING   -> "1"이면 maxTokens=1 Converse 호출로 TLS 연결까지 미리 연다 (기본 "0", 소량 과금)
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LISTEN_POLL_SECONDS = 0.2
+_LISTEN_TIMEOUT_SECONDS = 60.0
+
+_lock = threading.Lock()
+_status: Dict[str, Any] = {
+    "state": "cold",        # cold | warming | warm | failed
+    "duration_ms": None,
+    "steps": {},            # step 이름 → 소요 ms (실패 시 "error: ...")
+}
+_started = False
+
+
+def status() -> Dict[str, Any]:
+    """ping 응답용 warm-up 상태 스냅샷"""
+    with _lock:
+        return {**_status, "steps": dict(_status["steps"])}
+
+
+def is_warm() -> bool:
+    with _lock:
+        return _status["state"] == "warm"
+
+
+def _set(**kwargs):
+    with _lock:
+        _status.update(kwargs)
+
+
+def _run_step(name: str, fn: Callable[[], Any]) -> bool:
+    t0 = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        logger.warning(f"[WARMUP] {name} 실패: {type(e).__name__}: {e}")
+        with _lock:
+            _status["steps"][name] = f"error: {type(e).__name__}"
+        return False
+    elapsed_ms = int((time.perf_counter() - t0) * 1000)
+    with _lock:
+        _status["steps"][name] = elapsed_ms
+    logger.info(f"[WARMUP] {name} 완료 ({elapsed_ms}ms)")
+    return True
+
+
+def _preload_skills():
+    from strands_utils import SKILL_PRELOADS, preload_skill_content
+
+    for name in SKILL_PRELOADS:
+        preload_skill_content(name)
+
+
+def _build_bedrock_client():
+    """공유 boto3 Session에서 bedrock-runtime client 생성 → 서비스 모델 파싱 캐시"""
+    from strands_utils import create_bedrock_runtime_client
+
+    create_bedrock_runtime_client()
+
+
+def _tls_ping():
+    """maxTokens=1 Converse 호출로 Bedrock endpoint TLS 연결 수립 (opt-in)"""
+    from agent_config import DEFAULT_MODEL
+    from strands_utils import create_bedrock_runtime_client
+
+    client = create_bedrock_runtime_client()
+    client.converse(
+        modelId=DEFAULT_MODEL,
+        messages=[{"role": "user", "content": [{"text": "ping"}]}],
+        inferenceConfig={"maxTokens": 1},
+    )
+
+
+def run_warmup(
+    importers: Iterable[Callable[[], Any]] = (),
+    steps: Iterable[Tuple[str, Callable[[], Any]]] = (),
+) -> None:
+    """warm-up 단계 순차 실행 (블로킹). 개별 단계 실패는 전체를 중단하지 않는다.
+
+    steps: 기본 단계 이후 실행할 (이름, 함수) 목록 (예: 에이전트 풀 사전 생성)
+    """
+    _set(state="warming")
+    t0 = time.perf_counter()
+
+    def _imports():
+        for importer in importers:
+            importer()
+
+    ok = _run_step("imports", _imports)
+    ok &= _run_step("skills", _preload_skills)
+    ok &= _run_step("bedrock_client", _build_bedrock_client)
+    if os.environ.get("WARMUP_TLS_PING", "0") == "1":
+        ok &= _run_step("tls_ping", _tls_ping)
+    for name, fn in steps:
+        ok &= _run_step(name, fn)
+
+    _set(
+        state="warm" if ok else "failed",
+        duration_ms=int((time.perf_counter() - t0) * 1000),
+    )
+
+
+def _wait_for_listen(host: str, port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=_LISTEN_POLL_SECONDS):
+                return True
+        except OSError:
+            time.sleep(_LISTEN_POLL_SECONDS)
+    return False
+
+
+def start_after_listen(
+    port: int,
+    importers: Iterable[Callable[[], Any]] = (),
+    steps: Iterable[Tuple[str, Callable[[], Any]]] = (),
+    host: str = "127.0.0.1",
+    timeout: float = _LISTEN_TIMEOUT_SECONDS,
+) -> Optional[threading.Thread]:
+    """서버가 port에서 listen을 시작하면 warm-up을 수행하는 daemon 스레드 시작.
+
+    app.run()은 블로킹이므로 그 전에 호출한다. 서버 listen 전에는 아무 작업도
+    하지 않으므로 AgentCore 초기화 시간에 영향을 주지 않는다.
+    """
+    global _started
+    if os.environ.get("WARMUP_ENABLED", "1") == "0":
+        return None
+    with _lock:
+        if _started:
+            return None
+        _started = True
+    importers = list(importers)
+    steps = list(steps)
+
+    def _worker():
+        if not _wait_for_listen(host, port, timeout):
+            logger.warning(f"[WARMUP] {timeout:.0f}초 내 서버 listen 미확인 — warm-up 생략")
+            return
+        run_warmup(importers, steps)
+
+    thread = threading.Thread(target=_worker, name="warmup", daemon=True)
+    thread.start()
+    return thread
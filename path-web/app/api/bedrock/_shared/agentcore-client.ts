@@ -49,6 +49,19 @@ interface AgentCoreOptions {
    * Used when getSessionId returns undefined (e.g., pattern/analyze creates new sessions).
    */
   generateSessionId?: boolean;
+  /**
+   * Derive runtimeSessionId from a hash of (scope, actionType, payload) when
+   * getSessionId returns undefined. Identical requests (relay retries,
+   * double-clicks) then reach the same runtime and are coalesced there into
+   * the in-flight run. Pass the user ID so sessions never span users.
+   */
+  coalesceScope?: string;
+  /**
+   * Payload keys left out of the coalesceScope hash. Reconnect fields (e.g. a
+   * spec run id / last event id) must not change the derived session, so a
+   * resumed request reaches the runtime that holds the run's checkpoint.
+   */
+  coalesceIgnore?: string[];
 }
 
 // ────────────────────────────────────────────
@@ -86,6 +99,23 @@ function validateBody(
 // Invoke helpers
 // ────────────────────────────────────────────
 
+/**
+ * Deterministic runtimeSessionId (64-char hex, satisfies the 33-char minimum)
+ * for identical payloads within the same scope.
+ */
+async function deriveSessionId(
+  scope: string,
+  payload: Record<string, unknown>,
+): Promise<string> {
+  const digest = await crypto.subtle.digest(
+    "SHA-256",
+    new TextEncoder().encode(`${scope}:${JSON.stringify(payload)}`),
+  );
+  return Array.from(new Uint8Array(digest))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+}
+
 async function invokeRuntime(
   payload: Record<string, unknown>,
   sessionId?: string,
@@ -122,6 +152,8 @@ export async function invokeAgentCoreSSE(
     errorMessage = "요청 처리 중 오류가 발생했습니다",
     getSessionId,
     generateSessionId,
+    coalesceScope,
+    coalesceIgnore = [],
   } = options;
 
   try {
@@ -149,6 +181,12 @@ export async function invokeAgentCoreSSE(
     if (getSessionId) {
       sessionId = getSessionId(body);
     }
+    if (!sessionId && coalesceScope !== undefined) {
+      const hashed = Object.fromEntries(
+        Object.entries(payload).filter(([key]) => !coalesceIgnore.includes(key)),
+      );
+      sessionId = await deriveSessionId(coalesceScope, hashed);
+    }
     if (!sessionId && generateSessionId) {
       sessionId = crypto.randomUUID();
     }
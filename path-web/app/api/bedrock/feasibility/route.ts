@@ -14,6 +14,7 @@ export async function POST(req: NextRequest) {
     transformBody: (body) => ({ formData: body }),
     enrichPayload: (body) =>
       enrichDataSources(body, { step: "feasibility", userId }),
+    coalesceScope: userId ?? "anonymous",
     errorMessage: "Feasibility 평가 중 오류가 발생했습니다",
   });
 }
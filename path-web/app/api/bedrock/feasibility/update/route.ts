@@ -19,6 +19,7 @@ export async function POST(req: NextRequest) {
     actionType: "feasibility_update",
     enrichPayload: (body) =>
       enrichDataSources(body, { step: "feasibility_update", userId }),
+    coalesceScope: userId ?? "anonymous",
     errorMessage: "재평가 중 오류가 발생했습니다",
   });
 }
@@ -0,0 +1,18 @@
+import { NextRequest } from "next/server";
+import { z } from "zod";
+import { invokeAgentCoreJSON } from "../../_shared/agentcore-client";
+
+// 비동기 명세서 작업 결과 조회 — 완료 시 {"job", "result": {specification, spec_meta, spec_id, usage}}, 미완료 시 {"job"}
+const specResultSchema = z.object({
+  jobId: z.string().min(33).max(64),
+});
+
+export async function POST(req: NextRequest) {
+  return invokeAgentCoreJSON(req, {
+    schema: specResultSchema,
+    actionType: "spec_result",
+    transformBody: (body) => ({ job_id: body.jobId }),
+    getSessionId: (body) => body.job_id as string,
+    errorMessage: "명세서 작업 결과 조회 중 오류가 발생했습니다",
+  });
+}
@@ -23,6 +23,13 @@ const specSchema = z.object({
     .array(z.string().max(80))
     .max(30)
     .optional(),
+  // 섹션 2-5를 생성 중에 {"section": {id, text, final}} 이벤트로 스트리밍
+  streamSections: z.boolean().optional(),
+  // 연결이 끊긴 생성 재개 — spec_run 이벤트의 run_id + 마지막으로 받은 event_id
+  runId: z.string().max(64).optional(),
+  lastEventId: z.number().int().min(0).optional(),
+  // 비동기 작업(/spec/submit)에 SSE로 재연결할 때 — 작업이 실행 중인 컨테이너로 라우팅
+  jobId: z.string().min(33).max(64).optional(),
 });
 
 export async function POST(req: NextRequest) {
@@ -36,9 +43,16 @@ export async function POST(req: NextRequest) {
       chat_history: body.chatHistory,
       additional_context: body.additionalContext,
       selectedDataSourceIds: body.selectedDataSourceIds,
+      stream_sections: body.streamSections,
+      run_id: body.runId,
+      last_event_id: body.lastEventId,
+      job_id: body.jobId,
     }),
     enrichPayload: (body) =>
       enrichDataSources(body, { step: "spec", userId }),
+    getSessionId: (body) => body.job_id as string | undefined,
+    coalesceScope: userId ?? "anonymous",
+    coalesceIgnore: ["run_id", "last_event_id"],
     errorMessage: "명세서 생성 중 오류가 발생했습니다",
   });
 }
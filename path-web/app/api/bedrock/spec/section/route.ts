@@ -0,0 +1,71 @@
+import { NextRequest } from "next/server";
+import { z } from "zod";
+import { invokeAgentCoreSSE } from "../../_shared/agentcore-client";
+import { enrichDataSources } from "@/lib/enterprise/ds-enrichment";
+import { getAuthUserId } from "@/lib/auth-helpers";
+
+export const maxDuration = 600;
+
+const MAX_STAGE_OUTPUT_LENGTH = 200000;
+
+const stageOutput = z.string().max(MAX_STAGE_OUTPUT_LENGTH).optional();
+
+// 섹션 1개만 다시 생성 — {"section": {id, text, final: true}} + 갱신된 spec_meta/spec_id 스트리밍
+const specSectionSchema = z
+  .object({
+    stage: z.enum(["design", "diagram", "prompt", "tool", "data_integration"]),
+    analysis: z.record(z.string(), z.unknown()),
+    // 전체 생성 시 spec_meta 이벤트와 함께 받은 id (서버에 보관된 stage 결과 참조)
+    specId: z.string().max(64).optional(),
+    // specId가 만료됐거나 다른 컨테이너로 라우팅될 때를 위한 이전 stage 결과
+    stageOutputs: z
+      .object({
+        design: stageOutput,
+        design_core: stageOutput,
+        diagram: stageOutput,
+        prompt: stageOutput,
+        tool: stageOutput,
+        data_integration: z.record(z.string(), z.unknown()).optional(),
+      })
+      .optional(),
+    improvementPlans: z.record(z.string(), z.string()).optional(),
+    chatHistory: z.array(z.object({
+      role: z.enum(["user", "assistant"]),
+      content: z.string(),
+    })).max(100).optional(),
+    additionalContext: z
+      .object({
+        sources: z.string().optional(),
+        context: z.string().optional(),
+      })
+      .optional(),
+    selectedDataSourceIds: z
+      .array(z.string().max(80))
+      .max(30)
+      .optional(),
+  })
+  .refine((body) => body.specId || body.stageOutputs, {
+    message: "specId 또는 stageOutputs가 필요합니다",
+  });
+
+export async function POST(req: NextRequest) {
+  const userId = await getAuthUserId();
+  return invokeAgentCoreSSE(req, {
+    schema: specSectionSchema,
+    actionType: "spec_section",
+    transformBody: (body) => ({
+      stage: body.stage,
+      analysis: body.analysis,
+      spec_id: body.specId,
+      stage_outputs: body.stageOutputs,
+      improvement_plans: body.improvementPlans,
+      chat_history: body.chatHistory,
+      additional_context: body.additionalContext,
+      selectedDataSourceIds: body.selectedDataSourceIds,
+    }),
+    enrichPayload: (body) =>
+      enrichDataSources(body, { step: "spec", userId }),
+    coalesceScope: userId ?? "anonymous",
+    errorMessage: "명세서 섹션 재생성 중 오류가 발생했습니다",
+  });
+}
@@ -0,0 +1,18 @@
+import { NextRequest } from "next/server";
+import { z } from "zod";
+import { invokeAgentCoreJSON } from "../../_shared/agentcore-client";
+
+// 비동기 명세서 작업 상태 조회 — {"job": {status, position, progress, stage, run_id, last_event_id}}
+const specStatusSchema = z.object({
+  jobId: z.string().min(33).max(64),
+});
+
+export async function POST(req: NextRequest) {
+  return invokeAgentCoreJSON(req, {
+    schema: specStatusSchema,
+    actionType: "spec_status",
+    transformBody: (body) => ({ job_id: body.jobId }),
+    getSessionId: (body) => body.job_id as string,
+    errorMessage: "명세서 작업 상태 조회 중 오류가 발생했습니다",
+  });
+}
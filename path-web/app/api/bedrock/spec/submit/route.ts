@@ -0,0 +1,47 @@
+import { NextRequest } from "next/server";
+import { z } from "zod";
+import { invokeAgentCoreJSON } from "../../_shared/agentcore-client";
+import { enrichDataSources } from "@/lib/enterprise/ds-enrichment";
+import { getAuthUserId } from "@/lib/auth-helpers";
+
+// 비동기 명세서 생성 — SSE 연결 없이 작업을 등록하고 {"job": {job_id, status, position}}를 즉시 반환.
+// 이후 /spec/status, /spec/result를 jobId로 폴링 (jobId가 runtimeSessionId가 되어 같은 컨테이너로 라우팅)
+const specSubmitSchema = z.object({
+  analysis: z.record(z.string(), z.unknown()),
+  improvementPlans: z.record(z.string(), z.string()).optional(),
+  chatHistory: z.array(z.object({
+    role: z.enum(["user", "assistant"]),
+    content: z.string(),
+  })).max(100).optional(),
+  additionalContext: z
+    .object({
+      sources: z.string().optional(),
+      context: z.string().optional(),
+    })
+    .optional(),
+  selectedDataSourceIds: z
+    .array(z.string().max(80))
+    .max(30)
+    .optional(),
+});
+
+export async function POST(req: NextRequest) {
+  const userId = await getAuthUserId();
+  return invokeAgentCoreJSON(req, {
+    schema: specSubmitSchema,
+    actionType: "spec_submit",
+    transformBody: (body) => ({
+      // runtimeSessionId 최소 길이(33자)를 만족하는 UUID
+      job_id: crypto.randomUUID(),
+      analysis: body.analysis,
+      improvement_plans: body.improvementPlans,
+      chat_history: body.chatHistory,
+      additional_context: body.additionalContext,
+      selectedDataSourceIds: body.selectedDataSourceIds,
+    }),
+    enrichPayload: (body) =>
+      enrichDataSources(body, { step: "spec", userId }),
+    getSessionId: (body) => body.job_id as string,
+    errorMessage: "명세서 생성 작업 등록 중 오류가 발생했습니다",
+  });
+}
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useCallback, useRef } from "react";
+import { useState, useCallback, useMemo, useRef } from "react";
 import Container from "@cloudscape-design/components/container";
 import Header from "@cloudscape-design/components/header";
 import SpaceBetween from "@cloudscape-design/components/space-between";
@@ -13,6 +13,41 @@ import { useFlash } from "@/components/cloudscape/FlashbarProvider";
 import { useSSEStream } from "@/lib/hooks/useSSEStream";
 import type { Analysis, ChatMessage, FormData, ImprovementPlans, SpecMeta, TokenUsage } from "@/lib/types";
 
+// streaming spec 모드의 섹션 id (최종 문서 순서)
+const SECTION_ORDER = ["design", "diagram", "prompt", "tool", "data_integration"] as const;
+
+interface SectionEvent {
+  id: string;
+  text: string;
+  final: boolean;
+}
+
+// {"spec_run": {run_id, resumed}} — 생성 시작/재개 시 1회
+interface SpecRunEvent {
+  run_id: string;
+  resumed: boolean;
+  completed?: string[];
+}
+
+// 부분 spec_meta 병합의 기준값 (아직 완료되지 않은 stage의 키)
+const EMPTY_SPEC_META: SpecMeta = {
+  design_summary: { pattern: "", architecture: "", agent_components: [], agent_names: [] },
+  diagrams: [],
+  agent_prompts: [],
+  tools: [],
+  data_integrations: { items: [] },
+};
+
+// 연결 끊김 시 같은 run으로 재연결하는 최대 횟수 / 간격 (시도마다 증가)
+const MAX_RECONNECTS = 2;
+const RECONNECT_DELAY_MS = 1000;
+
+function joinSections(sections: Record<string, string>): string {
+  return SECTION_ORDER.map((id) => sections[id])
+    .filter((text) => text && text.trim())
+    .join("\n\n");
+}
+
 function extractHeadings(markdown: string): { level: number; text: string; id: string }[] {
   const headings: { level: number; text: string; id: string }[] = [];
   for (const line of markdown.split("\n")) {
@@ -55,6 +90,15 @@ export function SpecificationTab({
   const [stage, setStage] = useState("");
   const fullSpecRef = useRef("");
   const specMetaRef = useRef<SpecMeta | null>(null);
+  // 최종 조합(text) 도착 전까지 섹션 스트림으로 미리보기
+  const sectionsRef = useRef<Record<string, string>>({});
+  const finalSectionsRef = useRef<Set<string>>(new Set());
+  const previewRef = useRef("");
+  // 연결이 끊기면 같은 run을 이어 받는다 (서버가 놓친 이벤트 replay + 완료 stage 이후부터 재개)
+  const runIdRef = useRef<string | null>(null);
+  const lastEventIdRef = useRef(0);
+  const reconnectsRef = useRef(0);
+  const startRef = useRef<(body?: Record<string, unknown>) => Promise<void>>(undefined);
 
   const handleSave = async () => {
     setIsSaving(true);
@@ -65,31 +109,84 @@ export function SpecificationTab({
     }
   };
 
+  // 렌더마다 새 객체를 만들면 onError와 useSSEStream 옵션도 매번 바뀌므로 입력이 바뀔 때만 재생성
+  const additionalSources = formData?.additionalSources;
+  const additionalContext = formData?.additionalContext;
+  const selectedDataSourceIds = formData?.selectedDataSourceIds;
+  const specBody = useMemo(() => ({
+    analysis,
+    improvementPlans: improvementPlans || {},
+    chatHistory: chatHistory || [],
+    additionalContext: {
+      sources: additionalSources || "",
+      context: additionalContext || "",
+    },
+    selectedDataSourceIds: selectedDataSourceIds ?? [],
+    streamSections: true,
+  }), [analysis, improvementPlans, chatHistory, additionalSources, additionalContext, selectedDataSourceIds]);
+
   const { start: startGeneration, isStreaming: isGenerating } = useSSEStream({
     url: "/api/bedrock/spec",
-    body: {
-      analysis,
-      improvementPlans: improvementPlans || {},
-      chatHistory: chatHistory || [],
-      additionalContext: {
-        sources: formData?.additionalSources || "",
-        context: formData?.additionalContext || "",
-      },
-      selectedDataSourceIds: formData?.selectedDataSourceIds ?? [],
-    },
+    body: specBody,
     onChunk: useCallback((parsed: Record<string, unknown>) => {
+      if (typeof parsed.event_id === "number") {
+        lastEventIdRef.current = parsed.event_id;
+      }
+      const run = parsed.spec_run as SpecRunEvent | undefined;
+      if (run && typeof run.run_id === "string") {
+        runIdRef.current = run.run_id;
+        // 재개: 완료 stage의 final 섹션은 유지하고, 중단된 섹션 delta와 최종 조합은 다시 받는다.
+        // 새 run(서버에 checkpoint 없음): 처음부터 다시 받는다.
+        for (const id of Object.keys(sectionsRef.current)) {
+          if (!run.resumed || !finalSectionsRef.current.has(id)) {
+            delete sectionsRef.current[id];
+          }
+        }
+        if (!run.resumed) {
+          finalSectionsRef.current = new Set();
+          specMetaRef.current = null;
+        }
+        fullSpecRef.current = "";
+        previewRef.current = joinSections(sectionsRef.current);
+        setSpecification(previewRef.current);
+      }
+      const section = parsed.section as SectionEvent | undefined;
+      if (section && typeof section.id === "string" && typeof section.text === "string") {
+        // final 섹션은 누적분을 교체, 이후 도착한 delta는 무시
+        if (section.final) {
+          sectionsRef.current[section.id] = section.text;
+          finalSectionsRef.current.add(section.id);
+        } else if (!finalSectionsRef.current.has(section.id)) {
+          sectionsRef.current[section.id] = (sectionsRef.current[section.id] ?? "") + section.text;
+        }
+        previewRef.current = joinSections(sectionsRef.current);
+        if (!fullSpecRef.current) {
+          setSpecification(previewRef.current);
+        }
+      }
       if (typeof parsed.text === "string") {
         fullSpecRef.current += parsed.text;
-        setSpecification(fullSpecRef.current);
+        // 최종 조합이 섹션 미리보기보다 짧은 동안에는 미리보기 유지 (onDone에서 최종본 반영)
+        if (fullSpecRef.current.length >= previewRef.current.length) {
+          setSpecification(fullSpecRef.current);
+        }
       }
       if (typeof parsed.warning === "string") {
         console.warn("[Step4] 경고:", parsed.warning);
         addFlash("warning", parsed.warning);
       }
       if (parsed.spec_meta && typeof parsed.spec_meta === "object") {
+        // stage 완료마다 부분 spec_meta(partial: true)가 오고 마지막에 전체가 온다 — 키 단위로 병합.
         // 거대한 SpecMeta의 JSON.stringify는 메인 스레드를 블로킹하므로
         // 스트리밍 중에는 ref만 갱신하고, sessionStorage 쓰기는 onDone에서 1회 수행.
-        specMetaRef.current = parsed.spec_meta as SpecMeta;
+        specMetaRef.current = {
+          ...(specMetaRef.current ?? EMPTY_SPEC_META),
+          ...(parsed.spec_meta as Partial<SpecMeta>),
+        };
+        if (parsed.partial) {
+          // 느린 stage를 기다리지 않고 완료된 부분부터 시뮬레이션 탭에 반영
+          onStructured?.(specMetaRef.current);
+        }
       }
     }, [addFlash, onStructured]),
     onProgress: useCallback((p: number, s: string) => {
@@ -116,16 +213,35 @@ export function SpecificationTab({
       }
       setProgress(100);
       setStage("완료");
+      runIdRef.current = null;
     }, [onStructured]),
-    onError: useCallback((err: string) => {
+    onError: useCallback((err: string, data?: Record<string, unknown>) => {
+      // event_id가 없는 오류 = 생성 자체가 아닌 연결(relay/네트워크) 실패 → 같은 run으로 재연결
+      const runId = runIdRef.current;
+      if (runId && typeof data?.event_id !== "number" && reconnectsRef.current < MAX_RECONNECTS) {
+        reconnectsRef.current += 1;
+        console.warn(`[Step4] 연결 끊김, 재연결 ${reconnectsRef.current}/${MAX_RECONNECTS}:`, err);
+        setStage("연결이 끊겨 이어서 생성하는 중...");
+        setTimeout(() => {
+          startRef.current?.({ ...specBody, runId, lastEventId: lastEventIdRef.current });
+        }, RECONNECT_DELAY_MS * reconnectsRef.current);
+        return;
+      }
       console.error("[Step4] 명세서 생성 실패:", err);
       addFlash("error", `명세서 생성 중 오류가 발생했습니다: ${err}`);
-    }, [addFlash]),
+    }, [addFlash, specBody]),
   });
+  startRef.current = startGeneration;
 
   const generateSpec = useCallback(() => {
+    runIdRef.current = null;
+    lastEventIdRef.current = 0;
+    reconnectsRef.current = 0;
     fullSpecRef.current = "";
     specMetaRef.current = null;
+    sectionsRef.current = {};
+    finalSectionsRef.current = new Set();
+    previewRef.current = "";
     sessionStorage.removeItem("specification_structured");
     onStructured?.(null);
     setSpecification("");
@@ -10,7 +10,8 @@ export interface UseSSEStreamOptions {
   onProgress?: (progress: number, stage: string) => void;
   onUsage?: (usage: TokenUsage) => void;
   onDone?: () => void;
-  onError?: (error: string) => void;
+  /** data is the server error event; undefined for HTTP/network failures */
+  onError?: (error: string, data?: Record<string, unknown>) => void;
 }
 
 export interface UseSSEStreamReturn {
@@ -118,7 +119,7 @@ export function useSSEStream(options: UseSSEStreamOptions): UseSSEStreamReturn {
                 if (parsed.error) {
                   const errMsg = parsed.error;
                   setError(errMsg);
-                  onError?.(errMsg);
+                  onError?.(errMsg, parsed);
                   setIsStreaming(false);
                   return;
                 }
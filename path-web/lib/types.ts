@@ -154,6 +154,8 @@ export interface TokenUsage {
   cacheReadInputTokens?: number;
   cacheWriteInputTokens?: number;
   estimatedCostUSD: number;
+  /** 명세서 생성 중 Mermaid 수정 호출 usage (합계에 이미 포함, 참고용) */
+  diagramRetry?: TokenUsage;
 }
 
 export interface Session {